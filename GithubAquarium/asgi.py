@@ -0,0 +1,20 @@
+"""
+ASGI config for GithubAquarium project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+The public render endpoints (apps/aquatics/views_render.py) are async views, so serving
+through this entry point lets one process hold many concurrent image fetches.
+
+    uvicorn GithubAquarium.asgi:application
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'GithubAquarium.settings')
+
+application = get_asgi_application()
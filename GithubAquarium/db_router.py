@@ -0,0 +1,71 @@
+# GithubAquarium/db_router.py
+"""
+SQLite 파일 분리 라우터.
+
+SQLite는 파일 단위로 쓰기 락을 잡으므로, 요청 경로의 쓰기가 작업 큐와 커밋 적재 쓰기를
+기다리지 않도록 테이블을 세 파일로 나눕니다.
+
+- default (db.sqlite3): 앱 데이터 전체
+- queue (queue.sqlite3): django-q 브로커/결과/스케줄 (Q_CLUSTER['orm'] = 'queue'),
+  작업 간 조정용 캐시 (CACHES['coordination'], 동기화 트랜잭션이 롤백돼도 남아야 하는 GitHub rate limit 상태 등)
+- commits (commits.sqlite3): 커밋 이력 (repositories.Commit)
+
+DB를 넘는 JOIN과 FK 제약은 쓸 수 없으므로 Commit의 FK는 db_constraint=False이고,
+Repository/User 삭제 시 커밋 정리는 apps/repositories/signals.py 에서 처리합니다.
+"""
+DEFAULT_DB = 'default'
+QUEUE_DB = 'queue'
+COMMITS_DB = 'commits'
+
+# app_label -> DB
+APP_DATABASES = {
+    'django_q': QUEUE_DB,
+}
+# (app_label, model_name) -> DB
+MODEL_DATABASES = {
+    ('repositories', 'commit'): COMMITS_DB,
+}
+# db_table -> DB (DatabaseCache 테이블은 모두 app_label이 django_cache라 테이블 이름으로 구분)
+TABLE_DATABASES = {
+    'coordination_cache': QUEUE_DB,
+}
+
+
+def database_for(app_label, model_name=None) -> str:
+    if model_name is not None:
+        db = MODEL_DATABASES.get((app_label, model_name))
+        if db:
+            return db
+    return APP_DATABASES.get(app_label, DEFAULT_DB)
+
+
+class DatabaseRouter:
+    """
+    라우팅되지 않은 모델도 항상 default를 반환합니다.
+    (None을 반환하면 Django가 관계 조회 시 hint 인스턴스의 DB를 따라가 commits DB에서 Repository를 찾음)
+    """
+
+    def db_for_read(self, model, **hints):
+        return self._database(model)
+
+    def db_for_write(self, model, **hints):
+        return self._database(model)
+
+    def _database(self, model):
+        return TABLE_DATABASES.get(model._meta.db_table) or database_for(model._meta.app_label, model._meta.model_name)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Commit -> Repository/User 처럼 DB를 넘는 참조는 FK 제약 없이 id만 저장
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        model = hints.get('model')
+        if model is not None and model._meta.db_table in TABLE_DATABASES:
+            # createcachetable
+            return db == TABLE_DATABASES[model._meta.db_table]
+        if model_name is None:
+            # RunPython/RunSQL 등 모델이 없는 작업은 앱 단위로 판단
+            if app_label in APP_DATABASES:
+                return db == APP_DATABASES[app_label]
+            return db == DEFAULT_DB
+        return db == database_for(app_label, model_name)
@@ -0,0 +1,261 @@
+# GithubAquarium/maintenance.py
+"""
+정기 유지보수(django-q 스케줄).
+
+끝없이 쌓이는 저장소를 작은 배치 트랜잭션으로 정리해 테이블 스캔과 디스크 사용량을 일정하게 유지합니다.
+
+- task_results: django-q 작업 결과 (성공/실패 각각 보관 기간 이후 삭제)
+- outstanding_tokens: 만료된 simplejwt OutstandingToken (+ 연결된 BlacklistedToken)
+- point_logs: 보관 기간이 지난 PointLog를 유저/사유별 요약 1행으로 압축 (잔액 합계는 유지)
+- orphaned_svgs: DB에서 참조하지 않는 MEDIA_ROOT의 aquariums/ fishtanks/ og/ 파일
+- http_cache: 보관 기간 동안 쓰이지 않은 GitHub 조건부 요청 캐시(GithubResponseCache)
+
+배치마다 MAINTENANCE_BATCH_PAUSE 초 쉬고, 작업마다 MAINTENANCE_TIME_BUDGET 초를 넘기면
+남은 양은 다음 실행으로 넘깁니다. 결과(삭제 행 수, 회수 바이트)는 로그와 캐시(MAINTENANCE_REPORT_KEY)에 남깁니다.
+
+`manage.py run_maintenance --schedule` 로 스케줄을 등록하고, 인자 없이 실행하면 즉시 1회 실행합니다.
+"""
+import logging
+import os
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+from django_q.models import Schedule, Task
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from apps.aquatics.models import Aquarium, Fishtank
+from apps.repositories.models import Repository
+from apps.shop.models import PointLog
+from apps.users.models import GithubResponseCache
+from GithubAquarium.db_router import DEFAULT_DB, database_for
+
+logger = logging.getLogger(__name__)
+
+MAINTENANCE_SCHEDULE_NAME = 'maintenance'
+MAINTENANCE_REPORT_KEY = 'maintenance:last_report'
+
+MAINTENANCE_BATCH_SIZE = getattr(settings, 'MAINTENANCE_BATCH_SIZE', 500)
+# 배치 사이 휴식 (다른 쓰기가 DB 락을 잡을 틈을 줌)
+MAINTENANCE_BATCH_PAUSE = getattr(settings, 'MAINTENANCE_BATCH_PAUSE', 0.2)
+# 작업 1개가 한 번 실행에 쓸 수 있는 최대 시간 (sec)
+MAINTENANCE_TIME_BUDGET = getattr(settings, 'MAINTENANCE_TIME_BUDGET', 60)
+
+TASK_SUCCESS_RETENTION = getattr(settings, 'MAINTENANCE_TASK_SUCCESS_RETENTION', timedelta(days=7))
+TASK_FAILURE_RETENTION = getattr(settings, 'MAINTENANCE_TASK_FAILURE_RETENTION', timedelta(days=30))
+POINT_LOG_RETENTION = getattr(settings, 'MAINTENANCE_POINT_LOG_RETENTION', timedelta(days=365))
+HTTP_CACHE_RETENTION = getattr(settings, 'MAINTENANCE_HTTP_CACHE_RETENTION', timedelta(days=30))
+# 방금 쓰여 아직 DB에 반영되지 않았을 수 있는 파일은 건드리지 않음
+ORPHAN_FILE_MIN_AGE = getattr(settings, 'MAINTENANCE_ORPHAN_FILE_MIN_AGE', timedelta(hours=1))
+
+# MEDIA_ROOT 하위 렌더 결과물 디렉터리
+ARTIFACT_DIRS = ('aquariums', 'fishtanks', 'og')
+
+
+class _Budget:
+    """작업 1개의 배치 진행과 시간 제한"""
+
+    def __init__(self, seconds=MAINTENANCE_TIME_BUDGET):
+        self.deadline = time.monotonic() + seconds
+
+    def exhausted(self) -> bool:
+        return time.monotonic() >= self.deadline
+
+    def pause(self):
+        time.sleep(MAINTENANCE_BATCH_PAUSE)
+
+
+def _delete_in_batches(queryset, budget, dry_run=False) -> int:
+    """
+    queryset을 pk 배치 단위로 각각의 트랜잭션에서 삭제합니다. 삭제한 행 수를 반환합니다.
+    (관련 CASCADE 행은 포함하지 않음)
+    """
+    model = queryset.model
+    db = database_for(model._meta.app_label, model._meta.model_name)
+    if dry_run:
+        return queryset.count()
+
+    deleted = 0
+    while not budget.exhausted():
+        pks = list(queryset.values_list('pk', flat=True)[:MAINTENANCE_BATCH_SIZE])
+        if not pks:
+            break
+        with transaction.atomic(using=db):
+            model.objects.filter(pk__in=pks).delete()
+        deleted += len(pks)
+        budget.pause()
+    return deleted
+
+
+# --- Jobs ---
+
+def prune_task_results(dry_run=False) -> dict:
+    now = timezone.now()
+    budget = _Budget()
+    rows = _delete_in_batches(
+        Task.objects.filter(success=True, stopped__lt=now - TASK_SUCCESS_RETENTION), budget, dry_run
+    )
+    rows += _delete_in_batches(
+        Task.objects.filter(success=False, stopped__lt=now - TASK_FAILURE_RETENTION), budget, dry_run
+    )
+    return {'rows': rows, 'bytes': 0}
+
+
+def prune_outstanding_tokens(dry_run=False) -> dict:
+    # 만료된 refresh 토큰은 블랙리스트 여부와 무관하게 더 이상 쓸 수 없음 (BlacklistedToken은 CASCADE)
+    rows = _delete_in_batches(
+        OutstandingToken.objects.filter(expires_at__lt=timezone.now()), _Budget(), dry_run
+    )
+    return {'rows': rows, 'bytes': 0}
+
+
+def prune_http_cache(dry_run=False) -> dict:
+    # 토큰이 바뀌었거나 삭제된 레포의 항목 (지워져도 다음 요청이 전체 응답을 받을 뿐)
+    rows = _delete_in_batches(
+        GithubResponseCache.objects.filter(used_at__lt=timezone.now() - HTTP_CACHE_RETENTION), _Budget(), dry_run
+    )
+    return {'rows': rows, 'bytes': 0}
+
+
+def compact_point_logs(dry_run=False) -> dict:
+    """
+    보관 기간이 지난 PointLog를 유저/사유별 요약 1행으로 합칩니다. (유저 1명 = 트랜잭션 1개)
+    요약 행의 created_at은 기준 시각으로 두어 다음 실행에서 다시 압축되지 않게 합니다.
+    """
+    cutoff = timezone.now() - POINT_LOG_RETENTION
+    # 이미 요약된 행(기준 시각 이전 유저/사유별 1행)만 남은 유저는 제외
+    old_logs = PointLog.objects.filter(created_at__lt=cutoff)
+    user_ids = list(
+        old_logs.values('user_id', 'reason')
+        .annotate(rows=Count('id'))
+        .filter(rows__gt=1)
+        .values_list('user_id', flat=True)
+        .distinct()
+    )
+    if dry_run:
+        return {'rows': old_logs.filter(user_id__in=user_ids).count(), 'bytes': 0}
+
+    budget = _Budget()
+    removed = 0
+    for user_id in user_ids:
+        if budget.exhausted():
+            break
+        with transaction.atomic(using=DEFAULT_DB):
+            logs = PointLog.objects.select_for_update().filter(user_id=user_id, created_at__lt=cutoff)
+            groups = list(logs.values('reason').annotate(total=Sum('amount'), rows=Count('id')))
+            deleted, _ = logs.delete()
+            summaries = PointLog.objects.bulk_create([
+                PointLog(
+                    user_id=user_id,
+                    amount=group['total'],
+                    reason=group['reason'],
+                    description=f"{cutoff:%Y-%m-%d} 이전 {group['rows']}건 요약",
+                )
+                for group in groups
+            ])
+            # auto_now_add 값을 기준 시각 직전으로 되돌림
+            PointLog.objects.filter(pk__in=[s.pk for s in summaries]).update(created_at=cutoff - timedelta(seconds=1))
+        removed += deleted - len(summaries)
+        budget.pause()
+    return {'rows': removed, 'bytes': 0}
+
+
+def _referenced_artifacts() -> set:
+    referenced = set()
+    for queryset in (
+        Aquarium.objects.values_list('svg_path', flat=True),
+        Aquarium.objects.values_list('og_image_path', flat=True),
+        Fishtank.objects.values_list('svg_path', flat=True),
+        Repository.objects.values_list('og_image_path', flat=True),
+    ):
+        referenced.update(path for path in queryset.iterator() if path)
+    return referenced
+
+
+def prune_orphaned_svgs(dry_run=False) -> dict:
+    """
+    DB 어디에서도 참조하지 않는 렌더 결과물 파일(삭제된 유저/레포, 이전 카드 등)을 지웁니다.
+    """
+    referenced = _referenced_artifacts()
+    min_mtime = time.time() - ORPHAN_FILE_MIN_AGE.total_seconds()
+    budget = _Budget()
+    rows = reclaimed = 0
+
+    for directory in ARTIFACT_DIRS:
+        root = os.path.join(settings.MEDIA_ROOT, directory)
+        if not os.path.isdir(root):
+            continue
+        with os.scandir(root) as entries:
+            for index, entry in enumerate(entries, 1):
+                if budget.exhausted():
+                    break
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+                if f"{directory}/{entry.name}" in referenced or stat.st_mtime > min_mtime:
+                    continue
+                if not dry_run:
+                    try:
+                        os.remove(entry.path)
+                    except FileNotFoundError:
+                        continue
+                rows += 1
+                reclaimed += stat.st_size
+                if index % MAINTENANCE_BATCH_SIZE == 0:
+                    budget.pause()
+    return {'rows': rows, 'bytes': reclaimed}
+
+
+JOBS = {
+    'task_results': prune_task_results,
+    'outstanding_tokens': prune_outstanding_tokens,
+    'point_logs': compact_point_logs,
+    'orphaned_svgs': prune_orphaned_svgs,
+    'http_cache': prune_http_cache,
+}
+
+
+def run_maintenance(jobs=None, dry_run=False) -> dict:
+    """
+    유지보수 작업을 차례로 실행하고 {job: {'rows', 'bytes', 'seconds'}} 보고서를 반환합니다.
+    한 작업이 실패해도 나머지는 계속합니다.
+    """
+    report = {}
+    for name in jobs or JOBS:
+        started = time.monotonic()
+        try:
+            result = JOBS[name](dry_run=dry_run)
+        except Exception as e:
+            logger.error(f"[maintenance] {name} failed: {e}", exc_info=True)
+            result = {'rows': 0, 'bytes': 0, 'error': str(e)}
+        result['seconds'] = round(time.monotonic() - started, 2)
+        report[name] = result
+        logger.info(f"[maintenance] {name}: rows={result['rows']} bytes={result['bytes']} ({result['seconds']}s)")
+
+    if not dry_run:
+        cache.set(MAINTENANCE_REPORT_KEY, {'at': timezone.now().isoformat(), 'jobs': report}, timeout=None)
+    return report
+
+
+def last_maintenance_report():
+    return cache.get(MAINTENANCE_REPORT_KEY)
+
+
+def install_schedule(minutes=None) -> Schedule:
+    """
+    유지보수 스케줄을 등록(또는 갱신)합니다. 작업 지표가 남도록 run_instrumented를 거쳐 실행됩니다.
+    """
+    minutes = minutes or getattr(settings, 'MAINTENANCE_INTERVAL_MINUTES', 60 * 6)
+    schedule, _ = Schedule.objects.update_or_create(
+        name=MAINTENANCE_SCHEDULE_NAME,
+        defaults={
+            'func': 'GithubAquarium.task_metrics.run_instrumented',
+            'args': repr('GithubAquarium.maintenance.run_maintenance'),
+            'schedule_type': Schedule.MINUTES,
+            'minutes': minutes,
+            'repeats': -1,
+        },
+    )
+    return schedule
@@ -0,0 +1,27 @@
+# GithubAquarium/metrics_views.py
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAdminUser
+from drf_yasg.utils import swagger_auto_schema
+from .task_metrics import get_slow_samples, get_task_metrics
+from .task_queue import lane_queue_depths, shed_counts
+
+
+class TaskMetricsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_summary="작업 실행 지표 조회 (관리자)",
+        operation_description=(
+            "작업 함수별 wall time / 쿼리 수 / RSS 증가량 히스토그램과 결과 수, "
+            "레인별 큐 깊이, 부하 차단 횟수, 최근 느린 작업 스택 샘플을 반환합니다."
+        ),
+        tags=["Metrics"],
+    )
+    def get(self, request):
+        return Response({
+            'tasks': get_task_metrics(),
+            'lanes': lane_queue_depths(),
+            'shed': shed_counts(),
+            'slow_samples': get_slow_samples(),
+        })
@@ -62,6 +62,16 @@ GITHUB_CLIENT_SECRET = env('GITHUB_CLIENT_SECRET')
 GITHUB_PRIVATE_KEY = base64.b64decode(str(env('GITHUB_PRIVATE_KEY_B64'))).decode('utf-8')
 GITHUB_WEBHOOK_SECRET = env('GITHUB_WEBHOOK_SECRET')
 GITHUB_CALLBACK_URL = env('GITHUB_CALLBACK_URL')
+# 동기화용 GraphQL 엔드포인트 (apps/users/github_graphql.py, 로컬 stub 서버로 바꿔 테스트 가능)
+GITHUB_GRAPHQL_URL = env('GITHUB_GRAPHQL_URL', default='') or 'https://api.github.com/graphql'
+GITHUB_GRAPHQL_REPOSITORY_PAGE_SIZE = 25  # 목록 요청 1회에 담을 레포 수
+GITHUB_GRAPHQL_HISTORY_PAGE_SIZE = 50  # 레포마다 목록과 함께 가져올 첫 커밋 페이지 크기
+# 동기화용 REST 엔드포인트 (apps/users/github_rest.py, ETag 조건부 요청)
+GITHUB_API_URL = env('GITHUB_API_URL', default='') or 'https://api.github.com'
+# 토큰별 요청 속도 조절 (apps/users/rate_limit.py)
+GITHUB_RATE_LIMIT_RESERVE = 100  # reset 전까지 동기화가 쓰지 않고 남겨둘 요청 수
+GITHUB_RATE_LIMIT_BURST = 10  # 연속으로 보낼 수 있는 최대 요청 수 (token bucket 크기)
+GITHUB_RATE_LIMIT_MAX_WAIT = 10  # sec, 이보다 오래 기다려야 하면 작업을 멈추고 해제 시각에 재예약
 
 # --- Application Definition ---
 # Lists all Django apps that are activated in this project.
@@ -122,6 +132,8 @@ ROOT_URLCONF = 'GithubAquarium.urls'
 
 # WSGI application entry point
 WSGI_APPLICATION = 'GithubAquarium.wsgi.application'
+# ASGI application entry point (async 공개 렌더 엔드포인트용, uvicorn)
+ASGI_APPLICATION = 'GithubAquarium.asgi.application'
 
 # Template engine settings
 TEMPLATES = [
@@ -141,15 +153,53 @@ TEMPLATES = [
 
 # --- Database Configuration ---
 # https://docs.djangoproject.com/en/stable/ref/settings/#databases
+# 쓰기 락 경합을 줄이기 위해 SQLite 파일을 용도별로 분리 (GithubAquarium/db_router.py)
+# 각 연결에는 WAL 등 운영용 PRAGMA가 적용됨 (GithubAquarium/sqlite_backend)
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'GithubAquarium.sqlite_backend',
         'NAME': BASE_DIR / 'db.sqlite3',
         'OPTIONS': {
             # DB가 잠겨있으면 20초까지 대기하다가 풀리면 씁니다.
             'timeout': 20, 
         }
-    }
+    },
+    # django-q 브로커/결과/스케줄
+    'queue': {
+        'ENGINE': 'GithubAquarium.sqlite_backend',
+        'NAME': BASE_DIR / 'queue.sqlite3',
+        'OPTIONS': {
+            'timeout': 20,
+        }
+    },
+    # 커밋 이력 (repositories.Commit)
+    'commits': {
+        'ENGINE': 'GithubAquarium.sqlite_backend',
+        'NAME': BASE_DIR / 'commits.sqlite3',
+        'OPTIONS': {
+            'timeout': 20,
+        }
+    },
+}
+DATABASE_ROUTERS = ['GithubAquarium.db_router.DatabaseRouter']
+
+# --- Cache Configuration ---
+# 공개 렌더 결과물과 single-flight 락을 웹 워커/qcluster 프로세스가 공유하도록 DB 캐시 사용
+# (최초 1회 `manage.py createcachetable` 필요)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        }
+    },
+    # 작업 간 조정 상태 (queue DB, db_router.TABLE_DATABASES)
+    # 동기화 트랜잭션(default/commits) 안에서 써도 롤백되지 않음
+    'coordination': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'coordination_cache',
+    },
 }
 
 # --- Authentication and User Model ---
@@ -363,10 +413,57 @@ Q_CLUSTER = {
     'recycle': 500,
     'timeout': 6000,  # sec
     'retry': 36000,
-    'orm': 'default', # temporary use ORM as broker
+    'orm': 'queue', # ORM broker (별도 SQLite 파일, db_router 참고)
 }
 
+# --- Task Queue Settings (GithubAquarium/task_queue.py) ---
+# 레인별 워커 풀 크기: `manage.py qcluster_lane <lane>` 으로 레인마다 클러스터를 띄움
+TASK_LANE_WORKERS = {
+    'interactive': 2,  # 사용자 조작 직후 재렌더링
+    'webhook': 2,  # GitHub 웹훅 처리
+    'bulk': 2,  # 전체 동기화, OG 카드, 스케줄 작업 (Q_CLUSTER 큐 이름 그대로)
+}
+# 레인 대기 작업 수가 이 이상이면 저가치 작업(재렌더링, OG 카드, star 갱신)을 버림
+TASK_SHED_THRESHOLDS = {
+    'interactive': 200,
+    'webhook': 500,
+    'bulk': 1000,
+}
+TASK_SHED_DEFER_DELAY = 60  # sec, 과부하 레인에서 사용자 조작 직후 렌더를 버리지 않고 미루는 시간
+TASK_DEBOUNCE_WINDOW = 3  # sec, 같은 렌더 작업 요청이 이만큼 잠잠해지면 1회 실행
+TASK_DEBOUNCE_MAX_WAIT = 30  # sec, 요청이 계속 이어져도 이 시간 안에는 실행
+TASK_SLOW_THRESHOLD = 60  # sec, 이 시간을 넘긴 작업은 watchdog이 스택 샘플을 로그로 남김
+TASK_STACK_SAMPLE_INTERVAL = 30  # sec, 느린 작업 스택 샘플 간격
+TASK_RSS_SAMPLE_INTERVAL = 0.1  # sec, 작업 중 현재 RSS(/proc/self/statm) 샘플 간격 (작업별 최대 RSS 증가량)
+SYNC_REPOSITORY_TIMEOUT = 600  # sec, 전체 동기화의 레포 1개 하위 작업 제한 시간 (apps/users/tasks.py)
+SYNC_RUN_CHECK_GRACE = 60  # sec, 하위 작업 제한 시간 뒤 이만큼 지나 그룹을 점검 (강제 종료된 하위 작업을 실패로 마무리)
+SYNC_BACKFILL_TIME_BUDGET = 300  # sec, 최초 동기화 커밋 이력 백필이 하위 작업 1회에 쓰는 시간 (넘으면 커서부터 이어서 재예약)
+
+COMMIT_INGEST_BATCH_SIZE = 500  # 커밋 upsert 배치 크기 (배치마다 작성자 조회 1회 + bulk upsert 1회, apps/repositories/ingest.py)
+
+# --- Maintenance Settings (GithubAquarium/maintenance.py) ---
+MAINTENANCE_INTERVAL_MINUTES = 60 * 6  # `manage.py run_maintenance --schedule` 로 등록되는 실행 간격
+MAINTENANCE_BATCH_SIZE = 500  # 삭제 배치 크기 (배치 = 트랜잭션 1개)
+MAINTENANCE_BATCH_PAUSE = 0.2  # sec, 배치 사이 휴식
+MAINTENANCE_TIME_BUDGET = 60  # sec, 작업별 1회 실행 시간 한도 (남은 양은 다음 실행)
+MAINTENANCE_TASK_SUCCESS_RETENTION = timedelta(days=7)
+MAINTENANCE_TASK_FAILURE_RETENTION = timedelta(days=30)
+MAINTENANCE_POINT_LOG_RETENTION = timedelta(days=365)  # 이전 로그는 유저/사유별 요약 1행으로 압축
+MAINTENANCE_HTTP_CACHE_RETENTION = timedelta(days=30)  # 이 기간 쓰이지 않은 GitHub 조건부 요청 캐시 삭제
+
 # --- Game Logic Settings ---
 DEFAULT_FISH_GROUP = "ShrimpWich"
 
+# --- Render Cache Settings ---
+RENDER_CACHE_TIMEOUT = 60 * 5  # sec, 같은 버전의 공개 렌더 결과 재사용 시간
+RENDER_WAIT_TIMEOUT = 5  # sec, 다른 요청의 렌더 결과를 기다리는 최대 시간
+RENDER_ASYNC_THREADS = 4  # async 공개 렌더 뷰의 캐시 미스 렌더 스레드 수 (프로세스당)
+RENDER_MIN_SIZE = 100  # px, 공개 렌더 ?width= / ?height= 최소값
+RENDER_MAX_SIZE = 2000  # px, 공개 렌더 ?width= / ?height= 최대값
+TEAM_RENDER_MAX_MEMBERS = 16  # 팀 합성 렌더 최대 멤버 수
+ORG_RENDER_FISH_BUDGET = 60  # 조직 피시탱크에 그릴 최대 물고기 수
+RENDER_POPULARITY_FLUSH_INTERVAL = 30  # sec, 공개 렌더 인기도를 공유 캐시에 반영하는 주기
+RENDER_POPULARITY_HALF_LIFE = 60 * 60  # sec, 인기도 점수 반감기
+RENDER_HOT_MIN_SCORE = 5  # 이 점수 이상인 렌더는 무효화 시 미리 렌더링
+
 RENDER_DOMAIN = "http://localhost:8000" if DEBUG else "https://githubaquarium.store"
\ No newline at end of file
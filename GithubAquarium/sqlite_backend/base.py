@@ -0,0 +1,32 @@
+# GithubAquarium/sqlite_backend/base.py
+"""
+연결할 때마다 운영용 PRAGMA를 적용하는 SQLite 백엔드. (ENGINE = 'GithubAquarium.sqlite_backend')
+
+- journal_mode=WAL: 읽기가 쓰기를 막지 않음
+- synchronous=NORMAL: WAL에서는 트랜잭션마다 fsync하지 않아도 DB가 깨지지 않음 (전원 장애 시 마지막 커밋만 유실 가능)
+- mmap_size / cache_size: 읽기를 메모리 매핑 + 큰 페이지 캐시로 처리
+
+DATABASES[...]['OPTIONS']['pragmas'] 로 DB별로 덮어쓸 수 있습니다.
+"""
+from django.db.backends.sqlite3 import base
+
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,  # bytes
+    'cache_size': -64 * 1024,  # 음수 = KiB (64MiB)
+}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        # sqlite3.connect()가 모르는 키이므로 꺼내둠
+        self.pragmas = {**DEFAULT_PRAGMAS, **params.pop('pragmas', {})}
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
@@ -0,0 +1,274 @@
+# GithubAquarium/task_metrics.py
+"""
+django-q 작업 실행 지표와 느린 작업 감시(watchdog).
+
+task_queue.enqueue()로 등록한 작업은 워커에서 run_instrumented()를 거쳐 실행되며,
+작업 함수별로 다음을 히스토그램으로 집계합니다.
+
+- wall time (ms), DB 쿼리 수, 작업 중 최대 RSS 증가량 (KiB, 시작 시 RSS 대비 실행 중 최대 RSS)
+- 결과 (success / failure)
+
+워커 프로세스마다 메모리에 모았다가 작업이 끝날 때 공유 캐시(TASK_METRICS_KEY)에 합칩니다.
+다른 워커가 합치는 중이면 다음 작업 때 함께 합칩니다. (popularity.py 와 같은 방식)
+
+RSS는 /proc/self/statm의 현재 값을 작업 시작/종료 때와 watchdog 스레드에서 TASK_RSS_SAMPLE_INTERVAL 초마다 읽습니다.
+(ru_maxrss는 프로세스 평생 최대값이라, 오래 사는 워커에서는 앞선 작업이 최대값을 올려 두면 이후 작업의 증가량이 0으로 보임)
+
+작업이 TASK_SLOW_THRESHOLD 초를 넘기면 watchdog 스레드가 작업 스레드의 스택을
+TASK_STACK_SAMPLE_INTERVAL 초마다 로그로 남기고, 최근 샘플은 캐시(TASK_SLOW_SAMPLES_KEY)에 보관합니다.
+`manage.py task_metrics` 와 /api/metrics/tasks/ 로 조회합니다.
+"""
+import logging
+import os
+import resource
+import sys
+import threading
+import time
+import traceback
+from bisect import bisect_left
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+TASK_METRICS_KEY = "task:metrics"
+TASK_SLOW_SAMPLES_KEY = "task:metrics:slow"
+MERGE_LOCK_KEY = "task:metrics:lock"
+MERGE_LOCK_TIMEOUT = 10
+
+# 히스토그램 버킷 상한 (마지막 버킷은 그 이상 전부)
+WALL_MS_BUCKETS = (10, 50, 100, 500, 1000, 5000, 30000, 60000, 300000, 1800000)
+QUERY_BUCKETS = (0, 10, 50, 100, 500, 1000, 5000, 10000, 50000)
+RSS_KIB_BUCKETS = (0, 1024, 10240, 51200, 102400, 512000, 1048576)
+HISTOGRAMS = {
+    'wall_ms': WALL_MS_BUCKETS,
+    'queries': QUERY_BUCKETS,
+    'rss_kib': RSS_KIB_BUCKETS,
+}
+OUTCOMES = ('success', 'failure')
+
+# 이 시간(초)을 넘긴 작업은 스택 샘플을 남김
+TASK_SLOW_THRESHOLD = getattr(settings, 'TASK_SLOW_THRESHOLD', 60)
+TASK_STACK_SAMPLE_INTERVAL = getattr(settings, 'TASK_STACK_SAMPLE_INTERVAL', 30)
+# 작업 1건당 최대 샘플 수 / 캐시에 보관할 최근 샘플 수
+TASK_STACK_SAMPLES_PER_TASK = getattr(settings, 'TASK_STACK_SAMPLES_PER_TASK', 10)
+TASK_SLOW_SAMPLES_KEPT = getattr(settings, 'TASK_SLOW_SAMPLES_KEPT', 50)
+# 작업 실행 중 현재 RSS를 읽는 간격 (이보다 짧게 튄 메모리는 놓칠 수 있음)
+TASK_RSS_SAMPLE_INTERVAL = getattr(settings, 'TASK_RSS_SAMPLE_INTERVAL', 0.1)
+
+_PAGE_KIB = os.sysconf('SC_PAGE_SIZE') // 1024 if hasattr(os, 'sysconf') else 4
+
+
+def _bucket_labels(bounds):
+    return [f"<={bound}" for bound in bounds] + [f">{bounds[-1]}"]
+
+
+def _empty_entry() -> dict:
+    entry = {'count': 0, 'outcomes': dict.fromkeys(OUTCOMES, 0)}
+    for name, bounds in HISTOGRAMS.items():
+        entry[name] = {'sum': 0, 'max': 0, 'buckets': [0] * (len(bounds) + 1)}
+    return entry
+
+
+def _observe(entry, name, value):
+    histogram = entry[name]
+    histogram['sum'] += value
+    histogram['max'] = max(histogram['max'], value)
+    histogram['buckets'][bisect_left(HISTOGRAMS[name], value)] += 1
+
+
+def _merge_entry(target, source):
+    target['count'] += source['count']
+    for outcome, count in source['outcomes'].items():
+        target['outcomes'][outcome] = target['outcomes'].get(outcome, 0) + count
+    for name in HISTOGRAMS:
+        histogram, other = target[name], source[name]
+        histogram['sum'] += other['sum']
+        histogram['max'] = max(histogram['max'], other['max'])
+        histogram['buckets'] = [a + b for a, b in zip(histogram['buckets'], other['buckets'])]
+
+
+# --- Collection ---
+
+class _QueryCounter:
+    """connection.execute_wrapper 용 쿼리 카운터 (DEBUG와 무관하게 동작)"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+_pending = {}  # func -> entry (아직 공유 캐시에 합치지 못한 지표)
+_pending_lock = threading.Lock()
+
+
+def _current_rss_kib() -> int:
+    # statm 두 번째 값: 상주 페이지 수
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_KIB
+    except (OSError, ValueError, IndexError):
+        # /proc가 없는 환경(macOS 개발 환경 등)은 최대 RSS로 대신 (macOS 단위는 byte)
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss // 1024 if sys.platform == 'darwin' else max_rss
+
+
+def record(func: str, wall_ms: float, queries: int, rss_kib: int, success: bool):
+    with _pending_lock:
+        entry = _pending.setdefault(func, _empty_entry())
+        entry['count'] += 1
+        entry['outcomes']['success' if success else 'failure'] += 1
+        _observe(entry, 'wall_ms', wall_ms)
+        _observe(entry, 'queries', queries)
+        _observe(entry, 'rss_kib', rss_kib)
+    flush()
+
+
+def flush():
+    """
+    프로세스에 쌓인 지표를 공유 캐시에 합칩니다. 다른 프로세스가 합치는 중이면 다음으로 미룹니다.
+    """
+    with _pending_lock:
+        if not _pending:
+            return
+        pending = dict(_pending)
+        _pending.clear()
+
+    if not cache.add(MERGE_LOCK_KEY, 1, timeout=MERGE_LOCK_TIMEOUT):
+        _restore(pending)
+        return
+
+    try:
+        shared = cache.get(TASK_METRICS_KEY) or {}
+        for func, entry in pending.items():
+            _merge_entry(shared.setdefault(func, _empty_entry()), entry)
+        cache.set(TASK_METRICS_KEY, shared, timeout=None)
+    except Exception as e:
+        logger.warning(f"[task_metrics] failed to merge metrics: {e}")
+        _restore(pending)
+    finally:
+        cache.delete(MERGE_LOCK_KEY)
+
+
+def _restore(pending):
+    with _pending_lock:
+        for func, entry in pending.items():
+            _merge_entry(_pending.setdefault(func, _empty_entry()), entry)
+
+
+# --- Watchdog ---
+
+class _Watchdog(threading.Thread):
+    """
+    작업 실행 중 rss_interval초마다 현재 RSS를 읽어 최대값을 기록하고,
+    작업이 threshold초를 넘기면 interval초마다 작업 스레드의 스택을 샘플링합니다.
+    """
+
+    def __init__(self, func, target_thread_id, threshold=TASK_SLOW_THRESHOLD, interval=TASK_STACK_SAMPLE_INTERVAL,
+                 rss_interval=TASK_RSS_SAMPLE_INTERVAL):
+        super().__init__(name=f"task-watchdog:{func}", daemon=True)
+        self.func = func
+        self.target_thread_id = target_thread_id
+        self.threshold = threshold
+        self.interval = interval
+        self.rss_interval = rss_interval
+        self.rss_baseline = self.rss_peak = _current_rss_kib()
+        self.started_at = time.monotonic()
+        self.finished = threading.Event()
+
+    def run(self):
+        next_sample, samples = self.threshold, 0
+        while not self.finished.wait(self.rss_interval):
+            self.sample_rss()
+            if samples < TASK_STACK_SAMPLES_PER_TASK and time.monotonic() - self.started_at >= next_sample:
+                self.sample()
+                next_sample, samples = next_sample + self.interval, samples + 1
+
+    def sample_rss(self):
+        self.rss_peak = max(self.rss_peak, _current_rss_kib())
+
+    def rss_delta_kib(self) -> int:
+        # 작업 중 최대 RSS - 시작 시 RSS (마지막 샘플 이후 값도 반영)
+        self.sample_rss()
+        return max(0, self.rss_peak - self.rss_baseline)
+
+    def sample(self):
+        frame = sys._current_frames().get(self.target_thread_id)
+        if frame is None:
+            return
+        elapsed = time.monotonic() - self.started_at
+        stack = "".join(traceback.format_stack(frame))
+        logger.warning(f"[task_metrics] slow task {self.func} running for {elapsed:.0f}s\n{stack}")
+        try:
+            samples = cache.get(TASK_SLOW_SAMPLES_KEY) or []
+            samples.append({'func': self.func, 'elapsed_s': round(elapsed, 1), 'at': time.time(), 'stack': stack})
+            cache.set(TASK_SLOW_SAMPLES_KEY, samples[-TASK_SLOW_SAMPLES_KEPT:], timeout=None)
+        except Exception as e:
+            logger.warning(f"[task_metrics] failed to store stack sample: {e}")
+
+    def stop(self):
+        self.finished.set()
+
+
+# --- Entry point ---
+
+def run_instrumented(func: str, *args, **kwargs):
+    """
+    (워커에서 실행) func(*args, **kwargs)를 실행하면서 지표를 기록합니다.
+    예외는 그대로 다시 올려 django-q가 실패로 기록하게 합니다.
+    """
+    counter = _QueryCounter()
+    watchdog = _Watchdog(func, threading.get_ident())
+    watchdog.start()
+    started = time.perf_counter()
+    success = False
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            result = import_string(func)(*args, **kwargs)
+        success = True
+        return result
+    finally:
+        watchdog.stop()
+        wall_ms = (time.perf_counter() - started) * 1000
+        try:
+            record(func, wall_ms, counter.count, watchdog.rss_delta_kib(), success)
+        except Exception as e:
+            # 지표 기록 실패가 작업 결과를 바꾸면 안 됨
+            logger.warning(f"[task_metrics] failed to record {func}: {e}")
+
+
+# --- Read ---
+
+def get_task_metrics() -> dict:
+    """
+    작업 함수별 지표 요약: 실행 수, 결과별 수, 히스토그램(버킷 라벨 포함), 평균/최대
+    """
+    shared = cache.get(TASK_METRICS_KEY) or {}
+    summary = {}
+    for func, entry in sorted(shared.items()):
+        item = {'count': entry['count'], 'outcomes': entry['outcomes']}
+        for name, bounds in HISTOGRAMS.items():
+            histogram = entry[name]
+            item[name] = {
+                'avg': round(histogram['sum'] / entry['count'], 1) if entry['count'] else 0,
+                'max': round(histogram['max'], 1),
+                'histogram': dict(zip(_bucket_labels(bounds), histogram['buckets'])),
+            }
+        summary[func] = item
+    return summary
+
+
+def get_slow_samples() -> list:
+    return cache.get(TASK_SLOW_SAMPLES_KEY) or []
+
+
+def reset_task_metrics():
+    cache.delete_many([TASK_METRICS_KEY, TASK_SLOW_SAMPLES_KEY])
@@ -0,0 +1,317 @@
+# GithubAquarium/task_queue.py
+"""
+django-q 작업 등록 헬퍼.
+
+우선순위 레인(lane): 작업 종류별로 큐(ORM broker의 list_key)와 워커 풀을 나눕니다.
+배경 변경 후 재렌더링 같은 대화형 작업이 다른 유저의 몇 시간짜리 전체 동기화 뒤에서 기다리지 않도록
+각 레인은 별도의 클러스터(`manage.py qcluster_lane <lane>`)가 처리합니다.
+
+- interactive: 사용자 조작 직후의 재렌더링
+- webhook: GitHub 웹훅 처리
+- bulk: 전체 동기화, OG 카드 등 오래 걸리거나 급하지 않은 작업 (기존 큐 이름 그대로, 스케줄 담당)
+
+enqueue()는 레인을 지정해 등록하고, lane_queue_depths()로 레인별 대기 작업 수를 봅니다.
+등록한 작업은 워커에서 task_metrics.run_instrumented()를 거쳐 실행되어 실행 지표가 집계됩니다.
+
+부하 차단(load shedding): 웹훅 폭주나 대량 로그인으로 큐가 쌓이면 ORM 큐와 같은 SQLite DB를 쓰는
+모든 요청이 느려집니다. enqueue(..., shed=<종류>)로 등록한 저가치 작업(재렌더링, OG 카드, star 수 갱신)은
+해당 레인의 대기 작업 수가 TASK_SHED_THRESHOLDS 이상이면 등록하지 않고 버립니다.
+shed를 지정하지 않은 작업(동기화, push 웹훅)은 항상 등록됩니다.
+사용자 조작(배경 변경, 노출 설정, 리롤 등) 직후의 렌더는 다시 요청될 보장이 없으므로
+enqueue_debounced(..., shed=..., defer=True)로 등록해 버리지 않고 TASK_SHED_DEFER_DELAY 뒤로 미룹니다.
+(미룬 요청도 dedup key로 합쳐지므로 과부하 중 같은 렌더가 여러 번 쌓이지 않음)
+버린 작업은 나중에 복구됩니다. (렌더 버전이 남아 있어 다음 조회/변경 때 다시 렌더, star 수는 다음 동기화/push 때 보정)
+차단 횟수(버림 + 미룸)는 종류별로 집계되어 shed_counts() / `manage.py queue_depth` 로 볼 수 있습니다.
+
+enqueue_debounced(): 같은 (func, args) 작업이 짧은 시간에 여러 번 요청되면 합쳐서 실행합니다.
+(예: 200개 레포 동기화 중 기여자마다 요청되는 아쿠아리움 렌더 → 처음 1회 + 이후 묶음마다 1회)
+
+- dedup key: (lane, func, args) 해시. 실행 대기/예약 중인 작업이 있는 동안 캐시에 표시됩니다.
+- leading edge: 대기 중인 작업이 없으면 바로 lane 큐에 등록합니다. (사용자 조작 직후 렌더가 늦지 않도록)
+- 대기/실행 중에 들어온 요청은 마지막 요청 시각만 갱신하고 합쳐집니다.
+- trailing edge: 실행이 끝났을 때 그 사이 요청이 있었다면 워커에서 기다리지 않고 1회성 스케줄(enqueue_at)로
+  마지막 요청 + window 시각에 다시 확인하도록 예약합니다. 스케줄이 실행될 때 그 뒤 요청이 또 있었다면
+  (첫 요청 후 TASK_DEBOUNCE_MAX_WAIT 안에서) 다시 예약하고, 잠잠해졌으면 실행합니다.
+  스케줄러는 약 30초마다 돌므로 trailing 실행은 그만큼 늦을 수 있습니다. 대신 레인 워커는 기다리는 동안 점유되지 않습니다.
+- dedup key는 CACHES['coordination'](queue DB)에 둡니다. 기본 DB의 쓰기 트랜잭션(동기화 등)이
+  진행 중이어도 막히지 않아, 지워지지 못한 key 때문에 이후 요청이 TTL 동안 버려지는 일이 없습니다.
+
+on_commit(): 트랜잭션 안에서 변경한 데이터로 작업이 실행되어야 할 때, 관련 DB(기본 + 커밋 이력)의
+트랜잭션이 모두 커밋된 뒤 등록합니다. (큐 DB 쓰기는 즉시 커밋되므로 워커가 커밋 전 데이터를 읽을 수 있음)
+
+enqueue_at(): 지정 시각 이후에 실행할 작업을 1회성 스케줄로 등록합니다. (GitHub rate limit 해제 후 재개 등)
+스케줄은 bulk 레인 클러스터의 스케줄러가 bulk 큐에 넣습니다.
+
+group_queue_entries(): django-q group에 속한 작업 중 아직 ORM 큐에 남아 있는 행(대기 중 또는 워커가 가져감).
+워커가 timeout으로 강제 종료되면 finally도 hook도 실행되지 않고 행만 lock된 채 남으므로,
+하위 작업 완료를 세는 호출자가 lock 시각으로 죽은 작업을 가려낼 때 씁니다.
+"""
+import hashlib
+import logging
+import time
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import transaction
+from django_q.brokers import get_broker
+from django_q.conf import Conf
+from django_q.models import OrmQ, Schedule
+from django_q.tasks import async_task
+from GithubAquarium.db_router import COMMITS_DB, DEFAULT_DB
+from GithubAquarium.task_metrics import run_instrumented
+
+logger = logging.getLogger(__name__)
+
+# debounce dedup key 저장소 (queue DB)
+coordination_cache = caches['coordination']
+
+LANE_INTERACTIVE = 'interactive'
+LANE_WEBHOOK = 'webhook'
+LANE_BULK = 'bulk'
+LANES = (LANE_INTERACTIVE, LANE_WEBHOOK, LANE_BULK)
+
+# 레인별 워커 수 (qcluster_lane이 사용)
+TASK_LANE_WORKERS = getattr(settings, 'TASK_LANE_WORKERS', {
+    LANE_INTERACTIVE: 2,
+    LANE_WEBHOOK: 2,
+    LANE_BULK: 2,
+})
+
+# 레인별 부하 차단 기준 (대기 작업 수). 이 이상이면 shed 작업을 버림
+TASK_SHED_THRESHOLDS = getattr(settings, 'TASK_SHED_THRESHOLDS', {
+    LANE_INTERACTIVE: 200,
+    LANE_WEBHOOK: 500,
+    LANE_BULK: 1000,
+})
+# 과부하 레인에서 defer 작업을 미루는 시간 (sec)
+TASK_SHED_DEFER_DELAY = getattr(settings, 'TASK_SHED_DEFER_DELAY', 60)
+# 큐 깊이 조회(COUNT 쿼리) 결과를 프로세스 안에서 재사용하는 시간
+TASK_DEPTH_CHECK_INTERVAL = getattr(settings, 'TASK_DEPTH_CHECK_INTERVAL', 2)
+
+# 버릴 수 있는 작업 종류 (집계 단위)
+SHED_RENDER = 'render'
+SHED_OG_CARD = 'og_card'
+SHED_STAR = 'webhook_star'
+SHED_KINDS = (SHED_RENDER, SHED_OG_CARD, SHED_STAR)
+
+# 마지막 요청 후 이만큼 조용해야 실행
+TASK_DEBOUNCE_WINDOW = getattr(settings, 'TASK_DEBOUNCE_WINDOW', 3)
+# 요청이 계속 이어져도 합쳐진 첫 요청 후 이 시간이 지나면 trailing 실행
+TASK_DEBOUNCE_MAX_WAIT = getattr(settings, 'TASK_DEBOUNCE_MAX_WAIT', 30)
+# 워커가 죽어 dedup key가 남아도 이 시간 뒤에는 다시 등록 가능
+TASK_DEBOUNCE_QUEUED_TIMEOUT = getattr(settings, 'TASK_DEBOUNCE_QUEUED_TIMEOUT', 60 * 10)
+
+
+_brokers = {}
+_depths = {}  # lane -> (조회 시각, 대기 작업 수)
+
+
+def lane_list_key(lane: str) -> str:
+    """
+    레인의 큐 이름. bulk는 기존 클러스터 큐(Q_CLUSTER['name'])를 그대로 써서
+    레인을 지정하지 않은 작업과 스케줄 작업도 bulk로 처리됩니다.
+    """
+    if lane not in LANES:
+        raise ValueError(f"Unknown task lane: {lane}")
+    if lane == LANE_BULK:
+        return Conf.PREFIX
+    return f"{Conf.PREFIX}:{lane}"
+
+
+def get_lane_broker(lane: str):
+    broker = _brokers.get(lane)
+    if broker is None:
+        broker = _brokers[lane] = get_broker(lane_list_key(lane))
+    return broker
+
+
+def enqueue(func: str, *args, lane=LANE_BULK, shed=None, instrument=True, **kwargs):
+    """
+    레인을 지정해 작업을 등록합니다. 나머지 인자는 django_q async_task와 같습니다.
+    shed(SHED_KINDS 중 하나)를 지정하면 레인이 과부하일 때 등록하지 않고 None을 반환합니다.
+    instrument=False면 실행 지표 래퍼 없이 func를 직접 실행합니다.
+    """
+    if shed is not None and should_shed(lane, shed):
+        return None
+    broker = get_lane_broker(lane)
+    if not instrument:
+        return async_task(func, *args, broker=broker, **kwargs)
+    return async_task('GithubAquarium.task_metrics.run_instrumented', func, *args, broker=broker, **kwargs)
+
+
+def enqueue_at(func: str, *args, run_at, name=None, lane=LANE_BULK, instrument=True, **q_options):
+    """
+    run_at(epoch 초 또는 aware datetime) 이후 lane 큐에서 func(*args)를 1회 실행하도록 예약합니다.
+    (스케줄러는 bulk 레인 클러스터에서 돌고, 만든 작업은 broker_name으로 lane 큐에 넣음)
+    args는 스케줄러가 literal_eval로 읽으므로 리터럴(숫자/문자열/None/list/dict)만 가능합니다.
+    q_options: group, timeout, task_name 등 async_task 옵션
+    """
+    if not isinstance(run_at, datetime):
+        run_at = datetime.fromtimestamp(run_at, tz=dt_timezone.utc)
+    if lane != LANE_BULK:
+        q_options['broker_name'] = lane_list_key(lane)
+    if instrument:
+        func, args = 'GithubAquarium.task_metrics.run_instrumented', (func,) + args
+    return Schedule.objects.create(
+        name=name,
+        func=func,
+        args=repr(args),
+        kwargs=f"q_options={q_options!r}",
+        schedule_type=Schedule.ONCE,
+        next_run=run_at,
+    )
+
+
+def on_commit(callback, using=(DEFAULT_DB, COMMITS_DB)):
+    """
+    using의 DB 트랜잭션이 모두 커밋된 뒤 callback()을 실행합니다. (안쪽 트랜잭션의 DB부터 나열)
+    진행 중인 트랜잭션이 없으면 바로 실행하고, 하나라도 롤백되면 실행하지 않습니다.
+    callback의 예외는 로그만 남기고 커밋된 트랜잭션 쪽으로 전파하지 않습니다.
+    """
+    aliases = list(using)
+    if not aliases:
+        callback()
+        return
+    transaction.on_commit(lambda: on_commit(callback, aliases[1:]), using=aliases[0], robust=True)
+
+
+def _queued_depth(lane: str) -> int:
+    now = time.monotonic()
+    checked = _depths.get(lane)
+    if checked and now - checked[0] < TASK_DEPTH_CHECK_INTERVAL:
+        return checked[1]
+    depth = get_lane_broker(lane).queue_size()
+    _depths[lane] = (now, depth)
+    return depth
+
+
+def should_shed(lane: str, kind: str) -> bool:
+    """
+    lane이 기준 이상으로 밀려 있으면 kind 작업을 버리기로 하고 집계합니다.
+    """
+    threshold = TASK_SHED_THRESHOLDS.get(lane)
+    if threshold is None:
+        return False
+    depth = _queued_depth(lane)
+    if depth < threshold:
+        return False
+
+    key = _shed_key(kind)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+    logger.info(f"[task_queue] shed {kind} on lane={lane} (depth {depth} >= {threshold})")
+    return True
+
+
+def _shed_key(kind: str) -> str:
+    return f"task:shed:{kind}"
+
+
+def shed_counts() -> dict:
+    """
+    종류별 누적 부하 차단 횟수 (버림 + 미룸)
+    """
+    found = cache.get_many([_shed_key(kind) for kind in SHED_KINDS])
+    return {kind: found.get(_shed_key(kind), 0) for kind in SHED_KINDS}
+
+
+def lane_queue_depths() -> dict:
+    """
+    레인별 {'queued': 대기 중, 'running': 워커가 가져가 처리 중} 작업 수
+    """
+    depths = {}
+    for lane in LANES:
+        broker = get_lane_broker(lane)
+        depths[lane] = {'queued': broker.queue_size(), 'running': broker.lock_size()}
+    return depths
+
+
+def group_queue_entries(group: str) -> list:
+    """
+    모든 레인 큐에서 group에 속한 OrmQ 행 목록 (payload를 풀어야 하므로 큐 전체를 훑음)
+    row.lock이 broker 재시도 기준(Q_CLUSTER['retry'])보다 오래전이면 대기 중, 그 이후면 워커가 가져간 시각
+    """
+    keys = [lane_list_key(lane) for lane in LANES]
+    entries = []
+    for row in OrmQ.objects.using(Conf.ORM).filter(key__in=keys).iterator():
+        try:
+            task_group = row.task().get('group')
+        except Exception:
+            continue  # 서명/역직렬화 실패 행은 워커도 버림
+        if task_group == group:
+            entries.append(row)
+    return entries
+
+
+def dedup_key(func: str, args, lane=LANE_BULK) -> str:
+    # 레인이 다르면 합치지 않음 (대화형 요청이 bulk 큐에 대기 중인 작업에 묶여 늦어지지 않도록)
+    digest = hashlib.sha1(repr((lane, func, tuple(args))).encode()).hexdigest()[:20]
+    return f"task:debounce:{digest}"
+
+
+def enqueue_debounced(func: str, *args, window=None, lane=LANE_BULK, shed=None, defer=False):
+    """
+    func(*args)를 debounce하여 lane 큐에 등록합니다.
+    새로 등록했으면 task id를, 대기/예약 중인 작업에 합쳐졌거나 부하 차단으로 버렸거나 미뤘으면 None을 반환합니다.
+    defer=True면 부하 차단 시 버리지 않고 TASK_SHED_DEFER_DELAY 뒤에 실행하도록 예약합니다. (사용자 조작 직후 렌더)
+    """
+    shed_now = shed is not None and should_shed(lane, shed)
+    if shed_now and not defer:
+        return None
+
+    window = TASK_DEBOUNCE_WINDOW if window is None else window
+    key = dedup_key(func, args, lane)
+    now = time.time()
+
+    coordination_cache.set(f"{key}:last", now, timeout=TASK_DEBOUNCE_QUEUED_TIMEOUT)
+    if not coordination_cache.add(f"{key}:queued", now, timeout=TASK_DEBOUNCE_QUEUED_TIMEOUT):
+        logger.debug(f"[task_queue] coalesced {func}{args}")
+        return None
+
+    if shed_now:
+        # 대기/예약 중인 작업이 없으므로 직접 trailing 실행을 예약 (dedup key는 실행이 끝날 때 지워짐)
+        _schedule_debounced(key, func, args, window, lane, now, now + TASK_SHED_DEFER_DELAY)
+        logger.info(f"[task_queue] deferred {func}{args} on lane={lane} by {TASK_SHED_DEFER_DELAY}s")
+        return None
+
+    # 확인/예약 단계가 지표에 섞이지 않도록 실제 작업만 계측 (run_debounced 안에서)
+    return enqueue(
+        'GithubAquarium.task_queue.run_debounced', key, func, list(args), window, lane,
+        lane=lane, instrument=False,
+    )
+
+
+def run_debounced(key: str, func: str, args, window, lane=LANE_BULK, since=None):
+    """
+    (워커에서 실행) func(*args)를 실행하고, 실행 중 합쳐진 요청이 있으면 trailing 실행을 예약합니다.
+    since: trailing 실행이면 합쳐진 첫 요청 시각. 그 뒤에도 요청이 이어지면 실행하지 않고 다시 예약합니다.
+    기다리는 동안 워커를 점유하지 않습니다. (sleep 대신 스케줄)
+    """
+    if since is not None:
+        last = coordination_cache.get(f"{key}:last") or 0
+        run_at = min(last + window, since + TASK_DEBOUNCE_MAX_WAIT)
+        if run_at > time.time():
+            _schedule_debounced(key, func, args, window, lane, since, run_at)
+            return None
+
+    started = time.time()
+    try:
+        return run_instrumented(func, *args)
+    finally:
+        # dedup key를 먼저 지우고 다시 확인: 이후 요청은 스스로 새 작업을 등록하고,
+        # 그 전에 합쳐진 요청(started 이후)은 여기서 trailing 실행으로 넘김
+        coordination_cache.delete(f"{key}:queued")
+        last = coordination_cache.get(f"{key}:last") or 0
+        if last >= started and coordination_cache.add(f"{key}:queued", last, timeout=TASK_DEBOUNCE_QUEUED_TIMEOUT):
+            # 합쳐진 첫 요청은 started 이후이므로 max wait은 started 기준
+            _schedule_debounced(key, func, args, window, lane, started, last + window)
+
+
+def _schedule_debounced(key, func, args, window, lane, since, run_at):
+    enqueue_at(
+        'GithubAquarium.task_queue.run_debounced', key, func, list(args), window, lane, since,
+        run_at=run_at, lane=lane, instrument=False,
+    )
@@ -10,6 +10,7 @@ from django.contrib import admin
 from django.urls import path, include
 from .views import GitHubLogin
 from .webhook_views import GitHubWebhookView
+from .metrics_views import TaskMetricsView
 from django.conf import settings
 from django.conf.urls.static import static
 
@@ -58,6 +59,10 @@ urlpatterns = [
     # URL endpoint for receiving GitHub webhooks
     path('api/webhooks/github/', GitHubWebhookView.as_view(), name='github_webhook'),
 
+    # --- Metrics ---
+    # 작업 실행 지표 (관리자 전용)
+    path('api/metrics/tasks/', TaskMetricsView.as_view(), name='task_metrics'),
+
     # --- Local App APIs ---
     # Include URL configurations from the 'repositories' and 'users' apps
     path('api/repositories/', include('apps.repositories.urls')),
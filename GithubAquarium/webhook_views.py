@@ -2,7 +2,7 @@
 import hashlib
 import hmac
 from django.conf import settings
-from django_q.tasks import async_task
+from GithubAquarium.task_queue import enqueue, LANE_WEBHOOK, SHED_STAR
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -24,5 +24,10 @@ class GitHubWebhookView(APIView):
             return Response({'detail': 'Invalid signature'}, status=403)
 
         event_type = request.headers.get('X-GitHub-Event')
-        async_task('apps.repositories.tasks.process_webhook_event_task', event_type, request.data)
+        # star 수 갱신은 다음 동기화/push 때 보정되므로 과부하 시 버림 (push 등 수집 이벤트는 항상 등록)
+        enqueue(
+            'apps.repositories.tasks.process_webhook_event_task', event_type, request.data,
+            lane=LANE_WEBHOOK,
+            shed=SHED_STAR if event_type == 'star' else None,
+        )
         return Response({'detail': 'Event queued'}, status=200)
\ No newline at end of file
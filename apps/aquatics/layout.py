@@ -0,0 +1,127 @@
+# apps/aquatics/layout.py
+"""
+물고기 배치(layout) 일괄 계산 단계.
+
+탱크의 모든 물고기에 대해 이동 경로(시작/반환 지점), 애니메이션 시간,
+라벨 좌표를 NumPy 배열로 한 번에 계산합니다.
+- 탱크를 물고기 수만큼의 공간 격자(cell)로 나누고 시작/반환 지점을
+  서로 다른 칸에 배정하여 물고기끼리 겹치지 않게 고르게 퍼뜨립니다.
+- 같은 seed면 항상 같은 배치를 반환합니다.
+"""
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+# 좌표 소수점 자리수 (SVG 출력 크기 절약)
+COORD_DECIMALS = 2
+
+
+class SpriteGeometry(NamedTuple):
+    """종 템플릿에서 한 번만 추출하는 viewBox/라벨 앵커 정보"""
+    vb_minx: float
+    vb_miny: float
+    vb_w: float
+    vb_h: float
+    top_x: float
+    top_y: float
+    bot_x: float
+    bot_y: float
+
+
+class FishPlacement(NamedTuple):
+    """물고기 1마리의 배치 결과 (픽셀 단위)"""
+    x0: float
+    y0: float
+    x1: float
+    y1: float
+    duration: float
+    scale: float
+    top_px: float
+    top_py: float
+    bot_px: float
+    bot_py: float
+    top_font: float
+    bot_font: float
+
+
+def _grid_shape(count: int, area_w: float, area_h: float):
+    """
+    이동 가능 영역의 가로세로 비율을 유지하면서 count개 이상의 칸을 갖는 격자 크기
+    """
+    aspect = max(area_w, 1.0) / max(area_h, 1.0)
+    cols = max(1, math.ceil(math.sqrt(count * aspect)))
+    rows = max(1, math.ceil(count / cols))
+    return cols, rows
+
+
+def _grid_points(rng, count, cols, rows):
+    """
+    서로 다른 격자 칸을 무작위로 골라 칸 안의 임의 지점을 [0, 1) 정규화 좌표로 반환합니다.
+    """
+    cells = rng.permutation(cols * rows)[:count]
+    u = (cells % cols + rng.random(count)) / cols
+    v = (cells // cols + rng.random(count)) / rows
+    return u, v
+
+
+def compute_layout(geometries, tank_w, tank_h, persona_width_percent=4, padding=8, seed=None):
+    """
+    물고기 전체의 배치를 한 번에 계산하여 geometries 순서대로 FishPlacement 리스트를 반환합니다.
+    """
+    count = len(geometries)
+    if count == 0:
+        return []
+
+    rng = np.random.default_rng(seed)
+    geo = np.asarray(geometries, dtype=np.float64).reshape(count, len(SpriteGeometry._fields))
+    vb_minx, vb_miny, vb_w, vb_h, top_x, top_y, bot_x, bot_y = geo.T
+
+    # 프론트: baseW = tankW * (percent/100), spriteW = baseW*6
+    base_w = tank_w * (persona_width_percent / 100.0)
+    sprite_w = base_w * 6.0
+    scale = sprite_w / np.maximum(1e-6, vb_w)
+    sprite_h = vb_h * scale
+
+    # 탱크 안에서만 움직이도록 (패딩 + 스프라이트 크기 고려)
+    min_x = float(padding)
+    max_x = max(float(padding), tank_w - padding - sprite_w)
+    min_y = float(padding)
+    max_y = np.maximum(float(padding), tank_h - padding - sprite_h * 0.7)
+
+    # ---- 공간 격자 기반 이동 지점 (시작/반환 지점을 각각 다른 칸에 배정) ----
+    cols, rows = _grid_shape(count, max_x - min_x, float(np.max(max_y)) - min_y)
+    u0, v0 = _grid_points(rng, count, cols, rows)
+    u1, v1 = _grid_points(rng, count, cols, rows)
+
+    x0 = min_x + u0 * (max_x - min_x)
+    y0 = min_y + v0 * (max_y - min_y)
+    x1 = min_x + u1 * (max_x - min_x)
+    y1 = min_y + v1 * (max_y - min_y)
+
+    # 살짝만 위아래 흔들 (프론트처럼 과하지 않게)
+    wiggle = np.minimum(sprite_h * 0.10, 10.0)
+    y0 = np.clip(y0 + rng.uniform(-wiggle, wiggle), min_y, max_y)
+    y1 = np.clip(y1 + rng.uniform(-wiggle, wiggle), min_y, max_y)
+
+    duration = rng.uniform(10, 20, count)
+
+    # ---- anchors in template coord -> pixel coord ----
+    top_px = (top_x - vb_minx) * scale
+    top_py = (top_y - vb_miny) * scale
+    bot_px = (bot_x - vb_minx) * scale
+    bot_py = (bot_y - vb_miny) * scale
+
+    # ---- font size: 프론트 기반 (top 조금 더 큼/굵게) ----
+    base_size = max(10.0, base_w * 0.22)
+    top_font = np.full(count, base_size * 1.1)
+    bot_font = np.full(count, base_size * 0.85)
+
+    table = np.column_stack([
+        x0, y0, x1, y1, duration, scale,
+        top_px, top_py, bot_px, bot_py, top_font, bot_font,
+    ]).round(COORD_DECIMALS)
+    # scale은 반올림하면 스프라이트 크기가 달라지므로 원래 값을 유지
+    table[:, 5] = scale
+
+    return [FishPlacement(*row) for row in table.tolist()]
@@ -4,6 +4,8 @@ import random
 from django.conf import settings
 from apps.items.models import FishSpecies
 from apps.aquatics.models import ContributionFish, UnlockedFish, Aquarium
+from apps.repositories.organizations import apply_fish_created
+from apps.aquatics.versioning import bump_aquarium_version, bump_contribution_versions
 
 logger = logging.getLogger(__name__)
 
@@ -62,17 +64,22 @@ def update_or_create_contribution_fish(contributor):
             aquarium=user_aquarium,  # [핵심] 생성 시 아쿠아리움에 바로 넣기
             is_visible_in_aquarium=True
         )
+        apply_fish_created(contributor)
+        bump_contribution_versions(contributor.repository_id, user.id)
     else:
         # 기존 물고기 업데이트
         if current_fish.fish_species != target_species:
             current_fish.fish_species = target_species
             current_fish.save()
+            # 진화: 피시탱크/아쿠아리움 렌더 입력 변경
+            bump_contribution_versions(contributor.repository_id, user.id)
         
         # 혹시 아쿠아리움 연결이 끊겨있다면 다시 연결 (데이터 보정)
         if not current_fish.aquarium:
             current_fish.aquarium = user_aquarium
             current_fish.is_visible_in_aquarium = True
             current_fish.save()
+            bump_aquarium_version(user.id)
 
     # 5. 도감(UnlockedFish) 업데이트 (Fishdex)
     UnlockedFish.objects.get_or_create(
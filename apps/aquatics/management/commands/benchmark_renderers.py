@@ -0,0 +1,217 @@
+import json
+import platform
+import time
+import tracemalloc
+from contextlib import ExitStack
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import CaptureQueriesContext, setup_databases, teardown_databases
+from django.utils import timezone
+from apps.aquatics.models import ContributionFish
+from apps.aquatics.renderers import render_aquarium_svg, render_fishtank_svg
+from apps.items.models import FishSpecies
+from apps.repositories.models import Contributor, Repository
+from apps.users.models import User
+
+DEFAULT_SIZES = [1, 10, 100, 1000, 10000]
+# 기준선 대비 이 비율 이상 나빠지면 회귀로 표시
+DEFAULT_THRESHOLD = 0.2
+# 비교 대상 지표 (값이 클수록 나쁨)
+COMPARED_METRICS = ('p50_ms', 'p90_ms', 'bytes', 'peak_kib', 'queries')
+
+
+class Command(BaseCommand):
+    help = (
+        '합성 탱크(1~10,000마리, fixtures/templates 전체 종)로 render_aquarium_svg / render_fishtank_svg를 '
+        '측정하여 JSON으로 출력합니다. 모든 DB alias에 대해 임시 테스트 DB를 만들어 실행하므로 실제 DB는 건드리지 않습니다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='측정할 물고기 수 목록')
+        parser.add_argument('--repeat', type=int, default=5, help='크기별 시간 측정 반복 횟수')
+        parser.add_argument('--output', help='결과 JSON을 저장할 파일 (없으면 stdout)')
+        parser.add_argument('--baseline', help='비교할 기준선 JSON 파일')
+        parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='회귀 판정 비율 (0.2 = 20%%)')
+        parser.add_argument('--fail-on-regression', action='store_true', help='회귀가 있으면 실패 코드로 종료')
+
+    def handle(self, *args, **options):
+        templates = self._load_templates()
+        results = []
+
+        # 테스트 러너와 같은 방식으로 alias마다 임시 DB(test_ 접두사, SQLite는 메모리)를 만들고 연결을 전환
+        # 렌더 중 캐시/큐 쓰기도 임시 DB로 가며, 실제 DB에는 락도 잡지 않음
+        self.stderr.write('  - creating test databases')
+        old_config = setup_databases(verbosity=0, interactive=False, serialized_aliases=set())
+        try:
+            species = self._create_species(templates)
+            for size in options['sizes']:
+                user, repository = self._create_tank(species, size)
+                results.append(self._measure(
+                    'render_aquarium_svg', size, options['repeat'],
+                    lambda: render_aquarium_svg(user),
+                ))
+                results.append(self._measure(
+                    'render_fishtank_svg', size, options['repeat'],
+                    lambda: render_fishtank_svg(repository, user),
+                ))
+                self.stderr.write(f'  - {size} fish done')
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+        report = {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'templates': len(templates),
+                'repeat': options['repeat'],
+            },
+            'results': results,
+        }
+
+        if options['baseline']:
+            regressions = self._compare(report, options['baseline'], options['threshold'])
+            report['regressions'] = regressions
+        else:
+            regressions = []
+
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output)
+            self.stderr.write(self.style.SUCCESS(f"=== 결과 저장: {options['output']} ==="))
+        else:
+            self.stdout.write(output)
+
+        for item in regressions:
+            self.stderr.write(self.style.ERROR(
+                f"REGRESSION {item['renderer']} fish={item['fish']} {item['metric']}: "
+                f"{item['baseline']} -> {item['current']} (+{item['change'] * 100:.1f}%)"
+            ))
+        if regressions and options['fail_on_regression']:
+            raise CommandError(f'{len(regressions)}개 지표가 기준선보다 {options["threshold"] * 100:.0f}% 이상 나빠졌습니다.')
+
+    # --- Fixtures ---
+
+    def _load_templates(self):
+        templates_path = settings.BASE_DIR / 'fixtures' / 'templates'
+        templates = {
+            svg_file.stem: svg_file.read_text(encoding='utf-8')
+            for svg_file in sorted(templates_path.glob('*.svg'))
+        }
+        if not templates:
+            raise CommandError(f'{templates_path} 에 SVG 템플릿이 없습니다.')
+        return templates
+
+    def _create_species(self, templates):
+        return [
+            FishSpecies.objects.create(
+                name=f'bench {stem}',
+                group_code=f'bench-{stem}',
+                maturity=FishSpecies.Maturity.HATCHLING,
+                svg_template=svg,
+            )
+            for stem, svg in templates.items()
+        ]
+
+    def _create_tank(self, species, size):
+        """
+        size마리 탱크 1개를 만듭니다.
+        - 아쿠아리움: 벤치 유저가 size개 레포지토리에 기여 → 물고기 size마리
+        - 피시탱크: size명의 유저가 첫 레포지토리에 기여 → 물고기 size마리
+        종은 모든 템플릿을 돌아가며 사용합니다.
+        """
+        now = timezone.now()
+        prefix = f'bench-{size}'
+        users = User.objects.bulk_create(
+            User(username=f'{prefix}-user-{i}') for i in range(size)
+        )
+        repositories = Repository.objects.bulk_create(
+            Repository(
+                github_id=-(size * 100000 + i),
+                name=f'{prefix}-repo-{i}',
+                full_name=f'{prefix}/repo-{i}',
+                html_url='https://github.com/',
+                created_at=now,
+                updated_at=now,
+            )
+            for i in range(size)
+        )
+        owner, tank_repository = users[0], repositories[0]
+
+        contributors = Contributor.objects.bulk_create(
+            [Contributor(user=owner, repository=repo, commit_count=i) for i, repo in enumerate(repositories)]
+            + [Contributor(user=user, repository=tank_repository, commit_count=i) for i, user in enumerate(users[1:], 1)]
+        )
+        ContributionFish.objects.bulk_create(
+            ContributionFish(contributor=contributor, fish_species=species[i % len(species)])
+            for i, contributor in enumerate(contributors)
+        )
+        return owner, tank_repository
+
+    # --- Measurement ---
+
+    def _measure(self, renderer, size, repeat, render_fn):
+        # 1회: 쿼리 수, 출력 크기, 메모리 피크 (tracemalloc은 시간 측정을 왜곡하므로 분리)
+        # 쿼리는 default만이 아니라 모든 alias(queue의 캐시, commits 등)에서 셈
+        tracemalloc.start()
+        with ExitStack() as stack:
+            captured = {
+                alias: stack.enter_context(CaptureQueriesContext(connections[alias]))
+                for alias in connections
+            }
+            svg = render_fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        queries_by_alias = {alias: len(queries) for alias, queries in captured.items()}
+
+        timings = []
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            render_fn()
+            timings.append((time.perf_counter() - started) * 1000)
+
+        p50, p90, p99 = np.percentile(timings, [50, 90, 99])
+        return {
+            'renderer': renderer,
+            'fish': size,
+            'p50_ms': round(float(p50), 3),
+            'p90_ms': round(float(p90), 3),
+            'p99_ms': round(float(p99), 3),
+            'mean_ms': round(float(np.mean(timings)), 3),
+            'bytes': len(svg.encode('utf-8')),
+            'peak_kib': round(peak / 1024, 1),
+            'queries': sum(queries_by_alias.values()),
+            'queries_by_alias': queries_by_alias,
+        }
+
+    def _compare(self, report, baseline_path, threshold):
+        try:
+            with open(baseline_path, encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'기준선 파일을 읽을 수 없습니다: {e}')
+
+        baseline_map = {(r['renderer'], r['fish']): r for r in baseline.get('results', [])}
+        regressions = []
+        for result in report['results']:
+            base = baseline_map.get((result['renderer'], result['fish']))
+            if not base:
+                continue
+            for metric in COMPARED_METRICS:
+                before, after = base.get(metric), result.get(metric)
+                if not before or after is None:
+                    continue
+                change = (after - before) / before
+                if change > threshold:
+                    regressions.append({
+                        'renderer': result['renderer'],
+                        'fish': result['fish'],
+                        'metric': metric,
+                        'baseline': before,
+                        'current': after,
+                        'change': round(change, 4),
+                    })
+        return regressions
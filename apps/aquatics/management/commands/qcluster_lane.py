@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django_q.cluster import Cluster
+from django_q.conf import Conf
+from GithubAquarium.task_queue import LANES, LANE_BULK, TASK_LANE_WORKERS, get_lane_broker, lane_list_key
+
+
+class Command(BaseCommand):
+    help = '우선순위 레인 하나의 큐만 처리하는 django-q 클러스터를 실행합니다. (레인마다 별도 프로세스로 실행)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('lane', choices=LANES, help='처리할 레인')
+        parser.add_argument('--workers', type=int, help='워커 수 (기본: settings.TASK_LANE_WORKERS)')
+        parser.add_argument('--run-once', action='store_true', help='시작 후 바로 종료 (설정 확인용)')
+
+    def handle(self, *args, **options):
+        lane = options['lane']
+
+        # Sentinel이 fork 시점의 Conf를 그대로 쓰므로 클러스터 시작 전에 레인 설정을 반영
+        Conf.WORKERS = options['workers'] or TASK_LANE_WORKERS.get(lane, Conf.WORKERS)
+        # 스케줄은 한 레인(bulk)에서만 실행해야 같은 스케줄이 여러 큐에 들어가지 않음
+        Conf.SCHEDULER = Conf.SCHEDULER and lane == LANE_BULK
+
+        self.stdout.write(self.style.SUCCESS(
+            f'=== lane={lane} queue={lane_list_key(lane)} workers={Conf.WORKERS} scheduler={Conf.SCHEDULER} ==='
+        ))
+        q = Cluster(get_lane_broker(lane))
+        q.start()
+        if options['run_once']:
+            q.stop()
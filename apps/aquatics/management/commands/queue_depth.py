@@ -0,0 +1,24 @@
+import json
+from django.core.management.base import BaseCommand
+from GithubAquarium.task_queue import TASK_SHED_THRESHOLDS, lane_list_key, lane_queue_depths, shed_counts
+
+
+class Command(BaseCommand):
+    help = '우선순위 레인별 대기/처리 중 작업 수와 부하 차단(load shedding) 횟수를 출력합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--json', action='store_true', help='JSON으로 출력')
+
+    def handle(self, *args, **options):
+        depths = lane_queue_depths()
+        shed = shed_counts()
+        if options['json']:
+            self.stdout.write(json.dumps({'lanes': depths, 'shed': shed}))
+            return
+
+        for lane, depth in depths.items():
+            self.stdout.write(
+                f"{lane:<12} queue={lane_list_key(lane):<28} queued={depth['queued']:<6} running={depth['running']:<6} "
+                f"shed_at={TASK_SHED_THRESHOLDS.get(lane, '-')}"
+            )
+        self.stdout.write('shed: ' + ', '.join(f'{kind}={count}' for kind, count in shed.items()))
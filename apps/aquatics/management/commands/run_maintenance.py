@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from GithubAquarium.maintenance import JOBS, install_schedule, last_maintenance_report, run_maintenance
+
+
+class Command(BaseCommand):
+    help = (
+        '정기 유지보수(django-q 결과, 만료 토큰, PointLog 압축, 고아 SVG 정리)를 즉시 실행하거나 '
+        '--schedule 로 django-q 스케줄을 등록합니다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--job', choices=list(JOBS), action='append', help='특정 작업만 실행 (여러 번 지정 가능)')
+        parser.add_argument('--dry-run', action='store_true', help='삭제하지 않고 대상 수만 계산')
+        parser.add_argument('--schedule', action='store_true', help='스케줄 등록/갱신만 수행')
+        parser.add_argument('--minutes', type=int, help='스케줄 간격(분), 기본: settings.MAINTENANCE_INTERVAL_MINUTES')
+        parser.add_argument('--last', action='store_true', help='마지막 실행 보고서 출력')
+
+    def handle(self, *args, **options):
+        if options['schedule']:
+            schedule = install_schedule(options['minutes'])
+            self.stdout.write(self.style.SUCCESS(
+                f'=== 유지보수 스케줄 등록: {schedule.minutes}분마다 (next_run={schedule.next_run:%Y-%m-%d %H:%M}) ==='
+            ))
+            return
+
+        if options['last']:
+            report = last_maintenance_report()
+            if not report:
+                self.stdout.write('실행 기록이 없습니다.')
+                return
+            self.stdout.write(f"last run: {report['at']}")
+            self._print(report['jobs'])
+            return
+
+        report = run_maintenance(options['job'], dry_run=options['dry_run'])
+        self._print(report)
+        total_rows = sum(result['rows'] for result in report.values())
+        total_bytes = sum(result['bytes'] for result in report.values())
+        prefix = '[dry-run] ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(f'=== {prefix}정리 완료: {total_rows}건, {total_bytes / 1024:.1f} KiB ==='))
+
+    def _print(self, report):
+        for name, result in report.items():
+            line = f"{name:<20} rows={result['rows']:<8} bytes={result['bytes']:<12} {result['seconds']}s"
+            if result.get('error'):
+                line += f" error={result['error']}"
+            self.stdout.write(line)
@@ -0,0 +1,43 @@
+import json
+from django.core.management.base import BaseCommand
+from GithubAquarium.task_metrics import get_slow_samples, get_task_metrics, reset_task_metrics
+
+
+class Command(BaseCommand):
+    help = '작업 함수별 실행 지표(wall time, 쿼리 수, RSS 증가량, 결과)와 느린 작업 스택 샘플을 출력합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--json', action='store_true', help='히스토그램 전체를 JSON으로 출력')
+        parser.add_argument('--stacks', action='store_true', help='느린 작업 스택 샘플도 출력')
+        parser.add_argument('--reset', action='store_true', help='집계를 초기화')
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            reset_task_metrics()
+            self.stdout.write(self.style.SUCCESS('=== 작업 지표 초기화 완료 ==='))
+            return
+
+        metrics = get_task_metrics()
+        if options['json']:
+            payload = {'tasks': metrics}
+            if options['stacks']:
+                payload['slow_samples'] = get_slow_samples()
+            self.stdout.write(json.dumps(payload, indent=2, ensure_ascii=False))
+            return
+
+        if not metrics:
+            self.stdout.write('기록된 작업 지표가 없습니다.')
+        for func, item in metrics.items():
+            outcomes = item['outcomes']
+            self.stdout.write(self.style.SUCCESS(f'=== {func} ==='))
+            self.stdout.write(
+                f"  runs={item['count']} success={outcomes.get('success', 0)} failure={outcomes.get('failure', 0)}"
+            )
+            for name in ('wall_ms', 'queries', 'rss_kib'):
+                histogram = ' '.join(f'{label}:{count}' for label, count in item[name]['histogram'].items() if count)
+                self.stdout.write(f"  {name:<8} avg={item[name]['avg']:<10} max={item[name]['max']:<10} {histogram}")
+
+        if options['stacks']:
+            for sample in get_slow_samples():
+                self.stdout.write(self.style.WARNING(f"--- {sample['func']} ({sample['elapsed_s']}s) ---"))
+                self.stdout.write(sample['stack'])
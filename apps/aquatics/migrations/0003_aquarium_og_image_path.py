@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aquatics', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aquarium',
+            name='og_image_path',
+            field=models.CharField(blank=True, help_text='The relative path to the generated Open Graph preview card (content-hashed PNG).', max_length=512),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aquatics', '0003_aquarium_og_image_path'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aquarium',
+            name='render_version',
+            field=models.PositiveBigIntegerField(default=0, help_text="Monotonic counter bumped (via F()) whenever any input of this aquarium's render changes."),
+        ),
+        migrations.AddField(
+            model_name='aquarium',
+            name='rendered_version',
+            field=models.PositiveBigIntegerField(default=0, help_text='The render_version the stored SVG (svg_path) was generated from.'),
+        ),
+        migrations.AddField(
+            model_name='fishtank',
+            name='render_version',
+            field=models.PositiveBigIntegerField(default=0, help_text='이 유저 뷰의 입력(배경 등)이 바뀔 때마다 F()로 증가하는 버전.'),
+        ),
+        migrations.AddField(
+            model_name='fishtank',
+            name='rendered_version',
+            field=models.PositiveBigIntegerField(default=0, help_text='저장된 SVG가 생성될 때의 render_version + repository.fish_version.'),
+        ),
+    ]
@@ -78,6 +78,19 @@ class Aquarium(models.Model):
         blank=True,
         help_text="The relative path to the generated SVG file."
     )
+    og_image_path = models.CharField(
+        max_length=512,
+        blank=True,
+        help_text="The relative path to the generated Open Graph preview card (content-hashed PNG)."
+    )
+    render_version = models.PositiveBigIntegerField(
+        default=0,
+        help_text="Monotonic counter bumped (via F()) whenever any input of this aquarium's render changes."
+    )
+    rendered_version = models.PositiveBigIntegerField(
+        default=0,
+        help_text="The render_version the stored SVG (svg_path) was generated from."
+    )
     updated_at = models.DateTimeField(auto_now=True) # 추가
 
     def __str__(self):
@@ -111,6 +124,14 @@ class Fishtank(models.Model):
         blank=True,
         help_text="유저의 설정이 반영되어 생성된 SVG 파일 경로."
     )
+    render_version = models.PositiveBigIntegerField(
+        default=0,
+        help_text="이 유저 뷰의 입력(배경 등)이 바뀔 때마다 F()로 증가하는 버전."
+    )
+    rendered_version = models.PositiveBigIntegerField(
+        default=0,
+        help_text="저장된 SVG가 생성될 때의 render_version + repository.fish_version."
+    )
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
@@ -0,0 +1,248 @@
+# apps/aquatics/og_cards.py
+"""
+Open Graph 소셜 미리보기 카드(1200x630 PNG) 생성.
+
+크롤러 요청마다 그리지 않고, 아쿠아리움/피시탱크가 바뀔 때 백그라운드 태스크에서 한 번 그려
+내용 해시가 들어간 파일명으로 MEDIA_ROOT/og/ 에 저장합니다. (정적 파일로 서빙)
+
+물고기 템플릿은 1x1 <rect> 픽셀로 그린 도트 SVG이므로
+SVG 렌더러 없이 rect를 직접 Pillow로 찍어 스프라이트 이미지를 만듭니다.
+"""
+import hashlib
+import io
+import logging
+import os
+import re
+import xml.etree.ElementTree as ET
+from functools import lru_cache
+from django.conf import settings
+from django.db.models import Count, Max, Sum
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+from apps.items.models import FishSpecies
+from apps.aquatics.models import ContributionFish
+
+logger = logging.getLogger(__name__)
+
+CARD_WIDTH = 1200
+CARD_HEIGHT = 630
+CARD_DIR = "og"
+CARD_BG_COLOR = "#b8e6fe"
+# 카드에 그릴 최대 물고기 수
+CARD_MAX_FISH = 5
+# 스프라이트 1칸(viewBox 1단위)당 픽셀 수
+SPRITE_PIXEL_SCALE = 5
+
+_TRANSFORM_RE = re.compile(r"(translate|scale)\(([^)]*)\)")
+_RGBA_RE = re.compile(r"rgba\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*,\s*([\d.]+)\s*\)")
+
+
+def _local_tag(element) -> str:
+    return element.tag.rsplit("}", 1)[-1]
+
+
+def _apply_transform(matrix, transform: str):
+    """
+    (sx, sy, tx, ty) 행렬에 translate/scale 변환을 순서대로 적용합니다.
+    """
+    sx, sy, tx, ty = matrix
+    for name, args in _TRANSFORM_RE.findall(transform or ""):
+        values = [float(v) for v in re.split(r"[\s,]+", args.strip()) if v]
+        if name == "translate":
+            dx = values[0]
+            dy = values[1] if len(values) > 1 else 0.0
+            tx, ty = tx + sx * dx, ty + sy * dy
+        else:
+            kx = values[0]
+            ky = values[1] if len(values) > 1 else kx
+            sx, sy = sx * kx, sy * ky
+    return sx, sy, tx, ty
+
+
+def _parse_color(fill: str, opacity: float):
+    """
+    #hex / rgb() / rgba(r,g,b,0~1) 를 RGBA 튜플로 변환합니다.
+    """
+    match = _RGBA_RE.match(fill)
+    if match:
+        r, g, b, a = match.groups()
+        return int(r), int(g), int(b), round(255 * float(a) * opacity)
+    return (*ImageColor.getrgb(fill)[:3], round(255 * opacity))
+
+
+def _collect_pixels(element, matrix, pixels):
+    if element.get("visibility") == "hidden" or element.get("display") == "none":
+        return
+    tag = _local_tag(element)
+    if tag in ("style", "circle"):
+        return
+
+    matrix = _apply_transform(matrix, element.get("transform"))
+
+    if tag == "rect":
+        fill = element.get("fill")
+        if not fill or fill == "none":
+            return
+        sx, sy, tx, ty = matrix
+        x = tx + sx * float(element.get("x", 0))
+        y = ty + sy * float(element.get("y", 0))
+        w = sx * float(element.get("width", 0))
+        h = sy * float(element.get("height", 0))
+        pixels.append((x, y, w, h, _parse_color(fill, float(element.get("fill-opacity", 1)))))
+        return
+
+    for child in element:
+        _collect_pixels(child, matrix, pixels)
+
+
+@lru_cache(maxsize=64)
+def _sprite_image(svg_template: str) -> Image.Image:
+    """
+    도트 SVG 템플릿을 RGBA 이미지로 변환합니다. (viewBox 1단위 = SPRITE_PIXEL_SCALE 픽셀)
+    """
+    root = ET.fromstring(svg_template.replace("*{id}", "0"))
+    vb = [float(v) for v in (root.get("viewBox") or "0 0 50 50").split()]
+    vb_minx, vb_miny, vb_w, vb_h = vb
+
+    pixels = []
+    _collect_pixels(root, (1.0, 1.0, 0.0, 0.0), pixels)
+
+    scale = SPRITE_PIXEL_SCALE
+    image = Image.new("RGBA", (round(vb_w * scale), round(vb_h * scale)), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image, "RGBA")
+    for x, y, w, h, color in pixels:
+        left = round((x - vb_minx) * scale)
+        top = round((y - vb_miny) * scale)
+        right = round((x - vb_minx + w) * scale) - 1
+        bottom = round((y - vb_miny + h) * scale) - 1
+        if right >= left and bottom >= top:
+            draw.rectangle((left, top, right, bottom), fill=color)
+
+    # 투명 여백을 잘라 카드에 배치하기 쉽게
+    bbox = image.getbbox()
+    return image.crop(bbox) if bbox else image
+
+
+def _font(size: int):
+    return ImageFont.load_default(size=size)
+
+
+def _cover(image: Image.Image, width: int, height: int) -> Image.Image:
+    """
+    비율을 유지한 채 카드 크기를 꽉 채우도록 가운데를 잘라냅니다. (CSS object-fit: cover)
+    """
+    scale = max(width / image.width, height / image.height)
+    resized = image.resize((round(image.width * scale), round(image.height * scale)), Image.LANCZOS)
+    left = (resized.width - width) // 2
+    top = (resized.height - height) // 2
+    return resized.crop((left, top, left + width, top + height))
+
+
+def _background_layer(own_bg) -> Image.Image:
+    try:
+        bg = getattr(own_bg, "background", None) if own_bg else None
+        if bg and bg.background_image:
+            with bg.background_image.open("rb") as f:
+                return _cover(Image.open(f).convert("RGBA"), CARD_WIDTH, CARD_HEIGHT)
+    except Exception as e:
+        logger.warning(f"[og_cards] failed to load background: {e}")
+    return Image.new("RGBA", (CARD_WIDTH, CARD_HEIGHT), CARD_BG_COLOR)
+
+
+def _paste_fishes(card: Image.Image, templates):
+    """
+    상단 영역(y 40~420)에 물고기 스프라이트를 가로로 나란히 배치합니다.
+    """
+    if not templates:
+        return
+    slot_w = CARD_WIDTH // len(templates)
+    max_w = min(slot_w - 40, 320)
+    max_h = 340
+    for index, template in enumerate(templates):
+        sprite = _sprite_image(template)
+        ratio = min(max_w / sprite.width, max_h / sprite.height)
+        size = (max(1, round(sprite.width * ratio)), max(1, round(sprite.height * ratio)))
+        sprite = sprite.resize(size, Image.NEAREST)
+        x = index * slot_w + (slot_w - sprite.width) // 2
+        y = 40 + (max_h + 40 - sprite.height) // 2
+        card.alpha_composite(sprite, (x, y))
+
+
+def _compose_card(own_bg, templates, title, stats) -> bytes:
+    card = _background_layer(own_bg)
+    _paste_fishes(card, templates)
+
+    panel = Image.new("RGBA", (CARD_WIDTH, 190), (0, 26, 51, 170))
+    card.alpha_composite(panel, (0, CARD_HEIGHT - 190))
+
+    draw = ImageDraw.Draw(card)
+    draw.text((48, CARD_HEIGHT - 170), title, font=_font(60), fill="#ffffff")
+    draw.text((48, CARD_HEIGHT - 80), stats, font=_font(34), fill="#b8e6fe")
+
+    buffer = io.BytesIO()
+    card.convert("RGB").save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def _card_stats(fishes, commit_count) -> str:
+    summary = fishes.aggregate(count=Count("id"), top_maturity=Max("fish_species__maturity"))
+    top_maturity = summary["top_maturity"]
+    parts = [f"{summary['count']} fish", f"{commit_count} commits"]
+    if top_maturity:
+        parts.append(FishSpecies.Maturity(top_maturity).label)
+    return " · ".join(parts)
+
+
+def _top_templates(fishes):
+    """
+    성장 단계가 높고 커밋이 많은 순서로 상위 물고기 템플릿을 고릅니다.
+    """
+    return list(
+        fishes
+        .order_by("-fish_species__maturity", "-contributor__commit_count", "id")
+        .values_list("fish_species__svg_template", flat=True)[:CARD_MAX_FISH]
+    )
+
+
+def render_aquarium_card(aquarium) -> bytes:
+    user = aquarium.user
+    fishes = ContributionFish.objects.filter(contributor__user=user, is_visible_in_aquarium=True)
+    commit_count = fishes.aggregate(total=Sum("contributor__commit_count"))["total"] or 0
+    return _compose_card(
+        aquarium.background,
+        _top_templates(fishes),
+        f"{user.username}'s Aquarium",
+        _card_stats(fishes, commit_count),
+    )
+
+
+def render_repository_card(repository) -> bytes:
+    fishes = ContributionFish.objects.filter(contributor__repository=repository, is_visible_in_fishtank=True)
+    return _compose_card(
+        None,
+        _top_templates(fishes),
+        repository.full_name,
+        _card_stats(fishes, repository.commit_count),
+    )
+
+
+def save_card(png: bytes, prefix: str, previous_path: str = "") -> str:
+    """
+    내용 해시가 들어간 파일명으로 카드를 저장하고 MEDIA_ROOT 기준 상대 경로를 반환합니다.
+    내용이 같으면 다시 쓰지 않고, 경로가 바뀌면 이전 카드 파일을 지웁니다.
+    """
+    digest = hashlib.sha1(png).hexdigest()[:12]
+    file_name = f"{CARD_DIR}/{prefix}_{digest}.png"
+    if file_name == previous_path:
+        return file_name
+
+    path = os.path.join(settings.MEDIA_ROOT, file_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(png)
+
+    if previous_path:
+        try:
+            os.remove(os.path.join(settings.MEDIA_ROOT, previous_path))
+        except FileNotFoundError:
+            pass
+    return file_name
@@ -0,0 +1,212 @@
+# apps/aquatics/popularity.py
+"""
+공개 렌더(README 임베드) 인기도 추적.
+
+소수의 인기 README가 공개 렌더 트래픽 대부분을 차지합니다.
+요청마다 DB/캐시에 쓰지 않도록 프로세스 메모리에서 집계하고 주기적으로만 공유 캐시에 반영합니다.
+
+- 프로세스 내부: 감쇠(decay)되는 count-min sketch + top-K heavy hitters
+- 공유 캐시: 프로세스들이 flush한 상위 (subject, variant) 점수 (지수 감쇠)
+- 렌더 대상이 무효화될 때 hot_variants()로 인기 variant를 찾아 미리 렌더링(pre-warm)합니다.
+"""
+import hashlib
+import logging
+import threading
+import time
+import numpy as np
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# 프로세스 메모리 → 공유 캐시 반영 주기
+RENDER_POPULARITY_FLUSH_INTERVAL = getattr(settings, 'RENDER_POPULARITY_FLUSH_INTERVAL', 30)
+# 점수가 절반으로 줄어드는 시간
+RENDER_POPULARITY_HALF_LIFE = getattr(settings, 'RENDER_POPULARITY_HALF_LIFE', 60 * 60)
+# 프로세스/공유 캐시에서 추적하는 상위 항목 수
+RENDER_POPULARITY_TOP_K = getattr(settings, 'RENDER_POPULARITY_TOP_K', 64)
+# 이 점수(감쇠된 조회 수) 이상이면 hot으로 보고 무효화 시 미리 렌더링
+RENDER_HOT_MIN_SCORE = getattr(settings, 'RENDER_HOT_MIN_SCORE', 5)
+
+HOT_CACHE_KEY = "render:popularity:hot"
+FLUSH_LOCK_KEY = "render:popularity:lock"
+FLUSH_LOCK_TIMEOUT = 10
+
+SKETCH_WIDTH = 2048
+SKETCH_DEPTH = 4
+
+
+def _decay_factor(elapsed: float) -> float:
+    if elapsed <= 0:
+        return 1.0
+    return 0.5 ** (elapsed / RENDER_POPULARITY_HALF_LIFE)
+
+
+def _entry_key(subject: str, variant: str) -> str:
+    return f"{subject}|{variant}"
+
+
+class DecayedCountMinSketch:
+    """
+    고정 크기 count-min sketch. decay()로 모든 카운터를 한 번에 감쇠시킵니다.
+    추정값은 실제 값보다 작아지지 않습니다 (해시 충돌 시 과대 추정만 발생).
+    """
+
+    def __init__(self, width=SKETCH_WIDTH, depth=SKETCH_DEPTH):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.float64)
+        self._rows = np.arange(depth)
+
+    def _indexes(self, key: str):
+        # 64비트 해시 2개로 depth개의 인덱스 생성 (Kirsch-Mitzenmacher)
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return np.array([(h1 + i * h2) % self.width for i in range(self.depth)])
+
+    def add(self, key: str, count: float = 1.0) -> float:
+        indexes = self._indexes(key)
+        self.table[self._rows, indexes] += count
+        return float(self.table[self._rows, indexes].min())
+
+    def estimate(self, key: str) -> float:
+        return float(self.table[self._rows, self._indexes(key)].min())
+
+    def decay(self, factor: float):
+        self.table *= factor
+
+
+class PopularityTracker:
+    """
+    프로세스 내부 인기도 집계기.
+    - record(): 조회 1건 기록 (메모리만 갱신, 주기가 지나면 flush)
+    - flush(): 마지막 flush 이후 상위 항목의 조회 수를 공유 캐시에 합산
+    """
+
+    def __init__(self, top_k=RENDER_POPULARITY_TOP_K, flush_interval=RENDER_POPULARITY_FLUSH_INTERVAL):
+        self.top_k = top_k
+        self.flush_interval = flush_interval
+        self.sketch = DecayedCountMinSketch()
+        self.top = {}        # entry_key -> 추정 점수 (상위 top_k개만)
+        self.pending = {}    # entry_key -> 마지막 flush 이후 조회 수 (상위 항목만)
+        self.lock = threading.Lock()
+        self.last_decay = time.monotonic()
+        self.last_flush = time.monotonic()
+
+    def record(self, subject: str, variant: str, flush=True) -> bool:
+        """
+        flush=False면 flush하지 않고 flush가 필요한지만 반환합니다. (async 호출자가 스레드에서 flush)
+        """
+        key = _entry_key(subject, variant)
+        with self.lock:
+            score = self.sketch.add(key)
+            self._offer(key, score)
+            if key in self.top:
+                self.pending[key] = self.pending.get(key, 0) + 1
+            should_flush = time.monotonic() - self.last_flush >= self.flush_interval
+
+        if should_flush and flush:
+            self.flush()
+        return should_flush
+
+    def _offer(self, key, score):
+        if key in self.top or len(self.top) < self.top_k:
+            self.top[key] = score
+            return
+        coldest = min(self.top, key=self.top.get)
+        if score > self.top[coldest]:
+            del self.top[coldest]
+            self.pending.pop(coldest, None)
+            self.top[key] = score
+
+    def _decay(self):
+        now = time.monotonic()
+        factor = _decay_factor(now - self.last_decay)
+        self.sketch.decay(factor)
+        for key in self.top:
+            self.top[key] *= factor
+        self.last_decay = now
+
+    def flush(self):
+        with self.lock:
+            self.last_flush = time.monotonic()
+            self._decay()
+            pending, self.pending = self.pending, {}
+
+        if not pending:
+            return
+
+        # 다른 프로세스가 flush 중이면 다음 주기로 미룸
+        if not cache.add(FLUSH_LOCK_KEY, 1, timeout=FLUSH_LOCK_TIMEOUT):
+            with self.lock:
+                for key, count in pending.items():
+                    self.pending[key] = self.pending.get(key, 0) + count
+            return
+
+        try:
+            _merge_shared(pending)
+        finally:
+            cache.delete(FLUSH_LOCK_KEY)
+
+
+def _load_shared(now: float) -> dict:
+    """
+    공유 캐시의 점수를 현재 시각 기준으로 감쇠시켜 {entry_key: score}로 반환합니다.
+    """
+    shared = cache.get(HOT_CACHE_KEY) or {}
+    return {
+        key: score * _decay_factor(now - updated_at)
+        for key, (score, updated_at) in shared.items()
+    }
+
+
+def _merge_shared(pending: dict):
+    now = time.time()
+    scores = _load_shared(now)
+    for key, count in pending.items():
+        scores[key] = scores.get(key, 0.0) + count
+
+    hottest = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:RENDER_POPULARITY_TOP_K]
+    cache.set(HOT_CACHE_KEY, {key: (score, now) for key, score in hottest}, timeout=None)
+
+
+_tracker = PopularityTracker()
+
+
+def record_render_hit(subject: str, variant: str):
+    """
+    공개 렌더 조회 1건을 기록합니다. (요청 경로에서 호출, 메모리만 갱신)
+    """
+    try:
+        _tracker.record(subject, variant)
+    except Exception as e:
+        # 인기도 집계 실패가 렌더 응답을 막으면 안 됨
+        logger.warning(f"[popularity] failed to record hit for {subject}: {e}")
+
+
+async def arecord_render_hit(subject: str, variant: str):
+    """
+    record_render_hit()의 async 버전. 캐시에 쓰는 flush만 스레드에서 실행합니다.
+    """
+    try:
+        if _tracker.record(subject, variant, flush=False):
+            await sync_to_async(_tracker.flush)()
+    except Exception as e:
+        logger.warning(f"[popularity] failed to record hit for {subject}: {e}")
+
+
+def hot_variants(subject: str, min_score=RENDER_HOT_MIN_SCORE) -> list:
+    """
+    subject의 variant 중 공유 점수가 min_score 이상인 것을 인기순으로 반환합니다.
+    """
+    prefix = f"{subject}|"
+    scores = _load_shared(time.time())
+    hot = [
+        (key[len(prefix):], score)
+        for key, score in scores.items()
+        if key.startswith(prefix) and score >= min_score
+    ]
+    hot.sort(key=lambda item: item[1], reverse=True)
+    return [variant for variant, _ in hot]
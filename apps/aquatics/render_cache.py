@@ -0,0 +1,351 @@
+# apps/aquatics/render_cache.py
+"""
+공개 렌더(README 임베드) 결과물 캐시와 single-flight 조정.
+
+인기 README가 변경 직후 처음 조회되면 프록시 요청이 한꺼번에 몰려
+같은 DB 조회와 렌더링이 동시에 여러 번 실행됩니다(render stampede).
+(subject, version) 단위로 한 호출자만 실제 렌더링을 수행하고,
+나머지는 잠시 기다렸다가 그 결과를 받거나 직전 결과물을 받습니다.
+
+- 프로세스 내부: threading.Event 로 같은 키의 호출을 묶음
+- 프로세스 간: cache.add() 락 (settings.CACHES 가 공유 백엔드여야 함)
+- ASGI(async 뷰): 같은 이벤트 루프의 요청은 asyncio Task 하나를 함께 기다림 (aget_or_render)
+  렌더링은 전용 스레드 풀(RENDER_ASYNC_THREADS)에서 실행하고, 다른 프로세스의 결과는 asyncio.sleep으로 기다림.
+  async 뷰의 ORM 호출이 쓰는 공유 sync 스레드를 느린 렌더가 막지 않음
+"""
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# 같은 버전의 결과물을 재사용하는 시간 (버전 갱신이 누락돼도 이 시간 뒤에는 다시 렌더)
+RENDER_CACHE_TIMEOUT = getattr(settings, 'RENDER_CACHE_TIMEOUT', 60 * 5)
+# 직전 결과물(stale) 보관 시간
+RENDER_STALE_TIMEOUT = getattr(settings, 'RENDER_STALE_TIMEOUT', 60 * 60 * 24)
+# 렌더링 담당 프로세스가 죽었을 때 락이 풀리기까지의 시간
+RENDER_LOCK_TIMEOUT = getattr(settings, 'RENDER_LOCK_TIMEOUT', 30)
+# 다른 호출자의 렌더 결과를 기다리는 최대 시간
+RENDER_WAIT_TIMEOUT = getattr(settings, 'RENDER_WAIT_TIMEOUT', 5)
+# async 뷰의 캐시 미스 렌더링에 쓰는 스레드 수 (프로세스당)
+RENDER_ASYNC_THREADS = getattr(settings, 'RENDER_ASYNC_THREADS', 4)
+
+
+class _InFlight:
+    """프로세스 내부에서 진행 중인 렌더 1건"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+# 이벤트 루프별 진행 중인 렌더 {artifact_key: asyncio.Task}
+_async_inflight = weakref.WeakKeyDictionary()
+
+_render_executor = ThreadPoolExecutor(max_workers=RENDER_ASYNC_THREADS, thread_name_prefix='render')
+
+
+# --- Subject ---
+
+def aquarium_subject(user_id) -> str:
+    return f"aquarium:{user_id}"
+
+
+def fishtank_subject(repo_id) -> str:
+    return f"fishtank:{repo_id}"
+
+
+def organization_subject(login) -> str:
+    return f"org:{login}"
+
+
+def team_subject(user_ids) -> str:
+    # 멤버 순서가 격자 배치를 결정하므로 정렬하지 않고 그대로 해시
+    digest = hashlib.sha1(",".join(str(uid) for uid in user_ids).encode()).hexdigest()[:16]
+    return f"team:{digest}"
+
+
+# --- Version ---
+
+def _version_key(subject: str) -> str:
+    return f"render:version:{subject}"
+
+
+def get_render_version(subject: str) -> int:
+    """
+    렌더 대상(subject)의 현재 버전을 반환합니다. 한 번도 갱신되지 않았다면 0.
+    """
+    return cache.get(_version_key(subject), 0)
+
+
+async def aget_render_version(subject: str) -> int:
+    return await cache.aget(_version_key(subject), 0)
+
+
+def get_render_versions(subjects) -> dict:
+    """
+    여러 렌더 대상의 현재 버전을 한 번에 조회합니다.
+    """
+    keys = {_version_key(subject): subject for subject in subjects}
+    found = cache.get_many(list(keys))
+    return {subject: found.get(key, 0) for key, subject in keys.items()}
+
+
+async def aget_render_versions(subjects) -> dict:
+    keys = {_version_key(subject): subject for subject in subjects}
+    found = await cache.aget_many(list(keys))
+    return {subject: found.get(key, 0) for key, subject in keys.items()}
+
+
+def fishtank_render_version(repository) -> str:
+    """
+    피시탱크 공개 렌더의 캐시 버전.
+    물고기 집합 변경은 Repository.fish_version(DB)으로, 유저별 배경 변경은 캐시 버전으로 반영됩니다.
+    """
+    return f"{repository.fish_version}.{get_render_version(fishtank_subject(repository.id))}"
+
+
+async def afishtank_render_version(repository) -> str:
+    return f"{repository.fish_version}.{await aget_render_version(fishtank_subject(repository.id))}"
+
+
+def combine_versions(versions) -> str:
+    """
+    여러 대상의 버전을 하나의 짧은 콘텐츠 버전으로 합칩니다.
+    어느 한 멤버의 버전만 바뀌어도 결과가 달라집니다.
+    """
+    raw = ",".join(f"{subject}={version}" for subject, version in versions.items())
+    return hashlib.sha1(raw.encode()).hexdigest()[:12]
+
+
+def bump_render_version(subject: str) -> int:
+    """
+    렌더 대상의 입력이 바뀌었음을 기록합니다.
+    버전이 올라가면 이전 버전의 결과물은 더 이상 fresh 캐시로 쓰이지 않습니다.
+    """
+    key = _version_key(subject)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        if cache.add(key, 1, timeout=None):
+            return 1
+        return cache.incr(key)
+
+
+# --- Content ---
+
+def content_hash(svg: str) -> str:
+    """
+    결과물 내용으로 만든 짧은 콘텐츠 버전. 버전 URL(/v/<hash>/)에 사용됩니다.
+    """
+    return hashlib.sha1(svg.encode()).hexdigest()[:12]
+
+
+def _content_key(subject: str, variant: str, content_version: str) -> str:
+    # 같은 해시라도 다른 대상/variant의 경로로는 꺼낼 수 없도록 함께 키에 포함
+    return f"render:{subject}:{variant}:c{content_version}"
+
+
+def get_rendered_content(subject: str, variant: str, content_version: str):
+    """
+    (subject, variant)의 콘텐츠 버전으로 예전에 렌더링한 결과물을 찾습니다. (없으면 None)
+    """
+    return cache.get(_content_key(subject, variant, content_version))
+
+
+async def aget_rendered_content(subject: str, variant: str, content_version: str):
+    return await cache.aget(_content_key(subject, variant, content_version))
+
+
+def get_content_version(subject: str, variant: str, version=None):
+    """
+    렌더링하지 않고 (subject, version, variant) 결과물의 콘텐츠 버전을 반환합니다.
+    아직 렌더링된 적이 없으면 None (임베드 코드 등 렌더 비용을 들이지 않아야 하는 곳용)
+    """
+    if version is None:
+        version = get_render_version(subject)
+    artifact_key, _ = _artifact_keys(subject, variant, version)
+    return cache.get(f"{artifact_key}:content")
+
+
+# --- Single-flight ---
+
+def get_or_render(subject: str, variant: str, render_fn, version=None):
+    """
+    (subject, version, variant) 결과물을 캐시에서 찾고, 없으면 single-flight로 렌더링합니다.
+
+    - subject: 버전이 관리되는 렌더 대상 (예: "aquarium:3", "fishtank:12")
+    - variant: 같은 대상 안에서 결과물을 구분하는 값 (보는 유저, 크기 등)
+    - render_fn: 인자 없이 호출되어 SVG 문자열을 반환하는 함수
+    - version: 합성 렌더처럼 버전을 직접 계산한 경우 지정 (없으면 subject 버전 사용)
+    """
+    if version is None:
+        version = get_render_version(subject)
+    artifact_key, stale_key = _artifact_keys(subject, variant, version)
+
+    svg = cache.get(artifact_key)
+    if svg is not None:
+        return svg
+
+    # 1. 프로세스 내부 single-flight
+    with _inflight_lock:
+        call = _inflight.get(artifact_key)
+        is_leader = call is None
+        if is_leader:
+            call = _InFlight()
+            _inflight[artifact_key] = call
+
+    if not is_leader:
+        if call.event.wait(RENDER_WAIT_TIMEOUT) and call.result is not None:
+            return call.result
+        return _stale_or_render(stale_key, render_fn)
+
+    try:
+        call.result = _render_across_processes(subject, variant, version, render_fn)
+        return call.result
+    finally:
+        call.event.set()
+        with _inflight_lock:
+            _inflight.pop(artifact_key, None)
+
+
+async def aget_or_render(subject: str, variant: str, render_fn, version=None):
+    """
+    get_or_render()의 async 버전 (ASGI 공개 렌더 뷰용).
+
+    캐시 적중은 이벤트 루프에서 바로 반환하고, 미스일 때만 render_fn을 전용 스레드 풀에서
+    실행합니다. render_fn은 그 스레드에서 호출되므로 동기 ORM을 그대로 써도 됩니다.
+    같은 루프의 동시 요청은 하나의 Task를 기다리므로 스레드를 하나만 점유하고,
+    다른 프로세스가 렌더링 중이면 스레드 없이 이벤트 루프에서 기다립니다.
+    """
+    if version is None:
+        version = await aget_render_version(subject)
+    artifact_key, stale_key = _artifact_keys(subject, variant, version)
+
+    svg = await cache.aget(artifact_key)
+    if svg is not None:
+        return svg
+
+    inflight = _async_inflight.setdefault(asyncio.get_running_loop(), {})
+    task = inflight.get(artifact_key)
+    if task is None:
+        task = asyncio.ensure_future(_arender_across_processes(subject, variant, version, render_fn))
+        inflight[artifact_key] = task
+        task.add_done_callback(lambda _: inflight.pop(artifact_key, None))
+
+    # 먼저 온 요청이 끊겨도 함께 기다리는 요청의 렌더는 취소되지 않도록 shield
+    return await asyncio.shield(task)
+
+
+def _artifact_keys(subject, variant, version):
+    base_key = f"render:{subject}:{variant}"
+    return f"{base_key}:v{version}", f"{base_key}:latest"
+
+
+def _store(subject, variant, version, svg):
+    artifact_key, stale_key = _artifact_keys(subject, variant, version)
+    content_version = content_hash(svg)
+    cache.set(artifact_key, svg, timeout=RENDER_CACHE_TIMEOUT)
+    # 버전 URL은 내용이 바뀌지 않아야 하므로 콘텐츠 버전으로도 보관 (+ 버전 → 콘텐츠 버전 포인터)
+    cache.set_many({
+        stale_key: svg,
+        _content_key(subject, variant, content_version): svg,
+        f"{artifact_key}:content": content_version,
+    }, timeout=RENDER_STALE_TIMEOUT)
+
+
+def _render_and_store(subject, variant, version, render_fn):
+    svg = render_fn()
+    _store(subject, variant, version, svg)
+    return svg
+
+
+def _render_across_processes(subject, variant, version, render_fn):
+    """
+    프로세스 간 single-flight. 락을 얻은 프로세스만 렌더링하고
+    나머지는 결과가 캐시에 올라오기를 잠시 기다립니다.
+    """
+    artifact_key, stale_key = _artifact_keys(subject, variant, version)
+    lock_key = f"{artifact_key}:lock"
+
+    if cache.add(lock_key, 1, timeout=RENDER_LOCK_TIMEOUT):
+        try:
+            return _render_and_store(subject, variant, version, render_fn)
+        finally:
+            cache.delete(lock_key)
+
+    svg = _wait_for(artifact_key)
+    if svg is not None:
+        return svg
+
+    logger.info(f"[render_cache] wait timed out for {artifact_key}, falling back")
+    return _stale_or_render(stale_key, render_fn)
+
+
+def _wait_for(artifact_key):
+    deadline = time.monotonic() + RENDER_WAIT_TIMEOUT
+    interval = 0.05
+    while time.monotonic() < deadline:
+        time.sleep(interval)
+        svg = cache.get(artifact_key)
+        if svg is not None:
+            return svg
+        interval = min(interval * 2, 0.5)
+    return None
+
+
+async def _arender_across_processes(subject, variant, version, render_fn):
+    """
+    _render_across_processes()의 async 버전. 렌더링(render_fn + 저장)만 전용 스레드 풀에서 실행합니다.
+    """
+    artifact_key, stale_key = _artifact_keys(subject, variant, version)
+    lock_key = f"{artifact_key}:lock"
+    in_pool = sync_to_async(thread_sensitive=False, executor=_render_executor)
+
+    if await cache.aadd(lock_key, 1, timeout=RENDER_LOCK_TIMEOUT):
+        try:
+            return await in_pool(_render_and_store)(subject, variant, version, render_fn)
+        finally:
+            await cache.adelete(lock_key)
+
+    svg = await _await_for(artifact_key)
+    if svg is not None:
+        return svg
+
+    logger.info(f"[render_cache] wait timed out for {artifact_key}, falling back")
+    svg = await cache.aget(stale_key)
+    if svg is not None:
+        return svg
+    return await in_pool(render_fn)()
+
+
+async def _await_for(artifact_key):
+    deadline = time.monotonic() + RENDER_WAIT_TIMEOUT
+    interval = 0.05
+    while time.monotonic() < deadline:
+        await asyncio.sleep(interval)
+        svg = await cache.aget(artifact_key)
+        if svg is not None:
+            return svg
+        interval = min(interval * 2, 0.5)
+    return None
+
+
+def _stale_or_render(stale_key, render_fn):
+    """
+    기다려도 결과가 없으면 직전 결과물을 반환하고, 그것도 없으면 직접 렌더링합니다.
+    """
+    svg = cache.get(stale_key)
+    if svg is not None:
+        return svg
+    return render_fn()
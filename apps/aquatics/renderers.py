@@ -1,10 +1,13 @@
 # apps/aquatics/renderers.py
-import random
+import math
 import re
 import logging
+from datetime import timedelta
+from functools import lru_cache
 from django.conf import settings
 from django.db.models import Q
 from apps.aquatics.models import Aquarium, ContributionFish, Fishtank
+from apps.aquatics.layout import SpriteGeometry, compute_layout
 
 logger = logging.getLogger(__name__)
 
@@ -128,78 +131,90 @@ def _find_anchor_xy(svg_text: str, anchor_id: str):
     return None
 
 # --- Sprite Renderer ---
-def _clamp(v, a, b):
-    return max(a, min(b, v))
+@lru_cache(maxsize=128)
+def _sprite_geometry(raw_svg: str) -> SpriteGeometry:
+    """
+    종 템플릿(*{id} 플레이스홀더 포함)에서 viewBox와 라벨 앵커를 한 번만 추출합니다.
+    같은 종의 물고기는 모두 같은 값을 공유하므로 템플릿 단위로 캐시합니다.
+    """
+    vb_minx, vb_miny, vb_w, vb_h = _parse_viewbox(raw_svg)
 
-def render_fish_group(cf, tank_w, tank_h, mode, persona_width_percent=4, padding=8):
-    species = cf.fish_species
-    fish_id = cf.id
+    top_xy = (
+        _find_anchor_xy(raw_svg, "*{id}-anchor-label-top")
+        or _find_anchor_xy(raw_svg, "*{id}-anchor-center")
+        or (vb_minx + vb_w / 2.0, vb_miny)
+    )
+    bot_xy = (
+        _find_anchor_xy(raw_svg, "*{id}-anchor-label-bottom")
+        or (vb_minx + vb_w / 2.0, vb_miny + vb_h)
+    )
+    return SpriteGeometry(vb_minx, vb_miny, vb_w, vb_h, *top_xy, *bot_xy)
 
-    raw_svg = getattr(species, "svg_template", "") or ""
-    templated_svg = _apply_sprite_id(raw_svg, fish_id)
-    inner = _strip_outer_svg(templated_svg)
 
-    # ---- label text ----
-    if mode == "aquarium":
-        top_label = _escape_text(getattr(cf.contributor.repository, "name", ""))
-        bottom_label = _escape_text(f"{getattr(cf.contributor, 'commit_count', 0)} commits")
-    else:
-        top_label = _escape_text(getattr(cf.contributor.user, "username", ""))
-        bottom_label = _escape_text(f"{getattr(cf.contributor, 'commit_count', 0)} commits")
+@lru_cache(maxsize=128)
+def _sprite_body(raw_svg: str) -> str:
+    """
+    바깥 <svg>를 벗긴 종 템플릿 본문 (*{id}는 물고기마다 치환)
+    """
+    return _strip_outer_svg(raw_svg)
 
-    # ---- viewBox ----
-    vb_minx, vb_miny, vb_w, vb_h = _parse_viewbox(templated_svg)
 
-    # 프론트: baseW = tankW * (percent/100), spriteW = baseW*2
-    baseW = tank_w * (persona_width_percent / 100.0)
-    spriteW = baseW * 6.0
-    scale = spriteW / max(1e-6, vb_w)
-    spriteH = vb_h * scale
+def _species_template(cf) -> str:
+    return getattr(cf.fish_species, "svg_template", "") or ""
 
-    # 탱크 안에서만 움직이도록 (패딩 + 스프라이트 크기 고려)
-    minX = padding
-    maxX = max(padding, tank_w - padding - spriteW)
-    minY = padding
-    maxY = max(padding, tank_h - padding - spriteH*(0.7))
 
-    # ---- movement points (밖으로 안 나가게!) ----
-    x0 = random.uniform(minX, maxX)
-    y0 = random.uniform(minY, maxY)
-    x1 = random.uniform(minX, maxX)
-    y1 = random.uniform(minY, maxY)
+def layout_fishes(fishes, tank_w, tank_h, persona_width_percent=4, padding=8, seed=None):
+    """
+    탱크의 물고기 전체에 대한 배치를 한 번에 계산합니다. (fishes 순서 유지)
+    """
+    geometries = [_sprite_geometry(_species_template(cf)) for cf in fishes]
+    return compute_layout(
+        geometries,
+        tank_w,
+        tank_h,
+        persona_width_percent=persona_width_percent,
+        padding=padding,
+        seed=seed,
+    )
 
-    # 살짝만 위아래 흔들 (프론트처럼 과하지 않게)
-    wiggle = min(spriteH * 0.10, 10.0)
-    y0a = _clamp(y0 + random.uniform(-wiggle, wiggle), minY, maxY)
-    y1a = _clamp(y1 + random.uniform(-wiggle, wiggle), minY, maxY)
 
-    duration = random.uniform(10, 20)
+def render_fish_group(cf, tank_w, tank_h, mode, persona_width_percent=4, padding=8, sprite_ref=None, placement=None):
+    """
+    물고기 1마리의 <g> 그룹을 렌더링합니다.
+    - placement: layout_fishes()로 미리 계산한 배치 (없으면 이 물고기만 단독 배치)
+    - sprite_ref가 주어지면 스프라이트 본문을 인라인하지 않고
+      <defs>에 한 번만 정의된 종 <symbol>을 <use>로 참조합니다.
+    """
+    fish_id = cf.id
+    raw_svg = _species_template(cf)
 
-    # ---- anchors in template coord -> pixel coord (프론트 로직 이식) ----
-    top_anchor_id = f"{fish_id}-anchor-label-top"
-    bottom_anchor_id = f"{fish_id}-anchor-label-bottom"
-    center_anchor_id = f"{fish_id}-anchor-center"
+    if placement is None:
+        placement = layout_fishes([cf], tank_w, tank_h, persona_width_percent, padding)[0]
 
-    top_xy = (
-        _find_anchor_xy(templated_svg, top_anchor_id)
-        or _find_anchor_xy(templated_svg, center_anchor_id)
-        or (vb_minx + vb_w / 2.0, vb_miny)
-    )
-    bot_xy = (
-        _find_anchor_xy(templated_svg, bottom_anchor_id)
-        or (vb_minx + vb_w / 2.0, vb_miny + vb_h)
-    )
+    # ---- label text ----
+    if mode == "aquarium":
+        top_label = _escape_text(getattr(cf.contributor.repository, "name", ""))
+        bottom_label = _escape_text(f"{getattr(cf.contributor, 'commit_count', 0)} commits")
+    else:
+        top_label = _escape_text(getattr(cf.contributor.user, "username", ""))
+        bottom_label = _escape_text(f"{getattr(cf.contributor, 'commit_count', 0)} commits")
 
-    # (ax-minX)*scale 로 픽셀화
-    top_px = (top_xy[0] - vb_minx) * scale
-    top_py = (top_xy[1] - vb_miny) * scale
-    bot_px = (bot_xy[0] - vb_minx) * scale
-    bot_py = (bot_xy[1] - vb_miny) * scale
+    # ---- sprite body: 인라인 or 공유 symbol 참조 ----
+    if sprite_ref:
+        geometry = _sprite_geometry(raw_svg)
+        inner = (
+            f'<use href="#{sprite_ref}" x="{geometry.vb_minx}" y="{geometry.vb_miny}" '
+            f'width="{geometry.vb_w}" height="{geometry.vb_h}"/>'
+        )
+    else:
+        inner = _apply_sprite_id(_sprite_body(raw_svg), fish_id)
 
-    # ---- font size: 프론트 기반 (top 조금 더 큼/굵게) ----
-    baseSize = max(10.0, baseW * 0.22)
-    topFont = baseSize * 1.1
-    botFont = baseSize * 0.85
+    x0, y0a, x1, y1a = placement.x0, placement.y0, placement.x1, placement.y1
+    duration = placement.duration
+    scale = placement.scale
+    top_px, top_py = placement.top_px, placement.top_py
+    bot_px, bot_py = placement.bot_px, placement.bot_py
+    topFont, botFont = placement.top_font, placement.bot_font
 
     # ---- keyframes: p0 -> p1 -> p0 (linear 대신 ease-in-out는 유지 가능) ----
     move_kf = f"""
@@ -283,11 +298,12 @@ def render_fish_group(cf, tank_w, tank_h, mode, persona_width_percent=4, padding
 
 # --- Main Renderers ---
 
-def render_aquarium_svg(user, width=700, height=400):
+def render_aquarium_svg(user, width=700, height=400, seed=None):
     """
     유저의 개인 아쿠아리움 SVG 렌더링
     - user 기준으로 Aquarium을 추측하지 않음
     - ContributionFish에 실제로 연결된 aquarium을 기준으로 렌더
+    - seed가 없으면 user.id를 사용하므로 같은 입력이면 항상 같은 배치
     """
     fishes = (
         ContributionFish.objects
@@ -301,9 +317,11 @@ def render_aquarium_svg(user, width=700, height=400):
             "contributor__repository",
             "contributor__user",
         )
+        .order_by("id")
     )
+    fishes = list(fishes)
 
-    if not fishes.exists():
+    if not fishes:
         logger.warning(f"[render_aquarium_svg] user={user.id} has no visible fish")
         # 그래도 SVG는 반환
         return f"""
@@ -316,7 +334,7 @@ def render_aquarium_svg(user, width=700, height=400):
     aquarium, _ = Aquarium.objects.get_or_create(user=user)
 
     logger.warning(
-        f"[render_aquarium_svg] user={user.id} aquarium_id={aquarium.id} fish_count={fishes.count()}"
+        f"[render_aquarium_svg] user={user.id} aquarium_id={aquarium.id} fish_count={len(fishes)}"
     )
 
     bg_url = ""
@@ -329,16 +347,23 @@ def render_aquarium_svg(user, width=700, height=400):
             aquarium.background.background.background_image.url
         )
 
+    placements = layout_fishes(
+        fishes,
+        width,
+        height,
+        persona_width_percent=4,  # 프론트 기본값 맞춤
+        padding=8,               # 프론트 기본값 맞춤
+        seed=user.id if seed is None else seed,
+    )
     fish_groups = [
         render_fish_group(
             cf,
             tank_w=width,
             tank_h=height,
             mode="aquarium",
-            persona_width_percent=4,  # 프론트 기본값 맞춤
-            padding=8,               # 프론트 기본값 맞춤
+            placement=placement,
         )
-        for cf in fishes
+        for cf, placement in zip(fishes, placements)
     ]
 
     return f"""
@@ -363,9 +388,10 @@ def render_aquarium_svg(user, width=700, height=400):
     </svg>
     """
 
-def render_fishtank_svg(repository, user, width=700, height=400):
+def render_fishtank_svg(repository, user, width=700, height=400, seed=None):
     """
     레포지토리 공용 피시탱크를 특정 유저의 배경 설정에 맞춰 렌더링합니다.
+    seed가 없으면 repository.id를 사용하므로 같은 입력이면 항상 같은 배치가 나옵니다.
     """
     try:
         # 해당 유저의 피시탱크 설정 조회
@@ -385,18 +411,26 @@ def render_fishtank_svg(repository, user, width=700, height=400):
     fishes = ContributionFish.objects.filter(
         contributor__repository=repository,
         is_visible_in_fishtank=True
-    ).select_related("fish_species", "contributor__user")
-
+    ).select_related("fish_species", "contributor__user").order_by("id")
+    fishes = list(fishes)
+
+    placements = layout_fishes(
+        fishes,
+        width,
+        height,
+        persona_width_percent=4,  # 프론트 기본값 맞춤
+        padding=8,               # 프론트 기본값 맞춤
+        seed=repository.id if seed is None else seed,
+    )
     fish_groups = [
         render_fish_group(
             cf,
             tank_w=width,
             tank_h=height,
             mode="fishtank",
-            persona_width_percent=4,  # 프론트 기본값 맞춤
-            padding=8,               # 프론트 기본값 맞춤
+            placement=placement,
         )
-        for cf in fishes
+        for cf, placement in zip(fishes, placements)
     ]
 
     return f"""<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">
@@ -408,4 +442,281 @@ def render_fishtank_svg(repository, user, width=700, height=400):
     </svg>"""
 
 
+# --- Organization Renderer ---
+
+def _apply_fish_budget(fishes, member_rank, fish_budget):
+    """
+    멤버 순위대로 라운드로빈하여 최대 fish_budget 마리를 고릅니다.
+    커밋이 많은 멤버 한 명이 탱크를 독차지하지 않도록 모든 상위 멤버에게 먼저 1마리씩 배정합니다.
+    """
+    by_member = {}
+    for cf in fishes:
+        by_member.setdefault(cf.contributor.user_id, []).append(cf)
+
+    ordered_members = sorted(by_member, key=lambda uid: member_rank.get(uid, len(member_rank)))
+    selected = []
+    depth = 0
+    while len(selected) < fish_budget:
+        picked = False
+        for uid in ordered_members:
+            member_fishes = by_member[uid]
+            if depth < len(member_fishes):
+                selected.append(member_fishes[depth])
+                picked = True
+                if len(selected) >= fish_budget:
+                    break
+        if not picked:
+            break
+        depth += 1
+    return selected
+
+
+def render_organization_svg(organization, width=700, height=400, fish_budget=60, seed=None):
+    """
+    조직(owner) 전체 피시탱크 렌더링
+    - OrganizationMember 집계에서 커밋 수 상위 멤버만 고르고
+    - 그 멤버들의 조직 레포지토리 물고기만 조회하여 fish_budget 안에서 배치
+    """
+    member_ids = list(
+        organization.members
+        .order_by('-commit_count')
+        .values_list('user_id', flat=True)[:fish_budget]
+    )
+    member_rank = {uid: rank for rank, uid in enumerate(member_ids)}
+
+    fishes = (
+        ContributionFish.objects
+        .filter(
+            contributor__user_id__in=member_ids,
+            contributor__repository__full_name__startswith=f"{organization.login}/",
+            is_visible_in_fishtank=True,
+        )
+        .select_related("fish_species", "contributor__user", "contributor__repository")
+        .order_by('-contributor__commit_count')
+    )
+    selected = _apply_fish_budget(fishes, member_rank, fish_budget)
+
+    logger.info(
+        f"[render_organization_svg] org={organization.login} members={organization.member_count} "
+        f"fish_count={organization.fish_count} rendered={len(selected)}"
+    )
+
+    placements = layout_fishes(
+        selected,
+        width,
+        height,
+        seed=organization.id if seed is None else seed,
+    )
+    fish_groups = [
+        render_fish_group(
+            cf,
+            tank_w=width,
+            tank_h=height,
+            mode="fishtank",
+            placement=placement,
+        )
+        for cf, placement in zip(selected, placements)
+    ]
+
+    title = _escape_text(
+        f"{organization.login} · {organization.member_count} members · {organization.fish_count} fish"
+    )
+
+    return f"""<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">
+        <rect width="{width}" height="{height}" fill="#b8e6fe" rx="15" ry="15" />
+        <g id="fish-container">
+            {''.join(fish_groups)}
+        </g>
+        <text x="16" y="28" font-family='{FONT_FAMILY}' font-size="16" font-weight="900" fill="#000">{title}</text>
+    </svg>"""
+
+
+# --- Team Composite Renderer ---
+
+def _species_symbol_id(species_id) -> str:
+    return f"species-{species_id}"
+
+
+def _render_species_symbol(species) -> str:
+    """
+    종(FishSpecies) 템플릿을 <symbol>로 한 번만 정의합니다.
+    *{id} 플레이스홀더는 symbol id로 치환되어 종 단위로 유일합니다.
+    """
+    symbol_id = _species_symbol_id(species.id)
+    templated_svg = _apply_sprite_id(species.svg_template or "", symbol_id)
+    vb_minx, vb_miny, vb_w, vb_h = _parse_viewbox(templated_svg)
+    return (
+        f'<symbol id="{symbol_id}" viewBox="{vb_minx} {vb_miny} {vb_w} {vb_h}" overflow="visible">'
+        f'{_strip_outer_svg(templated_svg)}'
+        f'</symbol>'
+    )
+
+
+def render_team_svg(users, width=700, height=400, columns=None, gap=16):
+    """
+    여러 유저의 개인 아쿠아리움을 하나의 SVG에 격자로 배치합니다.
+    - 모든 멤버의 노출 물고기를 쿼리 1번으로 조회
+    - 종 스프라이트는 <defs>에 한 번만 정의하고 물고기마다 <use>로 참조
+    """
+    users = list(users)
+    user_ids = [u.id for u in users]
 
+    fishes = (
+        ContributionFish.objects
+        .filter(
+            contributor__user_id__in=user_ids,
+            is_visible_in_aquarium=True,
+        )
+        .select_related(
+            "fish_species",
+            "contributor__repository",
+            "contributor__user",
+        )
+        .order_by("id")
+    )
+
+    fishes_by_user = {uid: [] for uid in user_ids}
+    species_map = {}
+    for cf in fishes:
+        fishes_by_user[cf.contributor.user_id].append(cf)
+        species_map[cf.fish_species_id] = cf.fish_species
+
+    bg_by_user = {
+        aq.user_id: _bg_url_from_ownbackground(aq.background)
+        for aq in Aquarium.objects.filter(user_id__in=user_ids).select_related("background__background")
+    }
+
+    count = max(1, len(users))
+    cols = columns or math.ceil(math.sqrt(count))
+    cols = max(1, min(cols, count))
+    rows = math.ceil(count / cols)
+    total_w = cols * width + (cols - 1) * gap
+    total_h = rows * height + (rows - 1) * gap
+
+    logger.info(
+        f"[render_team_svg] members={len(users)} fish_count={sum(len(v) for v in fishes_by_user.values())} "
+        f"species={len(species_map)}"
+    )
+
+    symbols = [_render_species_symbol(sp) for sp in species_map.values()]
+
+    cells = []
+    for index, user in enumerate(users):
+        x = (index % cols) * (width + gap)
+        y = (index // cols) * (height + gap)
+        bg_url = bg_by_user.get(user.id, "")
+        member_fishes = fishes_by_user[user.id]
+        # 개인 아쿠아리움과 같은 seed → 같은 배치
+        placements = layout_fishes(member_fishes, width, height, seed=user.id)
+        fish_groups = [
+            render_fish_group(
+                cf,
+                tank_w=width,
+                tank_h=height,
+                mode="aquarium",
+                sprite_ref=_species_symbol_id(cf.fish_species_id),
+                placement=placement,
+            )
+            for cf, placement in zip(member_fishes, placements)
+        ]
+        cells.append(f"""
+        <g id="tank-{user.id}" transform="translate({x}, {y})">
+            <rect width="{width}" height="{height}" fill="#b8e6fe" rx="20" ry="20"/>
+            <g clip-path="url(#tank-clip-{user.id})">
+                {f'<image href="{bg_url}" width="{width}" height="{height}" preserveAspectRatio="xMidYMid slice" />' if bg_url else ''}
+                <g class="fish-container">
+                    {''.join(fish_groups)}
+                </g>
+            </g>
+            <text x="16" y="28" font-family='{FONT_FAMILY}' font-size="16" font-weight="900" fill="#000">{_escape_text(user.username)}</text>
+        </g>
+        """)
+
+    clip_paths = ''.join(
+        f'<clipPath id="tank-clip-{user.id}"><rect width="{width}" height="{height}" rx="20" ry="20"/></clipPath>'
+        for user in users
+    )
+
+    return f"""
+    <svg xmlns="http://www.w3.org/2000/svg"
+         width="{total_w}"
+         height="{total_h}"
+         viewBox="0 0 {total_w} {total_h}">
+        <defs>
+            {clip_paths}
+            {''.join(symbols)}
+        </defs>
+        {''.join(cells)}
+    </svg>
+    """
+
+
+
+# --- Contribution Heatmap Renderer ---
+
+HEATMAP_COLORS = ("#ebedf0", "#b8e6fe", "#6cc4f5", "#2a8fd6", "#0b4f8a")
+HEATMAP_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def heatmap_start(end_date, weeks=53):
+    """
+    end_date가 마지막 열에 오도록 첫 열의 일요일 날짜를 계산합니다. (GitHub 잔디와 같은 배치)
+    """
+    return end_date - timedelta(days=(weeks - 1) * 7 + end_date.isoweekday() % 7)
+
+
+def _heatmap_level(count, max_count):
+    if count <= 0:
+        return 0
+    return 1 + min(3, int(4 * count / max(1, max_count)))
+
+
+def render_heatmap_svg(counts, end_date, weeks=53, title="", cell=11, gap=3):
+    """
+    일별 커밋 수로 활동 히트맵(잔디) SVG를 렌더링합니다.
+    - counts: {date: 커밋 수} (DailyCommitCount 집계만 사용하므로 커밋 이력 크기와 무관)
+    - 열: 주(일요일 시작), 행: 요일
+    """
+    start = heatmap_start(end_date, weeks)
+    left, top = 32, 44
+    step = cell + gap
+    width = left + weeks * step + 8
+    height = top + 7 * step + 8
+
+    max_count = max(counts.values(), default=0)
+    total = sum(counts.values())
+
+    cells = []
+    month_labels = []
+    day = start
+    index = 0
+    while day <= end_date:
+        col, row = divmod(index, 7)
+        x = left + col * step
+        y = top + row * step
+        count = counts.get(day, 0)
+        color = HEATMAP_COLORS[_heatmap_level(count, max_count)]
+        cells.append(
+            f'<rect x="{x}" y="{y}" width="{cell}" height="{cell}" rx="2" ry="2" fill="{color}">'
+            f'<title>{day.isoformat()}: {count} commits</title></rect>'
+        )
+        if row == 0 and day.day <= 7:
+            month_labels.append(
+                f'<text x="{x}" y="{top - 6}" font-size="10" fill="#57606a">{HEATMAP_MONTHS[day.month - 1]}</text>'
+            )
+        day += timedelta(days=1)
+        index += 1
+
+    weekday_labels = ''.join(
+        f'<text x="0" y="{top + row * step + cell - 1}" font-size="10" fill="#57606a">{label}</text>'
+        for row, label in ((1, "Mon"), (3, "Wed"), (5, "Fri"))
+    )
+    heading = _escape_text(f"{title} · {total} commits" if title else f"{total} commits")
+
+    return f"""<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">
+        <rect width="{width}" height="{height}" fill="#ffffff" rx="6" ry="6"/>
+        <text x="{left}" y="18" font-family='{FONT_FAMILY}' font-size="12" font-weight="900" fill="#000">{heading}</text>
+        {''.join(month_labels)}
+        {weekday_labels}
+        {''.join(cells)}
+    </svg>"""
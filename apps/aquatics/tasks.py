@@ -3,8 +3,19 @@ import logging
 import os
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from GithubAquarium.task_queue import enqueue, LANE_INTERACTIVE, SHED_OG_CARD, SHED_RENDER
 from .models import Aquarium, Fishtank
 from .renderers import render_aquarium_svg, render_fishtank_svg
+from .render_cache import (
+    bump_render_version,
+    get_or_render,
+    aquarium_subject,
+    fishtank_subject,
+    fishtank_render_version,
+)
+from .versioning import aquarium_needs_render, fishtank_needs_render, fishtank_target_version
+from .popularity import hot_variants
+from .og_cards import render_aquarium_card, render_repository_card, save_card
 from apps.repositories.models import Repository
 
 # 로깅 설정
@@ -14,10 +25,22 @@ User = get_user_model()
 def generate_aquarium_svg_task(user_id):
     """
     유저의 개인 아쿠아리움을 렌더링하여 저장합니다.
+    렌더 입력 버전이 저장된 결과물의 버전과 같으면 아무것도 하지 않습니다.
     """
     try:
         user = User.objects.get(id=user_id)
         aquarium, _ = Aquarium.objects.get_or_create(user=user)
+
+        if not aquarium_needs_render(aquarium):
+            logger.debug(f"Aquarium of {user.username} is up to date (version {aquarium.render_version})")
+            return
+        # 렌더 도중 버전이 또 올라가면 다음 태스크가 다시 렌더링하도록 시작 시점 버전을 기록
+        target_version = aquarium.render_version
+
+        # 공개 렌더 캐시 무효화 (README 임베드가 새 버전을 렌더링하도록)
+        bump_render_version(aquarium_subject(user.id))
+        # 인기 임베드는 interactive 레인에서 새 버전으로 미리 채움 (이 작업이 bulk 레인이어도 밀리지 않도록)
+        _enqueue_prewarm_aquarium(user.id)
         
         # 1. SVG 텍스트 생성
         svg_content = render_aquarium_svg(user)
@@ -38,9 +61,13 @@ def generate_aquarium_svg_task(user_id):
         
         # 4. DB 업데이트
         aquarium.svg_path = file_name
-        aquarium.save(update_fields=['svg_path', 'updated_at'])
+        aquarium.rendered_version = target_version
+        aquarium.save(update_fields=['svg_path', 'rendered_version', 'updated_at'])
         
-        logger.info(f"Successfully generated Aquarium SVG for user {user.username}")
+        logger.info(f"Successfully generated Aquarium SVG for user {user.username} (version {target_version})")
+
+        # 소셜 미리보기 카드도 같은 변경을 반영하도록 갱신
+        enqueue('apps.aquatics.tasks.generate_aquarium_og_card_task', user.id, shed=SHED_OG_CARD)
 
     except User.DoesNotExist:
         logger.error(f"User not found for generate_aquarium_svg_task: {user_id}")
@@ -54,17 +81,35 @@ def generate_fishtank_svg_task(repo_id, user_id=None):
     
     - repo_id, user_id 모두 있음: 해당 유저의 피시탱크 뷰만 갱신
     - user_id가 None임: 해당 레포지토리를 구독 중인 '모든' 유저의 피시탱크 뷰 갱신
+    렌더 입력 버전이 바뀐 피시탱크만 렌더링합니다.
     """
     try:
+        repo = Repository.objects.get(id=repo_id)
+
         # user_id가 없으면(Webhook 등에서 전체 갱신 요청 시)
         if user_id is None:
-            fishtanks = Fishtank.objects.filter(repository_id=repo_id)
-            for ft in fishtanks:
-                _generate_single_fishtank(repo_id, ft.user_id)
+            fishtanks = list(Fishtank.objects.filter(repository_id=repo_id))
+            stale_user_ids = [ft.user_id for ft in fishtanks if fishtank_needs_render(ft, repo)]
         else:
-            # 특정 유저만 갱신
-            _generate_single_fishtank(repo_id, user_id)
+            # 특정 유저만 갱신 (레코드가 없으면 새로 만들어 렌더링)
+            fishtank = Fishtank.objects.filter(repository_id=repo_id, user_id=user_id).first()
+            stale_user_ids = [user_id] if fishtank is None or fishtank_needs_render(fishtank, repo) else []
 
+        if not stale_user_ids:
+            logger.debug(f"Fishtanks of {repo.full_name} are up to date (fish version {repo.fish_version})")
+            return
+
+        # 공개 렌더 캐시 무효화 (유저별 배경 변경 반영, 물고기 변경은 fish_version으로 반영됨)
+        bump_render_version(fishtank_subject(repo_id))
+        _enqueue_prewarm_fishtank(repo_id)
+
+        for stale_user_id in stale_user_ids:
+            _generate_single_fishtank(repo_id, stale_user_id)
+
+        enqueue('apps.aquatics.tasks.generate_repository_og_card_task', repo_id, shed=SHED_OG_CARD)
+
+    except Repository.DoesNotExist:
+        logger.error(f"Repository not found for generate_fishtank_svg_task: {repo_id}")
     except Exception as e:
         logger.error(f"Error in generate_fishtank_svg_task dispatch (Repo: {repo_id}): {e}", exc_info=True)
 
@@ -79,6 +124,7 @@ def _generate_single_fishtank(repo_id, user_id):
         
         # Fishtank 레코드가 없으면 생성, 있으면 가져옴
         fishtank, _ = Fishtank.objects.get_or_create(repository=repo, user=user)
+        target_version = fishtank_target_version(fishtank, repo)
         
         # 유저 정보를 넘겨서 렌더링 (해당 유저의 배경 설정 등 반영)
         svg_content = render_fishtank_svg(repo, user)
@@ -95,11 +141,109 @@ def _generate_single_fishtank(repo_id, user_id):
             f.write(svg_content)
             
         fishtank.svg_path = file_name
-        fishtank.save(update_fields=['svg_path', 'updated_at'])
+        fishtank.rendered_version = target_version
+        fishtank.save(update_fields=['svg_path', 'rendered_version', 'updated_at'])
         
-        logger.info(f"Generated Fishtank SVG for Repo {repo.full_name} / User {user.username}")
+        logger.info(f"Generated Fishtank SVG for Repo {repo.full_name} / User {user.username} (version {target_version})")
 
     except (Repository.DoesNotExist, User.DoesNotExist):
         logger.error(f"Repo or User missing for Fishtank generation (Repo: {repo_id}, User: {user_id})")
     except Exception as e:
-        logger.error(f"Error generating Fishtank SVG (Repo: {repo_id}, User: {user_id}): {e}", exc_info=True)
\ No newline at end of file
+        logger.error(f"Error generating Fishtank SVG (Repo: {repo_id}, User: {user_id}): {e}", exc_info=True)
+
+def generate_aquarium_og_card_task(user_id):
+    """
+    개인 아쿠아리움의 Open Graph 미리보기 카드(PNG)를 생성합니다.
+    내용이 바뀌지 않았다면 파일을 다시 쓰지 않습니다.
+    """
+    try:
+        aquarium = Aquarium.objects.select_related('user', 'background__background').get(user_id=user_id)
+        file_name = save_card(
+            render_aquarium_card(aquarium),
+            f"aquarium_{user_id}",
+            previous_path=aquarium.og_image_path,
+        )
+        if file_name != aquarium.og_image_path:
+            Aquarium.objects.filter(id=aquarium.id).update(og_image_path=file_name)
+            logger.info(f"Generated Aquarium OG card for user {user_id}: {file_name}")
+
+    except Aquarium.DoesNotExist:
+        logger.error(f"Aquarium not found for generate_aquarium_og_card_task: {user_id}")
+    except Exception as e:
+        logger.error(f"Error generating Aquarium OG card for user {user_id}: {e}", exc_info=True)
+
+
+def generate_repository_og_card_task(repo_id):
+    """
+    레포지토리 피시탱크의 Open Graph 미리보기 카드(PNG)를 생성합니다.
+    (유저별 배경과 무관한 레포지토리 단위 카드)
+    """
+    try:
+        repo = Repository.objects.get(id=repo_id)
+        file_name = save_card(
+            render_repository_card(repo),
+            f"repo_{repo_id}",
+            previous_path=repo.og_image_path,
+        )
+        if file_name != repo.og_image_path:
+            Repository.objects.filter(id=repo.id).update(og_image_path=file_name)
+            logger.info(f"Generated Repository OG card for {repo.full_name}: {file_name}")
+
+    except Repository.DoesNotExist:
+        logger.error(f"Repository not found for generate_repository_og_card_task: {repo_id}")
+    except Exception as e:
+        logger.error(f"Error generating Repository OG card (Repo: {repo_id}): {e}", exc_info=True)
+
+
+def _parse_size(size: str):
+    width, height = size.split("x")
+    return int(width), int(height)
+
+
+def _enqueue_prewarm_aquarium(user_id):
+    """
+    무효화 직후 인기(hot) 공개 렌더 variant마다 미리 렌더링 작업을 interactive 레인에 등록합니다.
+    다음 프록시 요청이 캐시 미스로 렌더링을 기다리지 않도록 하기 위함입니다.
+    """
+    for variant in hot_variants(aquarium_subject(user_id)):
+        enqueue('apps.aquatics.tasks.prewarm_aquarium_task', user_id, variant, lane=LANE_INTERACTIVE, shed=SHED_RENDER)
+
+
+def _enqueue_prewarm_fishtank(repo_id):
+    for variant in hot_variants(fishtank_subject(repo_id)):
+        enqueue('apps.aquatics.tasks.prewarm_fishtank_task', repo_id, variant, lane=LANE_INTERACTIVE, shed=SHED_RENDER)
+
+
+def prewarm_aquarium_task(user_id, variant):
+    """
+    아쿠아리움 공개 렌더 variant("너비x높이") 하나를 현재 버전으로 미리 렌더링합니다.
+    """
+    subject = aquarium_subject(user_id)
+    try:
+        user = User.objects.get(id=user_id)
+        width, height = _parse_size(variant)
+        get_or_render(subject, variant, lambda: render_aquarium_svg(user, width=width, height=height))
+        logger.info(f"Prewarmed hot render {subject} {variant}")
+    except Exception as e:
+        logger.warning(f"Failed to prewarm {subject} {variant}: {e}")
+
+
+def prewarm_fishtank_task(repo_id, variant):
+    """
+    피시탱크 variant는 "보는 유저 id:크기" 형식입니다.
+    """
+    subject = fishtank_subject(repo_id)
+    try:
+        repo = Repository.objects.get(id=repo_id)
+        viewer_id, size = variant.split(":")
+        width, height = _parse_size(size)
+        viewer = User.objects.get(id=int(viewer_id))
+        get_or_render(
+            subject,
+            variant,
+            lambda: render_fishtank_svg(repo, viewer, width=width, height=height),
+            version=fishtank_render_version(repo),
+        )
+        logger.info(f"Prewarmed hot render {subject} {variant}")
+    except Exception as e:
+        logger.warning(f"Failed to prewarm {subject} {variant}: {e}")
@@ -19,6 +19,12 @@ from .views import (
 from .views_render import (
     PublicAquariumSvgRenderView,
     PublicFishtankSvgRenderView,
+    PublicTeamSvgRenderView,
+    PublicOrganizationSvgRenderView,
+    PublicUserHeatmapSvgRenderView,
+    PublicRepositoryHeatmapSvgRenderView,
+    PublicAquariumOgImageView,
+    PublicRepositoryOgImageView,
 )
 urlpatterns = [
     # --- 개인 아쿠아리움 관리 ---
@@ -40,14 +46,70 @@ urlpatterns = [
     path("fishtank/<int:repo_id>/svg/preview/", FishtankSvgPreviewView.as_view()),
     #path("fishtank/<int:repo_id>/svg/", FishtankSvgPathView.as_view()),
     #path("aquarium/svg/", AquariumSvgPathView.as_view()),
+    # 고정 URL(별칭)은 현재 콘텐츠 버전 URL로 redirect, 버전 URL은 immutable
     path(
         "render/aquarium/<str:username>/",
         PublicAquariumSvgRenderView.as_view(),
+        name="render-aquarium",
+    ),
+    path(
+        "render/aquarium/<str:username>/v/<str:content_version>/",
+        PublicAquariumSvgRenderView.as_view(),
+        name="render-aquarium-versioned",
     ),
     path(
         "render/fishtank/<str:username>/<int:repo_id>/",
         PublicFishtankSvgRenderView.as_view(),
+        name="render-fishtank",
+    ),
+    path(
+        "render/fishtank/<str:username>/<int:repo_id>/v/<str:content_version>/",
+        PublicFishtankSvgRenderView.as_view(),
+        name="render-fishtank-versioned",
+    ),
+    path(
+        "render/team/",
+        PublicTeamSvgRenderView.as_view(),
+        name="render-team",
+    ),
+    path(
+        "render/team/v/<str:content_version>/",
+        PublicTeamSvgRenderView.as_view(),
+        name="render-team-versioned",
+    ),
+    path(
+        "render/org/<str:login>/",
+        PublicOrganizationSvgRenderView.as_view(),
+        name="render-org",
+    ),
+    path(
+        "render/org/<str:login>/v/<str:content_version>/",
+        PublicOrganizationSvgRenderView.as_view(),
+        name="render-org-versioned",
+    ),
+    path(
+        "render/heatmap/user/<str:username>/",
+        PublicUserHeatmapSvgRenderView.as_view(),
+        name="render-heatmap-user",
+    ),
+    path(
+        "render/heatmap/user/<str:username>/v/<str:content_version>/",
+        PublicUserHeatmapSvgRenderView.as_view(),
+        name="render-heatmap-user-versioned",
+    ),
+    path(
+        "render/heatmap/repository/<int:repo_id>/",
+        PublicRepositoryHeatmapSvgRenderView.as_view(),
+        name="render-heatmap-repository",
+    ),
+    path(
+        "render/heatmap/repository/<int:repo_id>/v/<str:content_version>/",
+        PublicRepositoryHeatmapSvgRenderView.as_view(),
+        name="render-heatmap-repository-versioned",
     ),
+    # --- Open Graph 미리보기 카드 (정적 PNG로 redirect) ---
+    path("og/aquarium/<str:username>/", PublicAquariumOgImageView.as_view(), name="og-aquarium"),
+    path("og/repository/<int:repo_id>/", PublicRepositoryOgImageView.as_view(), name="og-repository"),
     path("embed/aquarium/", AquariumEmbedCodeView.as_view()),
     path("embed/fishtank/<int:repo_id>/", FishtankEmbedCodeView.as_view()),
 ]
\ No newline at end of file
@@ -0,0 +1,62 @@
+# apps/aquatics/versioning.py
+"""
+렌더 입력 버전(render input version).
+
+아쿠아리움/피시탱크의 렌더 결과에 영향을 주는 모든 변경 경로는 여기의 bump_* 함수로
+단조 증가 카운터를 F()로 올립니다. 렌더 태스크는 결과물과 함께 저장된 버전과 비교해
+바뀐 것이 없으면 렌더링을 건너뜁니다.
+
+- Aquarium.render_version: 개인 아쿠아리움 입력 (배경, 노출 설정, 내 물고기/커밋 수)
+- Repository.fish_version: 레포지토리 물고기 집합 (기여자, 커밋 수, 종, 노출 설정)
+- Fishtank.render_version: 유저별 피시탱크 뷰 입력 (배경)
+  → 피시탱크 결과물 버전 = Fishtank.render_version + Repository.fish_version (둘 다 단조 증가)
+- Organization.render_version: 조직 전체 탱크 입력 (하위 레포 물고기 집합 + 조직 집계)
+  집계 변경은 apps/repositories/organizations.py 에서, 물고기 변경은 fish_version과 함께 여기서 올림
+"""
+from django.db.models import F
+from apps.aquatics.models import Aquarium, Fishtank
+from apps.repositories.models import Organization, Repository
+from apps.repositories.organizations import owner_login
+
+
+def bump_aquarium_version(user_id):
+    # 아쿠아리움이 아직 없으면 svg_path가 비어 있으므로 첫 렌더 때 어차피 렌더링됨
+    Aquarium.objects.filter(user_id=user_id).update(render_version=F('render_version') + 1)
+
+
+def bump_fishtank_version(repo_id, user_id):
+    Fishtank.objects.filter(repository_id=repo_id, user_id=user_id).update(
+        render_version=F('render_version') + 1
+    )
+
+
+def bump_repository_fish_version(repo_id):
+    Repository.objects.filter(id=repo_id).update(fish_version=F('fish_version') + 1)
+    bump_organization_version(repo_id)
+
+
+def bump_organization_version(repo_id):
+    # 물고기 종/노출 변경은 조직 행을 건드리지 않으므로 레포의 owner 조직 버전을 함께 올림
+    full_name = Repository.objects.filter(id=repo_id).values_list('full_name', flat=True).first()
+    if full_name:
+        Organization.objects.filter(login=owner_login(full_name)).update(render_version=F('render_version') + 1)
+
+
+def bump_contribution_versions(repo_id, user_id):
+    """
+    기여(커밋 수, 물고기 종)가 바뀌면 레포지토리 피시탱크와 기여자의 아쿠아리움이 모두 바뀝니다.
+    """
+    bump_repository_fish_version(repo_id)
+    bump_aquarium_version(user_id)
+
+
+def aquarium_needs_render(aquarium) -> bool:
+    return not aquarium.svg_path or aquarium.rendered_version != aquarium.render_version
+
+
+def fishtank_target_version(fishtank, repository) -> int:
+    return fishtank.render_version + repository.fish_version
+
+
+def fishtank_needs_render(fishtank, repository) -> bool:
+    return not fishtank.svg_path or fishtank.rendered_version != fishtank_target_version(fishtank, repository)
@@ -3,7 +3,7 @@ import os
 from django.conf import settings
 from django.db import transaction
 from django.shortcuts import get_object_or_404
-from django_q.tasks import async_task
+from GithubAquarium.task_queue import enqueue_debounced, LANE_INTERACTIVE, SHED_RENDER
 from rest_framework import generics, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -25,6 +25,21 @@ from .serializers import (
 )
 from apps.aquatics.renderers import render_aquarium_svg, render_fishtank_svg
 from apps.aquatics.tasks import generate_aquarium_svg_task,generate_fishtank_svg_task
+from apps.aquatics.render_cache import (
+    get_content_version,
+    aquarium_subject,
+    fishtank_subject,
+    fishtank_render_version,
+)
+from apps.aquatics.versioning import (
+    bump_aquarium_version,
+    bump_fishtank_version,
+    bump_repository_fish_version,
+    aquarium_needs_render,
+    fishtank_needs_render,
+    fishtank_target_version,
+)
+from apps.aquatics.views_render import versioned_path
 import logging
 logger = logging.getLogger(__name__)
 # --- 개인 아쿠아리움 관련 ---
@@ -38,6 +53,7 @@ class AquariumDetailView(generics.RetrieveAPIView):
         aquarium, _ = Aquarium.objects.get_or_create(user=user)
         if not aquarium.svg_path:
             try:
+                target_version = aquarium.render_version
                 svg_content = render_aquarium_svg(user)
                 if svg_content:
                     file_name = f"aquariums/aquarium_{user.id}.svg"
@@ -46,9 +62,13 @@ class AquariumDetailView(generics.RetrieveAPIView):
                     with open(path, "w", encoding="utf-8") as f:
                         f.write(svg_content)
                     aquarium.svg_path = file_name
-                    aquarium.save(update_fields=['svg_path'])
+                    aquarium.rendered_version = target_version
+                    aquarium.save(update_fields=['svg_path', 'rendered_version'])
             except Exception as e:
                 print(f"Error generating Aquarium SVG sync: {e}")
+        elif aquarium_needs_render(aquarium):
+            # 저장된 SVG가 예전 버전이면 일단 그대로 보여주고 백그라운드에서 갱신
+            enqueue_debounced('apps.aquatics.tasks.generate_aquarium_svg_task', user.id, lane=LANE_INTERACTIVE, shed=SHED_RENDER, defer=True)
         return aquarium
 
     @swagger_auto_schema(
@@ -76,7 +96,8 @@ class AquariumBackgroundUpdateView(APIView):
         aquarium, _ = Aquarium.objects.get_or_create(user=request.user)
         aquarium.background = own_bg
         aquarium.save()
-        async_task('apps.aquatics.tasks.generate_aquarium_svg_task', request.user.id)
+        bump_aquarium_version(request.user.id)
+        enqueue_debounced('apps.aquatics.tasks.generate_aquarium_svg_task', request.user.id, lane=LANE_INTERACTIVE, shed=SHED_RENDER, defer=True)
         return Response({"detail": "아쿠아리움 배경이 업데이트되었습니다."})
 
 class AquariumFishVisibilityUpdateView(APIView):
@@ -103,7 +124,8 @@ class AquariumFishVisibilityUpdateView(APIView):
                 fish.is_visible_in_aquarium = visible
                 fish.aquarium = aquarium if visible else None
                 fish.save()
-        async_task('apps.aquatics.tasks.generate_aquarium_svg_task', request.user.id)
+            bump_aquarium_version(request.user.id)
+        enqueue_debounced('apps.aquatics.tasks.generate_aquarium_svg_task', request.user.id, lane=LANE_INTERACTIVE, shed=SHED_RENDER, defer=True)
         return Response({"detail": "아쿠아리움 물고기 배치가 완료되었습니다."})
 
 class FishtankDetailView(generics.RetrieveAPIView):
@@ -116,6 +138,7 @@ class FishtankDetailView(generics.RetrieveAPIView):
         fishtank, _ = Fishtank.objects.get_or_create(repository=repository, user=self.request.user)
         if not fishtank.svg_path:
             try:
+                target_version = fishtank_target_version(fishtank, repository)
                 svg_content = render_fishtank_svg(repository, self.request.user)
                 if svg_content:
                     file_name = f"fishtanks/repo_{repository.id}_user_{self.request.user.id}.svg"
@@ -124,9 +147,12 @@ class FishtankDetailView(generics.RetrieveAPIView):
                     with open(path, "w", encoding="utf-8") as f:
                         f.write(svg_content)
                     fishtank.svg_path = file_name
-                    fishtank.save(update_fields=['svg_path'])
+                    fishtank.rendered_version = target_version
+                    fishtank.save(update_fields=['svg_path', 'rendered_version'])
             except Exception as e:
                 print(f"Error generating Fishtank SVG sync: {e}")
+        elif fishtank_needs_render(fishtank, repository):
+            enqueue_debounced('apps.aquatics.tasks.generate_fishtank_svg_task', repository.id, self.request.user.id, lane=LANE_INTERACTIVE, shed=SHED_RENDER, defer=True)
         return fishtank
     
     @swagger_auto_schema(
@@ -156,7 +182,8 @@ class FishtankBackgroundUpdateView(APIView):
         fishtank, _ = Fishtank.objects.get_or_create(repository=repository, user=request.user)
         fishtank.background = own_bg
         fishtank.save()
-        async_task('apps.aquatics.tasks.generate_fishtank_svg_task', repository.id, request.user.id)
+        bump_fishtank_version(repository.id, request.user.id)
+        enqueue_debounced('apps.aquatics.tasks.generate_fishtank_svg_task', repository.id, request.user.id, lane=LANE_INTERACTIVE, shed=SHED_RENDER, defer=True)
         return Response({"detail": "수족관 배경 설정이 업데이트되었습니다."})
 
 class FishtankFishVisibilityUpdateView(APIView):
@@ -182,9 +209,10 @@ class FishtankFishVisibilityUpdateView(APIView):
             for fish in user_fishes:
                 fish.is_visible_in_fishtank = settings_map[fish.id]
                 fish.save()
+            bump_repository_fish_version(repo_id)
         related_fishtanks = Fishtank.objects.filter(repository_id=repo_id)
         for ft in related_fishtanks:
-            async_task('apps.aquatics.tasks.generate_fishtank_svg_task', repo_id, ft.user_id)
+            enqueue_debounced('apps.aquatics.tasks.generate_fishtank_svg_task', repo_id, ft.user_id, lane=LANE_INTERACTIVE, shed=SHED_RENDER, defer=True)
         return Response({"detail": "수족관 노출 설정 완료"})
 
 class UserContributionFishListView(generics.ListAPIView):
@@ -245,9 +273,10 @@ class AquariumFishVisibilityUpdateView(APIView):
                 fish.is_visible_in_aquarium = visible
                 fish.aquarium = aquarium if visible else None
                 fish.save()
+            bump_aquarium_version(request.user.id)
 
         # 개인 아쿠아리움 배치 변경 후 SVG 재생성
-        async_task('apps.aquatics.tasks.generate_aquarium_svg_task', request.user.id)
+        enqueue_debounced('apps.aquatics.tasks.generate_aquarium_svg_task', request.user.id, lane=LANE_INTERACTIVE, shed=SHED_RENDER, defer=True)
 
         return Response({"detail": "아쿠아리움 물고기 배치가 완료되었습니다."})
     
@@ -339,14 +368,24 @@ class AquariumEmbedCodeView(APIView):
         username = request.user.username
         render_base = settings.RENDER_DOMAIN
 
-        img_url = f"{render_base}/render/aquarium/{username}?width=700&height=400"
+        # 고정 URL(별칭)은 현재 콘텐츠 버전 URL로 redirect
+        img_url = f"{render_base}/render/aquarium/{username}/?width=700&height=400"
         profile_url = f"https://githubaquarium.store/u/{username}"
 
+        # 저장된 콘텐츠 버전만 읽음 (렌더링하지 않음). 아직 렌더링 전이면 별칭을 사용
+        content_version = get_content_version(aquarium_subject(request.user.id), "700x400")
+        versioned_img_url = content_version and (
+            f"{render_base}{versioned_path(f'/render/aquarium/{username}/', content_version)}"
+            f"?width=700&height=400"
+        )
+        embed_url = versioned_img_url or img_url
+
         return Response({
             "ok": True,
             "img_url": img_url,
-            "html": f'<a href="{profile_url}"><img src="{img_url}" width="700" height="400" /></a>',
-            "markdown": f'[![{username}\'s Aquarium]({img_url})]({profile_url})',
+            "versioned_img_url": versioned_img_url,
+            "html": f'<a href="{profile_url}"><img src="{embed_url}" width="700" height="400" /></a>',
+            "markdown": f'[![{username}\'s Aquarium]({embed_url})]({profile_url})',
         })
 
 
@@ -361,12 +400,24 @@ class FishtankEmbedCodeView(APIView):
         username = request.user.username
         render_base = settings.RENDER_DOMAIN
 
-        img_url = f"{render_base}/render/fishtank/{username}/{repo.id}?width=700&height=400"
+        img_url = f"{render_base}/render/fishtank/{username}/{repo.id}/?width=700&height=400"
         link_url = f"https://githubaquarium.store/repo/{repo.id}"
 
+        content_version = get_content_version(
+            fishtank_subject(repo.id),
+            f"{request.user.id}:700x400",
+            version=fishtank_render_version(repo),
+        )
+        versioned_img_url = content_version and (
+            f"{render_base}{versioned_path(f'/render/fishtank/{username}/{repo.id}/', content_version)}"
+            f"?width=700&height=400"
+        )
+        embed_url = versioned_img_url or img_url
+
         return Response({
             "ok": True,
             "img_url": img_url,
-            "html": f'<a href="{link_url}"><img src="{img_url}" width="700" height="400" /></a>',
-            "markdown": f'[![{repo.full_name}]({img_url})]({link_url})',
+            "versioned_img_url": versioned_img_url,
+            "html": f'<a href="{link_url}"><img src="{embed_url}" width="700" height="400" /></a>',
+            "markdown": f'[![{repo.full_name}]({embed_url})]({link_url})',
         })
\ No newline at end of file
@@ -1,68 +1,335 @@
 # apps/aquatics/views_render.py
-from django.http import HttpResponse
+"""
+README/외부 임베드용 공개 렌더 엔드포인트.
+
+프록시(camo 등)의 이미지 요청이 몰리는 경로라 async 뷰로 구현합니다.
+ASGI(GithubAquarium/asgi.py)로 서빙하면 조회/캐시 대기 중에 워커 스레드를 점유하지 않고,
+실제 렌더링(캐시 미스)만 스레드에서 실행됩니다. WSGI에서도 그대로 동작합니다.
+"""
+from collections import namedtuple
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseRedirect
 from django.contrib.auth import get_user_model
-from rest_framework.views import APIView
+from django.utils import timezone
+from django.views import View
 from apps.aquatics.renderers import render_aquarium_svg
-from apps.repositories.models import Repository
-from apps.aquatics.renderers import render_fishtank_svg
+from apps.aquatics.models import Aquarium
+from apps.repositories.models import Repository, Organization, DailyCommitCount
+from apps.repositories.activity import daily_counts, heatmap_user_subject, heatmap_repository_subject
+from apps.aquatics.renderers import render_fishtank_svg, render_team_svg, render_organization_svg
+from apps.aquatics.renderers import render_heatmap_svg, heatmap_start
+from apps.aquatics.render_cache import (
+    aget_or_render,
+    aget_render_versions,
+    combine_versions,
+    content_hash,
+    aget_rendered_content,
+    aquarium_subject,
+    fishtank_subject,
+    afishtank_render_version,
+    team_subject,
+    organization_subject,
+)
+from apps.aquatics.popularity import arecord_render_hit
 
 User = get_user_model()
 
+# 버전 URL(/v/<hash>/)의 내용은 절대 바뀌지 않으므로 프록시가 1년간 재검증 없이 캐시
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# 고정 URL(별칭)은 매번 재검증하여 최신 버전 URL로 redirect
+ALIAS_CACHE_CONTROL = "no-cache"
+
+
+# 공개 렌더 1건: 캐시 대상, 결과물 구분값, 렌더 함수(인자 없음, 동기), 직접 계산한 버전(없으면 subject 버전)
+RenderTarget = namedtuple('RenderTarget', ['subject', 'variant', 'render_fn', 'version'], defaults=[None])
+
 
-class PublicAquariumSvgRenderView(APIView):
+def int_param(request, name, default, lo, hi):
     """
-    GitHub README용 Aquarium SVG 렌더
-    - 로그인 필요 없음
-    - SVG 직접 반환
+    쿼리 파라미터를 정수로 읽어 [lo, hi] 범위로 제한합니다.
+    숫자가 아니면 기본값을 사용합니다. (?width=abc 등으로 500이 나지 않도록)
     """
-    authentication_classes = []
-    permission_classes = []
+    try:
+        value = int(request.GET.get(name, default))
+    except (TypeError, ValueError):
+        value = default
+    return max(lo, min(value, hi))
 
-    def get(self, request, username: str):
-        try:
-            user = User.objects.get(username=username)
-        except User.DoesNotExist:
+
+def size_params(request):
+    # 렌더 크기는 RENDER_MIN_SIZE ~ RENDER_MAX_SIZE 로 제한 (거대한 캔버스 렌더 방지)
+    lo = getattr(settings, "RENDER_MIN_SIZE", 100)
+    hi = getattr(settings, "RENDER_MAX_SIZE", 2000)
+    return int_param(request, "width", 700, lo, hi), int_param(request, "height", 400, lo, hi)
+
+
+def versioned_path(path: str, content_version: str) -> str:
+    """
+    고정 렌더 경로에 콘텐츠 버전 세그먼트를 붙입니다.
+    /render/aquarium/alice/ -> /render/aquarium/alice/v/<hash>/
+    """
+    return f"{path.rstrip('/')}/v/{content_version}/"
+
+
+class PublicSvgRenderView(View):
+    """
+    공개 SVG 렌더 공통 처리
+    - 고정 URL: 현재 콘텐츠 버전 URL로 redirect (README에 이미 붙여넣은 임베드용 별칭)
+    - 버전 URL: 해당 버전의 결과물을 immutable 캐시 헤더와 함께 반환
+      (예전 버전이 캐시에서 사라졌다면 최신 버전 URL로 redirect)
+      결과물은 이 경로의 (subject, variant)로만 찾으므로 다른 대상의 해시로는 꺼낼 수 없음
+
+    하위 클래스는 async get_target()에서 RenderTarget을 반환합니다. (대상이 없으면 None)
+    """
+
+    async def get_target(self, request, **kwargs):
+        raise NotImplementedError
+
+    async def get(self, request, content_version=None, **kwargs):
+        target = await self.get_target(request, **kwargs)
+        if target is None:
             return HttpResponse(
                 "<svg xmlns='http://www.w3.org/2000/svg'></svg>",
                 content_type="image/svg+xml",
                 status=404,
             )
 
-        width = int(request.GET.get("width", 700))
-        height = int(request.GET.get("height", 400))
+        if content_version is not None:
+            svg = await aget_rendered_content(target.subject, target.variant, content_version)
+            if svg is not None:
+                return self._svg_response(svg, IMMUTABLE_CACHE_CONTROL)
+
+        await arecord_render_hit(target.subject, target.variant)
+        svg = await aget_or_render(target.subject, target.variant, target.render_fn, version=target.version)
+
+        current_version = content_hash(svg)
+        if content_version == current_version:
+            return self._svg_response(svg, IMMUTABLE_CACHE_CONTROL)
 
-        svg = render_aquarium_svg(user, width=width, height=height)
+        alias_path = request.path
+        if content_version is not None:
+            alias_path = alias_path.rstrip('/').rsplit('/v/', 1)[0]
+        location = versioned_path(alias_path, current_version)
+        query = request.META.get("QUERY_STRING")
+        if query:
+            location = f"{location}?{query}"
 
-        return HttpResponse(
+        response = HttpResponseRedirect(location)
+        response["Cache-Control"] = ALIAS_CACHE_CONTROL
+        return response
+
+    def _svg_response(self, svg, cache_control):
+        response = HttpResponse(
             svg,
             content_type="image/svg+xml; charset=utf-8",
         )
-    
-class PublicFishtankSvgRenderView(APIView):
+        response["Cache-Control"] = cache_control
+        return response
+
+
+class PublicAquariumSvgRenderView(PublicSvgRenderView):
+    """
+    GitHub README용 Aquarium SVG 렌더
+    - 로그인 필요 없음
+    - SVG 직접 반환
+    - 동시 요청은 single-flight로 묶어 한 번만 렌더링
+    """
+
+    async def get_target(self, request, username: str):
+        try:
+            user = await User.objects.aget(username=username)
+        except User.DoesNotExist:
+            return None
+
+        width, height = size_params(request)
+
+        return RenderTarget(
+            aquarium_subject(user.id),
+            f"{width}x{height}",
+            lambda: render_aquarium_svg(user, width=width, height=height),
+        )
+
+
+class PublicFishtankSvgRenderView(PublicSvgRenderView):
     """
     GitHub README용 Fishtank SVG 렌더
     """
-    authentication_classes = []
-    permission_classes = []
 
-    def get(self, request, username: str, repo_id: int):
+    async def get_target(self, request, username: str, repo_id: int):
         try:
-            user = User.objects.get(username=username)
-            repo = Repository.objects.get(id=repo_id)
+            user = await User.objects.aget(username=username)
+            repo = await Repository.objects.aget(id=repo_id)
         except (User.DoesNotExist, Repository.DoesNotExist):
-            return HttpResponse(
-                "<svg xmlns='http://www.w3.org/2000/svg'></svg>",
-                content_type="image/svg+xml",
-                status=404,
-            )
+            return None
+
+        width, height = size_params(request)
 
-        width = int(request.GET.get("width", 700))
-        height = int(request.GET.get("height", 400))
+        # 배경은 보는 유저마다 다르므로 variant에 user를 포함
+        return RenderTarget(
+            fishtank_subject(repo.id),
+            f"{user.id}:{width}x{height}",
+            lambda: render_fishtank_svg(repo, user, width=width, height=height),
+            version=await afishtank_render_version(repo),
+        )
 
-        svg = render_fishtank_svg(repo, user, width=width, height=height)
 
-        return HttpResponse(
-            svg,
-            content_type="image/svg+xml; charset=utf-8",
+class PublicTeamSvgRenderView(PublicSvgRenderView):
+    """
+    GitHub README용 팀 합성 Aquarium SVG 렌더
+    - ?users=alice,bob,carol 순서대로 격자 배치
+    - 멤버 아쿠아리움 버전을 합친 콘텐츠 버전으로 캐시
+    """
+
+    async def get_target(self, request):
+        max_members = getattr(settings, "TEAM_RENDER_MAX_MEMBERS", 16)
+        usernames = []
+        for name in request.GET.get("users", "").split(","):
+            name = name.strip()
+            if name and name not in usernames:
+                usernames.append(name)
+        usernames = usernames[:max_members]
+
+        users_by_name = {u.username: u async for u in User.objects.filter(username__in=usernames)}
+        users = [users_by_name[name] for name in usernames if name in users_by_name]
+        if not users:
+            return None
+
+        width, height = size_params(request)
+        columns = int_param(request, "cols", 0, 0, max_members) or None
+
+        user_ids = [u.id for u in users]
+        version = combine_versions(await aget_render_versions([aquarium_subject(uid) for uid in user_ids]))
+
+        return RenderTarget(
+            team_subject(user_ids),
+            f"{width}x{height}:{columns or 'auto'}",
+            lambda: render_team_svg(users, width=width, height=height, columns=columns),
+            version=version,
+        )
+
+
+class PublicOrganizationSvgRenderView(PublicSvgRenderView):
+    """
+    GitHub README용 조직(owner) 전체 피시탱크 SVG 렌더
+    - 증분 유지되는 Organization 집계를 기반으로 렌더링
+    - ?budget= 로 최대 물고기 수 지정 (ORG_RENDER_FISH_BUDGET 이하)
+    """
+
+    async def get_target(self, request, login: str):
+        try:
+            organization = await Organization.objects.aget(login=login)
+        except Organization.DoesNotExist:
+            return None
+
+        width, height = size_params(request)
+        max_budget = getattr(settings, "ORG_RENDER_FISH_BUDGET", 60)
+        fish_budget = int_param(request, "budget", max_budget, 1, max_budget)
+
+        return RenderTarget(
+            organization_subject(organization.login),
+            f"{width}x{height}:{fish_budget}",
+            lambda: render_organization_svg(organization, width=width, height=height, fish_budget=fish_budget),
+            version=organization.render_version,
+        )
+
+
+class PublicHeatmapSvgRenderView(PublicSvgRenderView):
+    """
+    활동 히트맵(잔디) SVG 렌더 공통 처리
+    - DailyCommitCount 집계만 읽으므로 커밋 이력 크기와 무관하게 일정한 비용
+    - ?weeks= 로 기간 지정 (최대 53주)
+    - 날짜가 바뀌면 기간도 바뀌므로 variant에 오늘 날짜를 포함
+    """
+
+    def heatmap_target(self, request, subject, queryset, title):
+        weeks = int_param(request, "weeks", 53, 1, 53)
+        end_date = timezone.localdate()
+
+        return RenderTarget(
+            subject,
+            f"{weeks}:{end_date.isoformat()}",
+            lambda: render_heatmap_svg(
+                daily_counts(queryset, heatmap_start(end_date, weeks), end_date),
+                end_date,
+                weeks=weeks,
+                title=title,
+            ),
+        )
+
+
+class PublicUserHeatmapSvgRenderView(PublicHeatmapSvgRenderView):
+    """
+    GitHub README용 유저 활동 히트맵 (모든 레포지토리 합산)
+    """
+
+    async def get_target(self, request, username: str):
+        try:
+            user = await User.objects.aget(username=username)
+        except User.DoesNotExist:
+            return None
+
+        return self.heatmap_target(
+            request,
+            heatmap_user_subject(user.id),
+            DailyCommitCount.objects.filter(user=user),
+            user.username,
+        )
+
+
+class PublicRepositoryHeatmapSvgRenderView(PublicHeatmapSvgRenderView):
+    """
+    GitHub README용 레포지토리 활동 히트맵 (모든 작성자 합산)
+    """
+
+    async def get_target(self, request, repo_id: int):
+        try:
+            repo = await Repository.objects.aget(id=repo_id)
+        except Repository.DoesNotExist:
+            return None
+
+        return self.heatmap_target(
+            request,
+            heatmap_repository_subject(repo.id),
+            DailyCommitCount.objects.filter(repository=repo),
+            repo.full_name,
+        )
+
+
+class PublicOgImageRedirectView(View):
+    """
+    Open Graph 미리보기 카드의 고정 URL
+    - 카드 파일은 내용 해시가 들어간 정적 파일(MEDIA_URL/og/...)이므로 그 경로로 redirect
+    - 카드가 아직 생성되지 않았으면 404
+    """
+
+    async def get_card_path(self, **kwargs):
+        raise NotImplementedError
+
+    async def get(self, request, **kwargs):
+        card_path = await self.get_card_path(**kwargs)
+        if not card_path:
+            return HttpResponse(status=404)
+
+        response = HttpResponseRedirect(f"{settings.MEDIA_URL}{card_path}")
+        response["Cache-Control"] = ALIAS_CACHE_CONTROL
+        return response
+
+
+class PublicAquariumOgImageView(PublicOgImageRedirectView):
+    async def get_card_path(self, username: str):
+        return await (
+            Aquarium.objects
+            .filter(user__username=username)
+            .values_list("og_image_path", flat=True)
+            .afirst()
+        )
+
+
+class PublicRepositoryOgImageView(PublicOgImageRedirectView):
+    async def get_card_path(self, repo_id: int):
+        return await (
+            Repository.objects
+            .filter(id=repo_id)
+            .values_list("og_image_path", flat=True)
+            .afirst()
         )
-    
@@ -0,0 +1,157 @@
+# apps/repositories/activity.py
+"""
+Daily commit activity aggregate (DailyCommitCount).
+
+Every code path that stores a *new* Commit row reports it here, so activity heatmaps
+read one row per active day instead of scanning the full commit history.
+A deleted user's rows are folded into the author-less row of the same day (signals.py),
+matching the commits, which stay with author=None.
+"""
+import logging
+from collections import Counter
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from apps.repositories.models import Commit, DailyCommitCount
+
+logger = logging.getLogger(__name__)
+
+
+def commit_day(committed_at):
+    """
+    커밋 시각을 settings.TIME_ZONE 기준 날짜로 변환합니다.
+    """
+    if timezone.is_naive(committed_at):
+        committed_at = timezone.make_aware(committed_at, timezone.utc)
+    return timezone.localtime(committed_at).date()
+
+
+def heatmap_user_subject(user_id) -> str:
+    return f"heatmap:user:{user_id}"
+
+
+def heatmap_repository_subject(repo_id) -> str:
+    return f"heatmap:repo:{repo_id}"
+
+
+def record_new_commits(repository, commits):
+    """
+    새로 저장된 커밋들을 일별 집계에 반영합니다.
+
+    - commits: (author_user_id or None, committed_at) 리스트
+      (이미 있던 커밋을 다시 저장한 경우는 넣지 않아야 중복 집계되지 않음)
+    """
+    counts = Counter(
+        (user_id, commit_day(committed_at))
+        for user_id, committed_at in commits
+        if committed_at
+    )
+    if not counts:
+        return
+
+    with transaction.atomic():
+        for (user_id, day), delta in counts.items():
+            updated = DailyCommitCount.objects.filter(
+                repository=repository, user_id=user_id, date=day
+            ).update(count=F('count') + delta)
+            if not updated:
+                row, created = DailyCommitCount.objects.get_or_create(
+                    repository=repository, user_id=user_id, date=day,
+                    defaults={'count': delta},
+                )
+                if not created:
+                    DailyCommitCount.objects.filter(pk=row.pk).update(count=F('count') + delta)
+
+    _invalidate_heatmaps(repository.id, {user_id for user_id, _ in counts if user_id})
+
+
+def _invalidate_heatmaps(repo_id, user_ids):
+    # 순환 import 방지 (aquatics -> repositories)
+    from apps.aquatics.render_cache import bump_render_version
+
+    bump_render_version(heatmap_repository_subject(repo_id))
+    for user_id in user_ids:
+        bump_render_version(heatmap_user_subject(user_id))
+
+
+def detach_user_daily_counts(user_id):
+    """
+    삭제되는 유저의 일별 집계를 같은 (레포, 날짜)의 작성자 없음(NULL) 행으로 합칩니다.
+    커밋은 author=None으로 남으므로 rebuild_daily_commit_counts 결과와 같아집니다.
+    (레포 히트맵 합계는 바뀌지 않으므로 렌더 버전은 올리지 않음)
+    """
+    rows = list(DailyCommitCount.objects.filter(user_id=user_id).values_list('repository_id', 'date', 'count'))
+    if not rows:
+        return
+
+    with transaction.atomic():
+        detached = {
+            (row.repository_id, row.date): row
+            for row in DailyCommitCount.objects.select_for_update().filter(
+                user__isnull=True, repository_id__in={repo_id for repo_id, _, _ in rows}
+            )
+        }
+        updated, created = [], []
+        for repo_id, day, count in rows:
+            row = detached.get((repo_id, day))
+            if row is None:
+                created.append(DailyCommitCount(repository_id=repo_id, user=None, date=day, count=count))
+            else:
+                row.count += count
+                updated.append(row)
+        DailyCommitCount.objects.filter(user_id=user_id).delete()
+        DailyCommitCount.objects.bulk_update(updated, ['count'], batch_size=1000)
+        DailyCommitCount.objects.bulk_create(created, batch_size=1000)
+
+
+def rebuild_daily_commit_counts(repository_id=None):
+    """
+    Commit 테이블 전체를 기준으로 일별 집계를 다시 계산합니다. (최초 도입/보정용)
+    반환값: 생성된 집계 행 수
+    """
+    commits = Commit.objects.all()
+    existing = DailyCommitCount.objects.all()
+    if repository_id is not None:
+        commits = commits.filter(repository_id=repository_id)
+        existing = existing.filter(repository_id=repository_id)
+
+    rows = (
+        commits
+        .annotate(day=TruncDate('committed_at', tzinfo=timezone.get_current_timezone()))
+        .values('repository_id', 'author_id', 'day')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+
+    with transaction.atomic():
+        existing.delete()
+        created = DailyCommitCount.objects.bulk_create(
+            (
+                DailyCommitCount(
+                    repository_id=row['repository_id'],
+                    user_id=row['author_id'],
+                    date=row['day'],
+                    count=row['total'],
+                )
+                for row in rows.iterator()
+            ),
+            batch_size=1000,
+        )
+
+    logger.info(f"Rebuilt daily commit counts: {len(created)} rows (repository={repository_id or 'all'})")
+    return len(created)
+
+
+def daily_counts(queryset, start, end) -> dict:
+    """
+    집계 행에서 [start, end] 구간의 {date: 커밋 수}를 조회합니다. (저장소/유저 구분 없이 합산)
+    """
+    return dict(
+        queryset
+        .filter(date__gte=start, date__lte=end)
+        .values('date')
+        .annotate(total=Sum('count'))
+        .order_by()
+        .values_list('date', 'total')
+    )
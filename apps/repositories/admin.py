@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Repository, Contributor, Commit
+from .models import Repository, Contributor, Commit, DailyCommitCount, Organization, OrganizationMember
 
 @admin.register(Repository)
 class RepositoryAdmin(admin.ModelAdmin):
@@ -10,7 +10,7 @@ class RepositoryAdmin(admin.ModelAdmin):
     
     fieldsets = (
         ('Basic Info', {'fields': ('github_id', 'name', 'full_name', 'owner', 'html_url', 'description')}),
-        ('Stats & Sync', {'fields': ('stargazers_count', 'language', 'commit_count', 'default_branch', 'last_synced_hash', 'dirty_at', 'last_synced_at')}),
+        ('Stats & Sync', {'fields': ('stargazers_count', 'language', 'commit_count', 'default_branch', 'last_synced_hash', 'dirty_at', 'pushed_at', 'backfill_head', 'backfill_cursor', 'last_synced_at')}),
     )
 
 @admin.register(Contributor)
@@ -22,10 +22,29 @@ class ContributorAdmin(admin.ModelAdmin):
 @admin.register(Commit)
 class CommitAdmin(admin.ModelAdmin):
     list_display = ('sha_short', 'repository', 'author', 'committed_at')
-    list_filter = ('committed_at', 'repository__language')
+    # Commit은 별도 DB(commits)에 있어 repository/author를 JOIN할 수 없음 (행마다 default DB에서 조회)
+    list_filter = ('committed_at',)
+    list_select_related = ()
     search_fields = ('sha', 'message', 'author_name', 'author_email')
     readonly_fields = ('committed_at',)
 
     def sha_short(self, obj):
         return obj.sha[:7]
-    sha_short.short_description = 'SHA'
\ No newline at end of file
+    sha_short.short_description = 'SHA'
+
+@admin.register(DailyCommitCount)
+class DailyCommitCountAdmin(admin.ModelAdmin):
+    list_display = ('repository', 'user', 'date', 'count')
+    list_filter = ('date',)
+    search_fields = ('repository__full_name', 'user__username')
+
+@admin.register(Organization)
+class OrganizationAdmin(admin.ModelAdmin):
+    list_display = ('login', 'member_count', 'fish_count', 'commit_count', 'updated_at')
+    search_fields = ('login',)
+    readonly_fields = ('updated_at',)
+
+@admin.register(OrganizationMember)
+class OrganizationMemberAdmin(admin.ModelAdmin):
+    list_display = ('organization', 'user', 'commit_count', 'repository_count', 'fish_count')
+    search_fields = ('organization__login', 'user__username')
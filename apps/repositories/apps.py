@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class RepositoriesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.repositories'
+
+    def ready(self):
+        # Commit 이력 DB로 삭제 전파 (db_router 참고)
+        from apps.repositories import signals  # noqa: F401
@@ -0,0 +1,112 @@
+# apps/repositories/ingest.py
+"""
+Batched commit ingestion shared by the full sync and the push webhook.
+
+Commits are consumed from any iterable (for example a lazily paged GitHub
+history) in batches of COMMIT_INGEST_BATCH_SIZE. Each batch costs a fixed
+number of queries:
+
+- one User query that resolves every author in the batch. The full sync
+  matches by GitHub id only; the push webhook (which has no id) resolves
+  its authors itself by username, then email (AUTHOR_MATCH_WEBHOOK);
+- one query for the SHAs that are already stored, which tells new commits
+  apart for the daily activity aggregate;
+- one INSERT ... ON CONFLICT(sha) DO UPDATE (bulk_create(update_conflicts=True)).
+
+Ingesting 10,000 commits therefore takes tens of queries instead of one
+update_or_create plus one author lookup per commit.
+"""
+from itertools import islice
+from django.conf import settings
+from django.db.models import Q
+from apps.repositories.models import Commit
+from apps.users.models import User
+
+COMMIT_INGEST_BATCH_SIZE = getattr(settings, 'COMMIT_INGEST_BATCH_SIZE', 500)
+
+# 이미 있는 커밋(sha 충돌)일 때 덮어쓸 필드 (기존 update_or_create의 defaults와 같음)
+COMMIT_UPDATE_FIELDS = ['repository', 'author', 'message', 'committed_at', 'author_name', 'author_email']
+
+# 작성자 매칭 기준 (우선순위 순) - 커밋 dict 키: User 필드
+# 동기화는 GitHub id로만 매칭 (email은 검증되지 않은 값이라 다른 유저로 오인될 수 있음)
+AUTHOR_MATCH_SYNC = (('author_github_id', 'github_id'),)
+# 웹훅 payload에는 id가 없으므로 username → email
+AUTHOR_MATCH_WEBHOOK = (('author_username', 'github_username'), ('author_email', 'email'))
+
+
+def ingest_commits(repository, commits, batch_size=None) -> list:
+    """
+    커밋 dict들을 배치 단위로 저장(upsert)합니다.
+
+    - commits: {'sha', 'message', 'committed_at', 'author_name', 'author_email',
+      'author_github_id'(선택)} 의 iterable
+      (모든 커밋에 'author'(User or None)가 이미 있으면 작성자 조회를 생략, 없으면 GitHub id로만 매칭)
+    - 반환값: 새로 저장된 커밋의 (author_user_id or None, committed_at) 리스트 (record_new_commits 입력)
+    """
+    batch_size = batch_size or COMMIT_INGEST_BATCH_SIZE
+    iterator = iter(commits)
+    new_commits = []
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return new_commits
+        new_commits.extend(_ingest_batch(repository, batch))
+
+
+def resolve_authors(commits, match_by=AUTHOR_MATCH_SYNC) -> list:
+    """
+    커밋마다 우리 서비스 유저(없으면 None)를 찾습니다. 배치 전체에 User 쿼리 1회
+    match_by: (커밋 dict 키, User 필드) 의 우선순위 목록 (AUTHOR_MATCH_SYNC / AUTHOR_MATCH_WEBHOOK)
+    """
+    query_filter = Q()
+    for commit_key, user_field in match_by:
+        values = {c[commit_key] for c in commits if c.get(commit_key)}
+        if values:
+            query_filter |= Q(**{f'{user_field}__in': values})
+    if not query_filter:
+        return [None] * len(commits)
+
+    users = list(User.objects.filter(query_filter))
+    lookups = [
+        (commit_key, {getattr(u, user_field): u for u in users if getattr(u, user_field)})
+        for commit_key, user_field in match_by
+    ]
+
+    def resolve(commit):
+        for commit_key, by_value in lookups:
+            user = by_value.get(commit.get(commit_key))
+            if user:
+                return user
+        return None
+
+    return [resolve(c) for c in commits]
+
+
+def _ingest_batch(repository, batch) -> list:
+    # 같은 배치 안의 중복 sha는 마지막 값만 사용
+    batch = list({c['sha']: c for c in batch}.values())
+    if all('author' in c for c in batch):
+        authors = [c['author'] for c in batch]
+    else:
+        authors = resolve_authors(batch)
+    existing = set(Commit.objects.filter(sha__in=[c['sha'] for c in batch]).values_list('sha', flat=True))
+
+    rows = [
+        Commit(
+            sha=c['sha'],
+            repository=repository,
+            author=author,
+            message=c.get('message') or '',
+            committed_at=c['committed_at'],
+            author_name=c.get('author_name') or '',
+            author_email=c.get('author_email') or '',
+        )
+        for c, author in zip(batch, authors)
+    ]
+    Commit.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['sha'],
+        update_fields=COMMIT_UPDATE_FIELDS,
+    )
+    return [(row.author_id, row.committed_at) for row in rows if row.sha not in existing]
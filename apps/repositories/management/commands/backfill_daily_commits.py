@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from apps.repositories.activity import rebuild_daily_commit_counts
+
+
+class Command(BaseCommand):
+    help = 'Commit 테이블 기준으로 일별 커밋 집계(DailyCommitCount)를 다시 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repo', type=int, help='특정 레포지토리(id)만 다시 계산')
+
+    def handle(self, *args, **options):
+        count = rebuild_daily_commit_counts(repository_id=options.get('repo'))
+        self.stdout.write(self.style.SUCCESS(f'=== 일별 커밋 집계 재계산 완료: {count}행 ==='))
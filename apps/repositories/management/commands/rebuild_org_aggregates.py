@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from apps.repositories.organizations import rebuild_organization_aggregates
+
+
+class Command(BaseCommand):
+    help = 'Contributor/ContributionFish 기준으로 조직(Organization) 집계를 다시 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--org', help='특정 조직(owner login)만 다시 계산')
+
+    def handle(self, *args, **options):
+        count = rebuild_organization_aggregates(login=options.get('org'))
+        self.stdout.write(self.style.SUCCESS(f'=== 조직 집계 재계산 완료: {count}개 ==='))
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from django_q.models import OrmQ, Schedule
+from apps.repositories.models import Commit
+from GithubAquarium.db_router import COMMITS_DB, DEFAULT_DB, QUEUE_DB
+
+BATCH_SIZE = 2000
+
+
+class Command(BaseCommand):
+    help = (
+        'DB 분리(db_router) 이전 db.sqlite3에 있던 커밋 이력과 django-q 대기 작업/스케줄을 '
+        'commits / queue DB로 복사합니다. (먼저 migrate --database commits / queue 실행, 대상이 비어 있을 때만 복사)'
+    )
+
+    def handle(self, *args, **options):
+        for model, target in ((Commit, COMMITS_DB), (OrmQ, QUEUE_DB), (Schedule, QUEUE_DB)):
+            copied = self._copy(model, target)
+            if copied is not None:
+                self.stdout.write(self.style.SUCCESS(f'=== {model._meta.label}: {copied}개 복사 → {target} ==='))
+
+    def _copy(self, model, target):
+        table = model._meta.db_table
+        if table not in connections[DEFAULT_DB].introspection.table_names():
+            self.stdout.write(f'{table}: {DEFAULT_DB}에 테이블이 없어 건너뜁니다.')
+            return None
+        if model.objects.using(target).exists():
+            self.stdout.write(self.style.WARNING(f'{table}: {target}에 이미 데이터가 있어 건너뜁니다.'))
+            return None
+
+        copied = 0
+        source = model.objects.using(DEFAULT_DB).order_by('pk')
+        last_pk = None
+        with transaction.atomic(using=target):
+            while True:
+                batch = source if last_pk is None else source.filter(pk__gt=last_pk)
+                rows = list(batch[:BATCH_SIZE])
+                if not rows:
+                    break
+                model.objects.using(target).bulk_create(rows, batch_size=BATCH_SIZE)
+                copied += len(rows)
+                last_pk = rows[-1].pk
+        return copied
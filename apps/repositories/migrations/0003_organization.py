@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:13
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('repositories', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Organization',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('login', models.CharField(max_length=255, unique=True)),
+                ('member_count', models.PositiveIntegerField(default=0)),
+                ('fish_count', models.PositiveIntegerField(default=0)),
+                ('commit_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='OrganizationMember',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('commit_count', models.IntegerField(default=0)),
+                ('repository_count', models.PositiveIntegerField(default=0)),
+                ('fish_count', models.PositiveIntegerField(default=0)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='members', to='repositories.organization')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='organization_memberships', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['organization', '-commit_count'], name='repositorie_organiz_a5658f_idx')],
+                'unique_together': {('organization', 'user')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('repositories', '0003_organization'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='repository',
+            name='og_image_path',
+            field=models.CharField(blank=True, max_length=512),
+        ),
+    ]
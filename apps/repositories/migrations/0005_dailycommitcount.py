@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:24
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('repositories', '0004_repository_og_image_path'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyCommitCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('repository', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_commit_counts', to='repositories.repository')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='daily_commit_counts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'date'], name='repositorie_user_id_feacb8_idx'), models.Index(fields=['repository', 'date'], name='repositorie_reposit_726a6e_idx')],
+                'unique_together': {('repository', 'user', 'date')},
+            },
+        ),
+    ]
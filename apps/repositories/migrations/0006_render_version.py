@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('repositories', '0005_dailycommitcount'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='repository',
+            name='fish_version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:39
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('repositories', '0006_render_version'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='commit',
+            name='author',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='commits', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='commit',
+            name='repository',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='commits', to='repositories.repository'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('repositories', '0007_commit_history_database'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='repository',
+            name='pushed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('repositories', '0008_repository_pushed_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='repository',
+            name='backfill_cursor',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='repository',
+            name='backfill_head',
+            field=models.CharField(blank=True, max_length=40, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('repositories', '0009_repository_backfill_cursor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organization',
+            name='render_version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:23
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('repositories', '0010_organization_render_version'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dailycommitcount',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='daily_commit_counts', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -58,6 +58,23 @@ class Repository(models.Model):
     # by webhook
     dirty_at = models.DateTimeField(null=True, blank=True)
 
+    # GitHub pushed_at as of the last fully successful sync. A full sync skips the
+    # repository while the listed pushed_at is not newer and it is not dirty.
+    pushed_at = models.DateTimeField(null=True, blank=True)
+
+    # First-sync history backfill in progress: the head commit the backfill walks from
+    # and the GraphQL history cursor after the last committed chunk. Both are cleared
+    # once last_synced_hash is set.
+    backfill_head = models.CharField(max_length=40, null=True, blank=True)
+    backfill_cursor = models.CharField(max_length=255, null=True, blank=True)
+
+    # Relative path to the generated Open Graph preview card (content-hashed PNG).
+    og_image_path = models.CharField(max_length=512, blank=True)
+
+    # Monotonic counter bumped (via F()) whenever this repository's fish set changes
+    # (contributors, commit counts, species, visibility). Part of every fishtank's render input.
+    fish_version = models.PositiveBigIntegerField(default=0)
+
     def __str__(self):
         return self.full_name
 
@@ -93,18 +110,26 @@ class Contributor(models.Model):
 class Commit(models.Model):
     """
     Stores information about a single commit in a specific repository.
+
+    Lives in the separate 'commits' database (see GithubAquarium/db_router.py), so its
+    foreign keys carry no DB constraint and deletions are propagated by
+    apps/repositories/signals.py instead of the ORM collector.
     """
     # The repository this commit belongs to.
+    # Commits are deleted with the repository (signals.delete_repository_commits).
     repository = models.ForeignKey(
         Repository,
-        on_delete=models.CASCADE,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
         related_name='commits'
     )
     
     # The author of the commit, if they are a user of this application.
+    # Keep the commit record even if the author's account is deleted (signals.detach_author_commits).
     author = models.ForeignKey(
         User,
-        on_delete=models.SET_NULL, # Keep the commit record even if the author's account is deleted.
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
         null=True,
         blank=True,
         related_name='commits' 
@@ -125,4 +150,99 @@ class Commit(models.Model):
     author_email = models.EmailField()
 
     def __str__(self):
-        return f"{self.sha[:7]} - {self.repository.name}"
\ No newline at end of file
+        return f"{self.sha[:7]} - {self.repository.name}"
+
+
+class DailyCommitCount(models.Model):
+    """
+    Number of commits per (repository, author, day).
+    Maintained incrementally whenever a new Commit row is stored, so activity
+    heatmaps read this small aggregate instead of scanning the Commit table.
+    """
+    repository = models.ForeignKey(
+        Repository,
+        on_delete=models.CASCADE,
+        related_name='daily_commit_counts'
+    )
+    # Null when the commit author is not a user of this application
+    # (or was deleted: their rows are folded into the null-user row, like Commit.author).
+    user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='daily_commit_counts'
+    )
+    # Local date (settings.TIME_ZONE) of Commit.committed_at.
+    date = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('repository', 'user', 'date')
+        indexes = [
+            # Per-user heatmap (summed across repositories).
+            models.Index(fields=['user', 'date']),
+            # Per-repository heatmap.
+            models.Index(fields=['repository', 'date']),
+        ]
+
+    def __str__(self):
+        return f"{self.repository.name} {self.date}: {self.count}"
+
+
+class Organization(models.Model):
+    """
+    Aggregate of every repository whose full_name is under a given owner login
+    (e.g. "FishTankManager/..."). Maintained incrementally from the same code paths
+    that change Contributor.commit_count, so org-wide tanks never scan Contributor.
+    """
+    # The owner part of Repository.full_name (organization or user login).
+    login = models.CharField(max_length=255, unique=True)
+
+    # --- Incrementally maintained aggregates ---
+    member_count = models.PositiveIntegerField(default=0)
+    fish_count = models.PositiveIntegerField(default=0)
+    commit_count = models.IntegerField(default=0)
+
+    # Monotonic counter bumped (via F()) whenever the org-wide tank's input changes:
+    # the aggregates above, or the fish set of any repository under this login
+    # (species, visibility). Cache version of the public org render.
+    render_version = models.PositiveBigIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.login
+
+class OrganizationMember(models.Model):
+    """
+    Per-organization summary of a user's contributions across all of its repositories.
+    """
+    organization = models.ForeignKey(
+        Organization,
+        on_delete=models.CASCADE,
+        related_name='members'
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='organization_memberships'
+    )
+
+    # Sum of Contributor.commit_count over the organization's repositories.
+    commit_count = models.IntegerField(default=0)
+    # Number of the organization's repositories this user contributes to.
+    repository_count = models.PositiveIntegerField(default=0)
+    # Number of ContributionFish this user owns in the organization's repositories.
+    fish_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('organization', 'user')
+        indexes = [
+            # Fish budget selection: top members of an organization by commits.
+            models.Index(fields=['organization', '-commit_count']),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} in {self.organization.login}"
+
@@ -0,0 +1,170 @@
+# apps/repositories/organizations.py
+"""
+Organization-level aggregates (Organization / OrganizationMember).
+
+Every code path that changes Contributor.commit_count or creates a ContributionFish
+reports the delta here, so org-wide tanks read a small aggregate instead of scanning
+Contributor and ContributionFish for every repository under the owner. Deleting a
+Contributor or ContributionFish (directly, or through a Repository/User cascade)
+is reported from apps/repositories/signals.py.
+
+Every aggregate update also bumps Organization.render_version, the cache version of
+the public org render (fish changes are bumped from apps/aquatics/versioning.py).
+"""
+import logging
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from apps.repositories.models import Contributor, Organization, OrganizationMember
+
+logger = logging.getLogger(__name__)
+
+
+def owner_login(full_name: str) -> str:
+    """
+    "owner/name" -> "owner"
+    """
+    return (full_name or "").split('/', 1)[0]
+
+
+def _get_member(repository, user):
+    organization, _ = Organization.objects.get_or_create(login=owner_login(repository.full_name))
+    member, created = OrganizationMember.objects.get_or_create(organization=organization, user=user)
+    if created:
+        Organization.objects.filter(pk=organization.pk).update(
+            member_count=F('member_count') + 1,
+            render_version=F('render_version') + 1,
+            updated_at=timezone.now(),
+        )
+    return organization, member
+
+
+def _decrement(field):
+    # 집계가 이미 어긋나 있어도 음수(Positive 필드 제약 위반)가 되지 않도록
+    return Greatest(F(field) - 1, 0)
+
+
+def apply_contribution_change(repository, user, commit_delta=0, new_contributor=False):
+    """
+    Contributor.commit_count 변경분을 조직 집계에 반영합니다.
+
+    - commit_delta: 이번에 바뀐 커밋 수 (force push 등으로 음수일 수 있음)
+    - new_contributor: 이번에 Contributor 레코드가 새로 생성되었는지
+    """
+    if not commit_delta and not new_contributor:
+        return
+
+    organization, member = _get_member(repository, user)
+
+    OrganizationMember.objects.filter(pk=member.pk).update(
+        commit_count=F('commit_count') + commit_delta,
+        repository_count=F('repository_count') + (1 if new_contributor else 0),
+    )
+    Organization.objects.filter(pk=organization.pk).update(
+        commit_count=F('commit_count') + commit_delta,
+        render_version=F('render_version') + 1,
+        updated_at=timezone.now(),
+    )
+
+
+def apply_fish_created(contributor):
+    """
+    새 ContributionFish가 생성되었을 때 조직 물고기 수를 증가시킵니다.
+    """
+    organization, member = _get_member(contributor.repository, contributor.user)
+
+    OrganizationMember.objects.filter(pk=member.pk).update(fish_count=F('fish_count') + 1)
+    Organization.objects.filter(pk=organization.pk).update(
+        fish_count=F('fish_count') + 1,
+        render_version=F('render_version') + 1,
+        updated_at=timezone.now(),
+    )
+
+
+def apply_contributor_removed(contributor):
+    """
+    Contributor가 삭제될 때 조직 집계에서 커밋 수와 레포 수를 빼고,
+    멤버의 마지막 레포였다면 멤버를 제거합니다. (물고기 수는 apply_fish_removed)
+    """
+    organization = Organization.objects.filter(login=owner_login(contributor.repository.full_name)).first()
+    if organization is None:
+        return
+    member = OrganizationMember.objects.filter(organization=organization, user_id=contributor.user_id).first()
+    if member is None:
+        return
+
+    if member.repository_count <= 1:
+        member.delete()
+        member_delta = {'member_count': _decrement('member_count')}
+    else:
+        OrganizationMember.objects.filter(pk=member.pk).update(
+            commit_count=F('commit_count') - contributor.commit_count,
+            repository_count=_decrement('repository_count'),
+        )
+        member_delta = {}
+    Organization.objects.filter(pk=organization.pk).update(
+        commit_count=F('commit_count') - contributor.commit_count,
+        render_version=F('render_version') + 1,
+        updated_at=timezone.now(),
+        **member_delta,
+    )
+
+
+def apply_fish_removed(contributor):
+    """
+    ContributionFish가 삭제될 때 조직 물고기 수를 감소시킵니다.
+    """
+    login = owner_login(contributor.repository.full_name)
+    OrganizationMember.objects.filter(organization__login=login, user_id=contributor.user_id).update(
+        fish_count=_decrement('fish_count')
+    )
+    Organization.objects.filter(login=login).update(
+        fish_count=_decrement('fish_count'),
+        render_version=F('render_version') + 1,
+        updated_at=timezone.now(),
+    )
+
+
+def rebuild_organization_aggregates(login=None):
+    """
+    Contributor / ContributionFish 기준으로 조직 집계를 처음부터 다시 계산합니다.
+    (최초 도입, 레포지토리 이름 변경/이전 등으로 집계가 어긋났을 때 사용)
+    """
+    contributors = Contributor.objects.values(
+        'user_id', 'commit_count', 'repository__full_name', 'contribution_fish__id'
+    )
+    if login:
+        contributors = contributors.filter(repository__full_name__startswith=f"{login}/")
+
+    totals = {}
+    for row in contributors.iterator():
+        org_login = owner_login(row['repository__full_name'])
+        member = totals.setdefault(org_login, {}).setdefault(
+            row['user_id'], {'commit_count': 0, 'repository_count': 0, 'fish_count': 0}
+        )
+        member['commit_count'] += row['commit_count']
+        member['repository_count'] += 1
+        member['fish_count'] += 1 if row['contribution_fish__id'] else 0
+
+    with transaction.atomic():
+        stale = Organization.objects.all()
+        if login:
+            stale = stale.filter(login=login)
+        stale.exclude(login__in=list(totals)).delete()
+
+        for org_login, members in totals.items():
+            organization, _ = Organization.objects.get_or_create(login=org_login)
+            organization.members.exclude(user_id__in=list(members)).delete()
+            for user_id, values in members.items():
+                OrganizationMember.objects.update_or_create(
+                    organization=organization, user_id=user_id, defaults=values
+                )
+            organization.member_count = len(members)
+            organization.commit_count = sum(v['commit_count'] for v in members.values())
+            organization.fish_count = sum(v['fish_count'] for v in members.values())
+            organization.render_version += 1
+            organization.save()
+
+    logger.info(f"Rebuilt aggregates for {len(totals)} organization(s).")
+    return len(totals)
@@ -0,0 +1,40 @@
+# apps/repositories/signals.py
+"""
+Propagate deletions into the separate commit history database and the organization aggregates.
+
+Commit lives in the 'commits' database, and Django's deletion collector only looks at the
+database of the object being deleted, so the CASCADE / SET_NULL behaviour of
+Commit.repository / Commit.author is applied here explicitly. The daily activity aggregate
+of a deleted author is moved to the author-less rows in the same step.
+
+Contributor / ContributionFish deletions (including cascades from Repository and User)
+are subtracted from Organization / OrganizationMember in pre_delete, while the related
+rows still exist.
+"""
+from django.conf import settings
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+from apps.repositories.activity import detach_user_daily_counts
+from apps.repositories.models import Commit, Contributor, Repository
+from apps.repositories.organizations import apply_contributor_removed, apply_fish_removed
+
+
+@receiver(pre_delete, sender=Repository)
+def delete_repository_commits(sender, instance, **kwargs):
+    Commit.objects.filter(repository_id=instance.pk).delete()
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def detach_author_commits(sender, instance, **kwargs):
+    Commit.objects.filter(author_id=instance.pk).update(author=None)
+    detach_user_daily_counts(instance.pk)
+
+
+@receiver(pre_delete, sender=Contributor)
+def remove_contributor_from_organization(sender, instance, **kwargs):
+    apply_contributor_removed(instance)
+
+
+@receiver(pre_delete, sender='aquatics.ContributionFish')
+def remove_fish_from_organization(sender, instance, **kwargs):
+    apply_fish_removed(instance.contributor)
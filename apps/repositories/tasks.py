@@ -4,8 +4,13 @@ from datetime import datetime
 from dateutil.parser import parse as parse_datetime
 from django.utils import timezone
 from django.utils.timezone import make_aware, is_naive
-from django.db.models import F, Q
-from apps.repositories.models import Repository, Commit, Contributor
+from collections import Counter
+from django.db.models import F
+from apps.repositories.models import Repository, Contributor
+from apps.repositories.ingest import ingest_commits, resolve_authors, AUTHOR_MATCH_WEBHOOK
+from apps.repositories.organizations import apply_contribution_change
+from apps.repositories.activity import record_new_commits
+from apps.aquatics.versioning import bump_contribution_versions
 from apps.users.models import User
 
 logger = logging.getLogger(__name__)
@@ -138,65 +143,46 @@ def _handle_push_event(payload):
     if not commits:
         return
 
-    # [수정/최적화] Bulk 처리를 위해 관련된 유저들을 미리 조회 (username OR email)
-    author_usernames = set()
-    author_emails = set()
-
-    for c in commits:
-        author = c.get('author', {})
-        if author:
-            if author.get('username'):
-                author_usernames.add(author['username'])
-            if author.get('email'):
-                author_emails.add(author['email'])
-    
-    # DB에 존재하는 유저만 매핑 (Shell User 생성 안함)
-    # Q 객체를 사용하여 username 또는 email 중 하나라도 일치하면 조회
-    query_filter = Q()
-    if author_usernames:
-        query_filter |= Q(github_username__in=author_usernames)
-    if author_emails:
-        query_filter |= Q(email__in=author_emails)
-
-    # 쿼리 수행
-    existing_users = User.objects.filter(query_filter)
-    
-    # 빠른 조회를 위한 매핑 테이블 생성
-    user_map_by_username = {u.github_username: u for u in existing_users if u.github_username}
-    user_map_by_email = {u.email: u for u in existing_users if u.email}
-
-    for commit_data in commits:
-        author_info = commit_data.get('author', {})
-        username = author_info.get('username')
-        email = author_info.get('email')
-        
-        # 1순위: username 매칭, 2순위: email 매칭
-        commit_author = user_map_by_username.get(username)
-        if not commit_author and email:
-             commit_author = user_map_by_email.get(email)
-        
-        # 4-1. Commit 생성/업데이트
-        Commit.objects.update_or_create(
-            sha=commit_data['id'],
-            defaults={
-                'repository': repository,
-                'author': commit_author,
-                'message': commit_data.get('message', ''),
-                'committed_at': _parse_date(commit_data.get('timestamp')),
-                'author_name': author_info.get('name', ''),
-                'author_email': author_info.get('email', ''),
-            }
+    rows = [
+        {
+            'sha': commit_data['id'],
+            'message': commit_data.get('message', ''),
+            'committed_at': _parse_date(commit_data.get('timestamp')),
+            'author_name': (commit_data.get('author') or {}).get('name', ''),
+            'author_email': (commit_data.get('author') or {}).get('email', ''),
+            # 1순위: username 매칭, 2순위: email 매칭 (DB에 존재하는 유저만, Shell User 생성 안함)
+            'author_username': (commit_data.get('author') or {}).get('username'),
+        }
+        for commit_data in commits
+    ]
+
+    # 작성자 매핑은 Contributor 갱신에도 쓰므로 한 번만 조회해 커밋에 담아 둠
+    for row, commit_author in zip(rows, resolve_authors(rows, match_by=AUTHOR_MATCH_WEBHOOK)):
+        row['author'] = commit_author
+
+    # 4-1. Commit 생성/업데이트 (upsert 1회 / 배치)
+    # 새로 저장된 커밋만 일별 집계에 반영 [(author_id, committed_at)]
+    new_commits = ingest_commits(repository, rows)
+
+    # 4-2. Contributor 업데이트 (중요: 리스트 뷰 즉시 반영을 위해) - 작성자별로 모아서 1회씩
+    commit_counts = Counter(row['author'] for row in rows if row['author'])
+
+    # 조직 집계는 유저 단위로 모아서 한 번에 반영 {user_id: [user, commit_delta, new_contributor]}
+    org_changes = {}
+    for commit_author, commit_delta in commit_counts.items():
+        contributor, created = Contributor.objects.get_or_create(
+            repository=repository,
+            user=commit_author,
+            defaults={'commit_count': 0}
         )
+        # F 객체를 사용하여 Race Condition 최소화하며 카운트 증가
+        Contributor.objects.filter(pk=contributor.pk).update(commit_count=F('commit_count') + commit_delta)
+        org_changes[commit_author.id] = [commit_author, commit_delta, created]
+
+    for commit_author, commit_delta, new_contributor in org_changes.values():
+        apply_contribution_change(repository, commit_author, commit_delta=commit_delta, new_contributor=new_contributor)
+        bump_contribution_versions(repository.id, commit_author.id)
 
-        # 4-2. Contributor 업데이트 (중요: 리스트 뷰 즉시 반영을 위해)
-        if commit_author:
-            contributor, _ = Contributor.objects.get_or_create(
-                repository=repository,
-                user=commit_author,
-                defaults={'commit_count': 0}
-            )
-            # F 객체를 사용하여 Race Condition 최소화하며 카운트 증가
-            contributor.commit_count = F('commit_count') + 1
-            contributor.save()
+    record_new_commits(repository, new_commits)
 
     logger.info(f"Processed push event for {repository.full_name} (Marked dirty at {repository.dirty_at})")
\ No newline at end of file
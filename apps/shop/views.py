@@ -9,7 +9,7 @@ from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 import random
 import logging
-from django_q.tasks import async_task
+from GithubAquarium.task_queue import enqueue_debounced, LANE_INTERACTIVE, SHED_RENDER
 
 from .models import Item, UserCurrency, UserInventory, PointLog
 from .serializers import (
@@ -19,6 +19,7 @@ from .serializers import (
     PurchaseRequestSerializer
 )
 from apps.aquatics.models import OwnBackground, ContributionFish
+from apps.aquatics.versioning import bump_contribution_versions
 from apps.items.models import FishSpecies
 
 logger = logging.getLogger(__name__)
@@ -124,8 +125,9 @@ class UseRerollTicketView(APIView):
                 target_fish.save()
                 inventory_item.quantity -= 1
                 inventory_item.save()
-            async_task('apps.aquatics.tasks.generate_aquarium_svg_task', user.id)
-            async_task('apps.aquatics.tasks.generate_fishtank_svg_task', repo_id, user.id)
+                bump_contribution_versions(target_fish.contributor.repository_id, user.id)
+            enqueue_debounced('apps.aquatics.tasks.generate_aquarium_svg_task', user.id, lane=LANE_INTERACTIVE, shed=SHED_RENDER, defer=True)
+            enqueue_debounced('apps.aquatics.tasks.generate_fishtank_svg_task', repo_id, user.id, lane=LANE_INTERACTIVE, shed=SHED_RENDER, defer=True)
             return Response({"detail": "리롤 성공", "new_species": new_species.name})
         except Exception as e:
             return Response({"detail": "오류 발생"}, status=500)
\ No newline at end of file
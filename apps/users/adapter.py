@@ -7,7 +7,7 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.sites.shortcuts import get_current_site
 from django.db import transaction  # 트랜잭션 관리 추가
-from django_q.tasks import async_task
+from GithubAquarium.task_queue import enqueue, LANE_BULK
 from allauth.socialaccount.adapter import DefaultSocialAccountAdapter
 from allauth.socialaccount.models import SocialApp
 from github import Github
@@ -101,11 +101,12 @@ class CustomSocialAccountAdapter(DefaultSocialAccountAdapter):
 
             # 4. Task Queue에 작업 등록 (트랜잭션 커밋 후 실행 보장)
             # 이렇게 해야 Worker가 DB에서 user를 찾을 때 DoesNotExist 에러가 발생하지 않음
-            transaction.on_commit(lambda: async_task(
+            transaction.on_commit(lambda: enqueue(
                 'apps.users.tasks.sync_github_data_task', # 실행할 함수 경로
                 user.id,                                    # 인자 1: 유저 ID
                 access_token,                               # 인자 2: 토큰
-                task_name=f'sync_user_{user.id}'            # 작업 이름
+                task_name=f'sync_user_{user.id}',           # 작업 이름
+                lane=LANE_BULK,                             # 오래 걸리는 전체 동기화는 bulk 레인
             ))
             
             logger.info(f"Queued async sync task for user {user.username} (on commit)")
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import User
+from .models import SyncRun, User
 
 @admin.register(User)
 class CustomUserAdmin(UserAdmin):
@@ -17,4 +17,12 @@ class CustomUserAdmin(UserAdmin):
     add_fieldsets = UserAdmin.add_fieldsets + (
         ('GitHub Information', {'fields': ('github_id', 'github_username', 'avatar_url')}),
     )
-    ordering = ('-date_joined',)
\ No newline at end of file
+    ordering = ('-date_joined',)
+
+@admin.register(SyncRun)
+class SyncRunAdmin(admin.ModelAdmin):
+    # 유저별 전체 동기화(레포 단위 하위 작업 그룹) 진행 상황
+    list_display = ('group', 'user', 'total', 'remaining', 'failed', 'skipped', 'started_at', 'finished_at')
+    list_select_related = ('user',)
+    search_fields = ('group', 'user__username')
+    readonly_fields = ('group', 'user', 'total', 'remaining', 'failed', 'skipped', 'started_at', 'finished_at')
@@ -0,0 +1,278 @@
+# apps/users/github_graphql.py
+"""
+Batched GitHub GraphQL fetch layer for the full sync.
+
+A single viewer query returns, for up to GITHUB_GRAPHQL_REPOSITORY_PAGE_SIZE
+repositories at a time, the repository metadata, the default-branch commit
+count and the first page of default-branch history. Before this module, the
+sync needed several REST calls per repository: the repository itself,
+get_commits, totalCount and commits[0]. Deeper history is paged per repository
+with fetch_history(), starting at the cursor returned by the previous page.
+The first-sync backfill pages with fetch_commit_history() instead. It walks
+from a fixed commit, so a stored cursor stays valid after new pushes.
+
+Results are plain dicts (RepositorySnapshot / commit dicts), so they can be
+passed to django-q subtasks as they are. The endpoint comes from
+settings.GITHUB_GRAPHQL_URL and can point at a local stub server.
+
+Requests are paced per token by rate_limit.RateLimiter (GraphQL has its own
+budget). Rate-limit responses, including RATE_LIMITED errors, raise
+RateLimitPaused. Other errors are raised as GithubException subclasses with
+the HTTP status, so the existing handling in apps/users/tasks.py still applies.
+Contributor counts have no GraphQL equivalent and stay on REST.
+"""
+import logging
+import requests
+from django.conf import settings
+from django.utils.dateparse import parse_datetime
+from github import GithubException
+from apps.users.rate_limit import RESOURCE_GRAPHQL, RateLimiter, RateLimitPaused
+
+logger = logging.getLogger(__name__)
+
+GITHUB_GRAPHQL_URL = getattr(settings, 'GITHUB_GRAPHQL_URL', 'https://api.github.com/graphql')
+GITHUB_GRAPHQL_TIMEOUT = getattr(settings, 'GITHUB_GRAPHQL_TIMEOUT', 30)
+# 목록 1페이지(요청 1회)에 담을 레포 수 / 레포마다 함께 가져올 첫 커밋 페이지 크기
+GITHUB_GRAPHQL_REPOSITORY_PAGE_SIZE = getattr(settings, 'GITHUB_GRAPHQL_REPOSITORY_PAGE_SIZE', 25)
+GITHUB_GRAPHQL_HISTORY_PAGE_SIZE = getattr(settings, 'GITHUB_GRAPHQL_HISTORY_PAGE_SIZE', 50)
+# fetch_history() 1회의 커밋 수 (GraphQL connection 최대값)
+GITHUB_GRAPHQL_HISTORY_MAX_PAGE_SIZE = 100
+
+# REST get_repos(affiliation='owner,collaborator,organization_member') 와 같은 범위
+REPOSITORY_AFFILIATIONS = ['OWNER', 'COLLABORATOR', 'ORGANIZATION_MEMBER']
+
+_HISTORY_FIELDS = """
+    totalCount
+    pageInfo { hasNextPage endCursor }
+    nodes {
+        oid
+        message
+        authoredDate
+        author { name email user { databaseId } }
+    }
+"""
+
+VIEWER_REPOSITORIES_QUERY = """
+query($first: Int!, $after: String, $historySize: Int!, $affiliations: [RepositoryAffiliation]) {
+    viewer {
+        repositories(
+            first: $first, after: $after,
+            affiliations: $affiliations, ownerAffiliations: $affiliations,
+            orderBy: {field: PUSHED_AT, direction: DESC}
+        ) {
+            pageInfo { hasNextPage endCursor }
+            nodes {
+                databaseId
+                id
+                name
+                nameWithOwner
+                description
+                url
+                stargazerCount
+                primaryLanguage { name }
+                createdAt
+                updatedAt
+                pushedAt
+                owner { ... on User { databaseId } ... on Organization { databaseId } }
+                defaultBranchRef {
+                    name
+                    target { ... on Commit { history(first: $historySize) { %s } } }
+                }
+            }
+        }
+    }
+}
+""" % _HISTORY_FIELDS
+
+HISTORY_QUERY = """
+query($id: ID!, $branch: String!, $first: Int!, $after: String) {
+    node(id: $id) {
+        ... on Repository {
+            ref(qualifiedName: $branch) {
+                target { ... on Commit { history(first: $first, after: $after) { %s } } }
+            }
+        }
+    }
+}
+""" % _HISTORY_FIELDS
+
+COMMIT_HISTORY_QUERY = """
+query($id: ID!, $oid: GitObjectID!, $first: Int!, $after: String) {
+    node(id: $id) {
+        ... on Repository {
+            object(oid: $oid) { ... on Commit { history(first: $first, after: $after) { %s } } }
+        }
+    }
+}
+""" % _HISTORY_FIELDS
+
+
+class GraphQLError(GithubException):
+    """
+    GraphQL 응답의 errors (RATE_LIMITED 제외)
+    """
+
+
+class GithubGraphQL:
+    """
+    토큰 1개에 대한 GraphQL 클라이언트 (requests.Session 재사용)
+    """
+
+    def __init__(self, access_token, endpoint=None, timeout=None):
+        self.endpoint = endpoint or GITHUB_GRAPHQL_URL
+        self.timeout = timeout or GITHUB_GRAPHQL_TIMEOUT
+        self.limiter = RateLimiter(access_token, RESOURCE_GRAPHQL)
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Authorization': f"bearer {access_token}",
+            'Accept': 'application/vnd.github+json',
+        })
+
+    def execute(self, query, variables=None) -> dict:
+        self.limiter.acquire()
+        response = self.session.post(
+            self.endpoint, json={'query': query, 'variables': variables or {}}, timeout=self.timeout
+        )
+        headers = dict(response.headers)
+        limited = self.limiter.observe(response.status_code, headers)
+        try:
+            body = response.json()
+        except ValueError:
+            body = {'message': response.text}
+
+        errors = (body.get('errors') or []) if isinstance(body, dict) else []
+        if not limited and any(error.get('type') == 'RATE_LIMITED' for error in errors):
+            # HTTP 200 + RATE_LIMITED: 남은 수 0 헤더와 함께 오므로 reset까지, 없으면 secondary 기준
+            self.limiter.observe(429, {**headers, 'X-RateLimit-Remaining': '0'})
+            limited = True
+        if limited:
+            raise RateLimitPaused(self.limiter.state().get('paused_until', 0), body, headers)
+
+        if response.status_code != 200:
+            raise GithubException(response.status_code, body, headers)
+        if errors:
+            raise GraphQLError(response.status_code, body, headers)
+        return body['data']
+
+    def iter_repositories(self, page_size=None, history_size=None):
+        """
+        viewer의 레포를 최근 push 순으로 RepositorySnapshot dict로 반환합니다.
+        """
+        for page in self.iter_repository_pages(page_size, history_size):
+            yield from page
+
+    def iter_repository_pages(self, page_size=None, history_size=None):
+        """
+        viewer의 레포를 최근 push 순으로 페이지(RepositorySnapshot 리스트) 단위로 반환합니다. (요청 1회 = 1페이지)
+        순회를 멈추면 다음 페이지는 요청하지 않습니다.
+        """
+        after = None
+        while True:
+            data = self.execute(VIEWER_REPOSITORIES_QUERY, {
+                'first': page_size or GITHUB_GRAPHQL_REPOSITORY_PAGE_SIZE,
+                'after': after,
+                'historySize': history_size or GITHUB_GRAPHQL_HISTORY_PAGE_SIZE,
+                'affiliations': REPOSITORY_AFFILIATIONS,
+            })
+            connection = data['viewer']['repositories']
+            yield [_repository_snapshot(node) for node in connection['nodes'] if node]
+            if not connection['pageInfo']['hasNextPage']:
+                return
+            after = connection['pageInfo']['endCursor']
+
+    def fetch_history(self, node_id, branch, after, page_size=GITHUB_GRAPHQL_HISTORY_MAX_PAGE_SIZE) -> dict:
+        """
+        레포 1개의 기본 브랜치 이력에서 after 커서 다음 페이지를 가져옵니다.
+        """
+        data = self.execute(HISTORY_QUERY, {
+            'id': node_id,
+            'branch': branch,
+            'first': page_size,
+            'after': after,
+        })
+        ref = (data.get('node') or {}).get('ref')
+        history = ((ref or {}).get('target') or {}).get('history')
+        return _history_page(history)
+
+    def fetch_commit_history(self, node_id, oid, after, page_size=GITHUB_GRAPHQL_HISTORY_MAX_PAGE_SIZE) -> dict:
+        """
+        oid 커밋부터의 이력에서 after 커서 다음 페이지를 가져옵니다. (브랜치가 움직여도 커서가 유지됨)
+        커밋이 더 이상 없으면(force push 후 GC 등) None
+        """
+        data = self.execute(COMMIT_HISTORY_QUERY, {
+            'id': node_id,
+            'oid': oid,
+            'first': page_size,
+            'after': after,
+        })
+        commit = (data.get('node') or {}).get('object')
+        return _history_page((commit or {}).get('history'))
+
+    def iter_commits(self, snapshot):
+        """
+        snapshot에 담긴 첫 페이지부터 기본 브랜치 커밋을 최신순으로 반환합니다.
+        다음 페이지는 필요할 때(호출자가 계속 순회할 때)만 요청합니다.
+        """
+        page = snapshot['history']
+        while page:
+            yield from page['commits']
+            if not page['has_next']:
+                return
+            page = self.fetch_history(snapshot['node_id'], snapshot['default_branch'], page['end_cursor'])
+
+
+# --- Normalization ---
+
+def _repository_snapshot(node) -> dict:
+    """
+    GraphQL Repository 노드를 REST 필드 이름의 dict로 변환합니다.
+    기본 브랜치가 없으면(빈 레포) history는 None
+    """
+    branch = node.get('defaultBranchRef') or {}
+    history = ((branch.get('target') or {}).get('history')) if branch else None
+    return {
+        'id': node['databaseId'],
+        'node_id': node['id'],
+        'name': node['name'],
+        'full_name': node['nameWithOwner'],
+        'description': node.get('description'),
+        'html_url': node['url'],
+        'stargazers_count': node.get('stargazerCount') or 0,
+        'language': (node.get('primaryLanguage') or {}).get('name'),
+        'default_branch': branch.get('name') or 'main',
+        'created_at': node['createdAt'],
+        'updated_at': node['updatedAt'],
+        'pushed_at': node.get('pushedAt'),
+        'owner_id': (node.get('owner') or {}).get('databaseId'),
+        'history': _history_page(history),
+    }
+
+
+def _history_page(history):
+    if history is None:
+        return None
+    return {
+        'total_count': history['totalCount'],
+        'has_next': history['pageInfo']['hasNextPage'],
+        'end_cursor': history['pageInfo']['endCursor'],
+        'commits': [_commit(node) for node in history['nodes']],
+    }
+
+
+def _commit(node) -> dict:
+    author = node.get('author') or {}
+    return {
+        'sha': node['oid'],
+        'message': node['message'],
+        'committed_at': node['authoredDate'],
+        'author_name': author.get('name'),
+        'author_email': author.get('email'),
+        'author_github_id': (author.get('user') or {}).get('databaseId'),
+    }
+
+
+def parse_timestamp(value):
+    """
+    GraphQL DateTime 문자열(ISO 8601) → aware datetime
+    """
+    return parse_datetime(value) if value else None
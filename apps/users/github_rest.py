@@ -0,0 +1,116 @@
+# apps/users/github_rest.py
+"""
+Conditional GitHub REST client for the sync paths.
+
+Every GET sends the ETag / Last-Modified validators stored in
+GithubResponseCache for the same URL and token. On 304 Not Modified the
+cached body is reused. GitHub does not count 304 responses against the rate
+limit, so re-syncing an unchanged repository costs almost nothing. Paginated
+endpoints are cached page by page together with their rel="next" link.
+
+Cache rows are written on the caller's connection. Inside the sync
+transaction they roll back with the data they were used for, so a body is
+never treated as "already seen" unless its processing committed.
+
+Requests are paced per token by rate_limit.RateLimiter. Rate-limit responses
+raise RateLimitPaused, and other errors are raised as GithubException with the
+HTTP status, the same as PyGithub.
+"""
+import hashlib
+import logging
+import requests
+from django.conf import settings
+from django.utils import timezone
+from github import GithubException
+from apps.users.models import GithubResponseCache
+from apps.users.rate_limit import RESOURCE_CORE, RateLimiter, RateLimitPaused, token_identity
+
+logger = logging.getLogger(__name__)
+
+GITHUB_API_URL = getattr(settings, 'GITHUB_API_URL', 'https://api.github.com')
+GITHUB_REST_TIMEOUT = getattr(settings, 'GITHUB_REST_TIMEOUT', 30)
+GITHUB_REST_PAGE_SIZE = 100
+
+
+class ConditionalGithubClient:
+    """
+    토큰 1개에 대한 조건부 GET 클라이언트 (requests.Session 재사용)
+    """
+
+    def __init__(self, access_token, base_url=None, timeout=None):
+        self.base_url = (base_url or GITHUB_API_URL).rstrip('/')
+        self.timeout = timeout or GITHUB_REST_TIMEOUT
+        self.identity = token_identity(access_token)
+        self.limiter = RateLimiter(access_token, RESOURCE_CORE)
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Authorization': f"token {access_token}",
+            'Accept': 'application/vnd.github+json',
+        })
+        # 이번 클라이언트로 받은 응답 수 (200 / 304)
+        self.stats = {'fetched': 0, 'not_modified': 0}
+
+    def get_paginated(self, path, params=None) -> list:
+        """
+        path의 모든 페이지 항목을 합쳐 반환합니다. 페이지마다 조건부 요청
+        """
+        query = '&'.join(f"{k}={v}" for k, v in {'per_page': GITHUB_REST_PAGE_SIZE, **(params or {})}.items())
+        url = f"{self.base_url}{path}?{query}"
+        items = []
+        while url:
+            payload, url = self.get(url)
+            items.extend(payload or [])
+        return items
+
+    def get(self, url):
+        """
+        (payload, 다음 페이지 URL)을 반환합니다. 바뀌지 않았으면 저장된 본문을 그대로 씁니다.
+        """
+        key = hashlib.sha256(f"{self.identity}:{url}".encode()).hexdigest()
+        entry = GithubResponseCache.objects.filter(key=key).first()
+
+        headers = {}
+        if entry and entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry and entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+
+        self.limiter.acquire()
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        limited = self.limiter.observe(response.status_code, response.headers)
+        now = timezone.now()
+
+        if response.status_code == 304 and entry:
+            self.stats['not_modified'] += 1
+            GithubResponseCache.objects.filter(pk=entry.pk).update(used_at=now)
+            return entry.payload, entry.next_url or None
+
+        if response.status_code == 204:
+            # 빈 레포의 contributors 등 본문 없는 응답
+            payload = None
+        elif response.status_code == 200:
+            payload = response.json()
+        else:
+            try:
+                body = response.json()
+            except ValueError:
+                body = {'message': response.text}
+            if limited:
+                raise RateLimitPaused(self.limiter.state().get('paused_until', 0), body, dict(response.headers))
+            raise GithubException(response.status_code, body, dict(response.headers))
+
+        self.stats['fetched'] += 1
+        next_url = response.links.get('next', {}).get('url', '')
+        GithubResponseCache.objects.update_or_create(
+            key=key,
+            defaults={
+                'url': url,
+                'etag': response.headers.get('ETag', ''),
+                'last_modified': response.headers.get('Last-Modified', ''),
+                'payload': payload,
+                'next_url': next_url,
+                'fetched_at': now,
+                'used_at': now,
+            },
+        )
+        return payload, next_url or None
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_sync_run'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GithubResponseCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('url', models.TextField()),
+                ('etag', models.CharField(blank=True, max_length=255)),
+                ('last_modified', models.CharField(blank=True, max_length=64)),
+                ('payload', models.JSONField(null=True)),
+                ('next_url', models.TextField(blank=True)),
+                ('fetched_at', models.DateTimeField()),
+                ('used_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
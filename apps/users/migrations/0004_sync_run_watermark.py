@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:52
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_github_response_cache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='syncrun',
+            name='failed',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='syncrun',
+            name='skipped',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='syncrun',
+            name='started_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -1,6 +1,7 @@
 # apps/users/models.py
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 class User(AbstractUser):
     """
@@ -23,4 +24,69 @@ class User(AbstractUser):
         """
         Returns the username as the string representation of the User object.
         """
-        return self.username
\ No newline at end of file
+        return self.username
+
+class SyncRun(models.Model):
+    """
+    One fan-out of a user's full GitHub sync.
+
+    `sync_github_data_task` lists the user's repositories and enqueues one
+    `sync_repository_task` per repository (a django-q group named `group`).
+    Each subtask decrements `remaining` when it ends, and the subtask that
+    brings it to zero marks the run finished and schedules the single
+    aquarium re-render for the user.
+
+    A subtask killed at its timeout never decrements `remaining`; the
+    `check_sync_run_task` scheduled after the fan-out counts such subtasks
+    as failed once nothing of the group is queued, running or paused.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sync_runs')
+
+    # django-q group name shared by the per-repository subtasks.
+    group = models.CharField(max_length=100, unique=True)
+
+    # Number of repository subtasks enqueued / not yet finished / failed.
+    total = models.PositiveIntegerField(default=0)
+    remaining = models.IntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+
+    # Listed repositories left out because their pushed_at watermark was unchanged.
+    skipped = models.PositiveIntegerField(default=0)
+
+    # Set before the repository listing starts (the pushed_at watermark relies on it).
+    started_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"{self.group} ({self.total - self.remaining}/{self.total})"
+
+
+class GithubResponseCache(models.Model):
+    """
+    Last response of a GitHub REST GET, kept for conditional requests.
+
+    Entries are keyed by URL and token identity (a hash, the token itself is
+    never stored) because GitHub varies ETags by Authorization. The next sync
+    sends If-None-Match / If-Modified-Since and reuses `payload` on a
+    304 Not Modified, which does not count against the rate limit.
+    """
+    # sha256(token identity + URL)
+    key = models.CharField(max_length=64, unique=True)
+    url = models.TextField()
+
+    etag = models.CharField(max_length=255, blank=True)
+    last_modified = models.CharField(max_length=64, blank=True)
+
+    # Decoded JSON body and the rel="next" page URL of the cached response.
+    payload = models.JSONField(null=True)
+    next_url = models.TextField(blank=True)
+
+    fetched_at = models.DateTimeField()
+    # Last time the entry was served (200 or 304); used for pruning.
+    used_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.url
@@ -0,0 +1,157 @@
+# apps/users/rate_limit.py
+"""
+Per-token GitHub rate-limit scheduler for the sync clients.
+
+The REST and GraphQL sync clients (github_rest.py, github_graphql.py) call
+acquire() before each request and observe() after it. State is kept in the
+shared cache per (token identity, resource), so every worker syncing with
+the same token spends one budget.
+
+- observe() records X-RateLimit-Remaining / X-RateLimit-Reset. A
+  Retry-After header, or an exhausted primary limit, pauses the token until
+  the given time.
+- acquire() spreads the remaining budget evenly until the reset time with a
+  token bucket of GITHUB_RATE_LIMIT_BURST requests. It keeps
+  GITHUB_RATE_LIMIT_RESERVE requests back for logins and webhooks. A short
+  wait sleeps in place; anything longer raises RateLimitPaused.
+
+RateLimitPaused carries `resume_at`. The sync tasks catch it and reschedule
+themselves for that time (task_queue.enqueue_at) instead of holding a worker
+or marking the repository dirty. Repositories already synced stay done, and
+queued subtasks for the same token pause before spending a request.
+
+State lives in CACHES['coordination'] (queue DB). It is written during the
+sync transaction and must survive that transaction rolling back.
+
+Cache updates are read-modify-write without a lock, so concurrent workers
+can overspend the bucket slightly. The headers GitHub returns correct the
+state on the next response.
+"""
+import hashlib
+import logging
+import time
+from django.conf import settings
+from django.core.cache import caches
+from github import GithubException
+
+logger = logging.getLogger(__name__)
+
+cache = caches['coordination']
+
+RESOURCE_CORE = 'core'  # REST
+RESOURCE_GRAPHQL = 'graphql'
+
+# reset 전까지 남겨둘 요청 수 (로그인, 웹훅 처리 등 동기화 외 호출용)
+GITHUB_RATE_LIMIT_RESERVE = getattr(settings, 'GITHUB_RATE_LIMIT_RESERVE', 100)
+# 연속으로 보낼 수 있는 최대 요청 수
+GITHUB_RATE_LIMIT_BURST = getattr(settings, 'GITHUB_RATE_LIMIT_BURST', 10)
+# 워커 안에서 기다릴 최대 시간 (sec). 더 기다려야 하면 작업을 멈추고 재예약
+GITHUB_RATE_LIMIT_MAX_WAIT = getattr(settings, 'GITHUB_RATE_LIMIT_MAX_WAIT', 10)
+# Retry-After 없이 429(secondary rate limit)가 오면 쉬는 시간 (sec)
+GITHUB_SECONDARY_LIMIT_PAUSE = 60
+
+
+def token_identity(access_token) -> str:
+    return hashlib.sha256(access_token.encode()).hexdigest()[:32]
+
+
+class RateLimitPaused(GithubException):
+    """
+    토큰의 요청 예산이 없어 resume_at(epoch 초)까지 멈춰야 함
+    """
+
+    def __init__(self, resume_at, data=None, headers=None):
+        super().__init__(429, data or {'message': 'rate limit paused'}, headers)
+        self.resume_at = resume_at
+
+
+class RateLimiter:
+    def __init__(self, access_token, resource):
+        self.resource = resource
+        self.key = f"github:ratelimit:{token_identity(access_token)}:{resource}"
+
+    def state(self) -> dict:
+        return cache.get(self.key) or {}
+
+    def acquire(self):
+        """
+        요청 1회 예산을 가져옵니다. 짧게 기다려야 하면 sleep, 길면 RateLimitPaused
+        """
+        now = time.time()
+        state = self.state()
+
+        paused_until = state.get('paused_until', 0)
+        if paused_until > now:
+            raise RateLimitPaused(paused_until)
+
+        remaining, reset = state.get('remaining'), state.get('reset', 0)
+        if remaining is None or reset <= now:
+            # 아직 헤더를 못 봤거나 창이 지나 한도가 다시 찼음
+            return
+
+        spendable = remaining - GITHUB_RATE_LIMIT_RESERVE
+        if spendable <= 0:
+            self._pause(state, reset)
+            raise RateLimitPaused(reset)
+
+        # reset까지 남은 예산을 고르게 쓰는 속도 (req/sec)
+        rate = spendable / (reset - now)
+        refilled = state.get('refilled', now)
+        tokens = min(GITHUB_RATE_LIMIT_BURST, state.get('tokens', GITHUB_RATE_LIMIT_BURST) + (now - refilled) * rate)
+        if tokens < 1:
+            wait = (1 - tokens) / rate
+            if wait > GITHUB_RATE_LIMIT_MAX_WAIT:
+                raise RateLimitPaused(now + wait)
+            time.sleep(wait)
+            now, tokens = now + wait, 1
+
+        state.update(tokens=tokens - 1, refilled=now, remaining=remaining - 1)
+        self._save(state)
+
+    def observe(self, status, headers) -> bool:
+        """
+        응답 헤더로 상태를 갱신합니다. rate limit 응답이면 멈출 시각을 기록하고 True를 반환합니다.
+        """
+        now = time.time()
+        state = self.state()
+        headers = {k.lower(): v for k, v in headers.items()}
+
+        remaining = _int(headers.get('x-ratelimit-remaining'))
+        reset = _int(headers.get('x-ratelimit-reset'))
+        if remaining is not None and reset is not None:
+            state.update(remaining=remaining, reset=reset)
+
+        retry_after = _int(headers.get('retry-after'))
+        limited = False
+        if retry_after is not None:
+            limited = True
+            resume_at = now + retry_after
+        elif status in (403, 429) and remaining == 0 and reset is not None:
+            limited = True
+            resume_at = reset
+        elif status == 429:
+            limited = True
+            resume_at = now + GITHUB_SECONDARY_LIMIT_PAUSE
+
+        if limited:
+            self._pause(state, resume_at)
+        else:
+            self._save(state)
+        return limited
+
+    def _pause(self, state, resume_at):
+        if state.get('paused_until', 0) < resume_at:
+            logger.warning(f"[rate_limit] {self.resource} paused for {max(0, resume_at - time.time()):.0f}s")
+        state['paused_until'] = max(state.get('paused_until', 0), resume_at)
+        self._save(state)
+
+    def _save(self, state):
+        # reset이 지나면 의미 없는 상태이므로 넉넉히 1시간 + 여유 뒤 만료
+        cache.set(self.key, state, timeout=60 * 70)
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
@@ -1,23 +1,72 @@
 # apps/users/tasks.py
 import logging
+import time
+import uuid
+from datetime import timedelta
+from functools import partial
+from itertools import takewhile
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import transaction
+from django.db.models import F, Q
 from django.utils import timezone
-from django_q.tasks import async_task
-from github import Github, GithubException
-from apps.repositories.models import Repository, Contributor, Commit
+from django_q.conf import Conf
+from django_q.models import OrmQ, Schedule
+from GithubAquarium.db_router import COMMITS_DB
+from GithubAquarium.task_queue import (
+    enqueue, enqueue_at, enqueue_debounced, group_queue_entries, on_commit, LANE_BULK, SHED_RENDER,
+)
+from github import GithubException
+from apps.users.github_graphql import GithubGraphQL, parse_timestamp
+from apps.users.github_rest import ConditionalGithubClient
+from apps.users.models import SyncRun
+from apps.users.rate_limit import RateLimitPaused
+from apps.repositories.models import Repository, Contributor
+from apps.repositories.ingest import ingest_commits
+from apps.repositories.organizations import apply_contribution_change
+from apps.repositories.activity import record_new_commits
 from apps.shop.models import UserCurrency, PointLog
 from apps.aquatics.logic import update_or_create_contribution_fish
+from apps.aquatics.versioning import bump_contribution_versions
 
 COMMIT_REWARD_PER_POINT = 10  # 1 커밋당 지급할 포인트
+# 레포 1개 동기화 하위 작업의 최대 실행 시간 (sec)
+SYNC_REPOSITORY_TIMEOUT = getattr(settings, 'SYNC_REPOSITORY_TIMEOUT', 600)
+# 하위 작업 제한 시간 뒤 이만큼 더 기다린 후 그룹의 남은 작업을 점검 (sec)
+SYNC_RUN_CHECK_GRACE = getattr(settings, 'SYNC_RUN_CHECK_GRACE', 60)
+# 목록 조회 중단 기준을 이만큼 앞당김 (GitHub pushed_at과 서버 시계 차이)
+SYNC_WATERMARK_SKEW = timedelta(minutes=5)
+# 최초 동기화 이력 백필이 하위 작업 1회에 쓸 시간 (sec). 넘으면 저장된 커서부터 이어서 재예약
+SYNC_BACKFILL_TIME_BUDGET = getattr(settings, 'SYNC_BACKFILL_TIME_BUDGET', 300)
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
-def sync_github_data_task(user_id, access_token):
+
+class BackfillPaused(Exception):
+    """
+    이력 백필이 시간 예산을 다 써서 resume_at(epoch 초)에 커서부터 이어가야 함
+    """
+
+    def __init__(self, resume_at):
+        super().__init__('backfill paused')
+        self.resume_at = resume_at
+
+def sync_github_data_task(user_id, access_token, full=False):
     """
     로그인 후 백그라운드에서 실행될 GitHub 전체 데이터 동기화 Task.
     Webhook으로 'Dirty'해진 상태를 정리하고, 누락된 커밋을 채워넣어 무결성을 맞춤.
+
+    레포지토리 목록(GraphQL, 메타데이터/커밋 수/첫 커밋 페이지 포함)만 조회하고,
+    레포마다 sync_repository_task 하위 작업을 하나씩 등록함. (django-q group)
+    하위 작업은 각자 SYNC_REPOSITORY_TIMEOUT 안에서 끝나므로 워커 수만큼 병렬로 처리되고,
+    워커가 죽어도 해당 레포만 다시 실행됨. 마지막 하위 작업이 끝나면 아쿠아리움을 한 번만 다시 렌더링함.
+    제한 시간에 강제 종료된 하위 작업은 스스로 완료를 기록하지 못하므로 check_sync_run_task가 대신 마무리함.
+    토큰의 rate limit 예산이 없으면(RateLimitPaused) 해제 시각에 다시 실행되도록 예약함.
+
+    pushed_at 워터마크: 마지막 성공 동기화 이후 push가 없고 dirty도 아닌 레포는 하위 작업을 만들지 않음.
+    목록은 push 순이므로, 마지막으로 실패 없이 끝난 동기화 시작 전에 push된 변경 없는 레포를 만나면
+    그 뒤는 모두 그 동기화에서 처리된 레포라 목록 조회를 멈춤. (full=True면 워터마크 무시)
     """
     try:
         user = User.objects.get(id=user_id)
@@ -26,65 +75,267 @@ def sync_github_data_task(user_id, access_token):
         return
 
     logger.info(f"Starting async repository sync for user: {user.username}")
+    # 목록 조회 전 시각: 이 이후의 push는 다음 동기화 목록에서 변경으로 보임
+    listed_at = timezone.now()
     
     try:
-        g = Github(access_token)
-        github_user = g.get_user()
-        
-        # affiliation: owner, collaborator 등 모든 권한의 repo 가져오기
-        # API 호출 최적화를 위해 최근 push된 순서로 정렬
-        repos = github_user.get_repos(affiliation='owner,collaborator,organization_member', sort='pushed', direction='desc')
-
-        for repo in repos:
-            # 개별 레포지토리 단위로 격리하여 처리 (하나 실패해도 나머지는 진행)
-            _process_single_repository(user, repo)
-
-        logger.info(f"Finished async repository sync for user: {user.username}")
+        # owner, collaborator 등 모든 권한의 repo를 최근 push된 순서로 가져옴
+        # 요청 1회에 GITHUB_GRAPHQL_REPOSITORY_PAGE_SIZE개 레포 (레포마다 REST 여러 번 대신)
+        # 목록 응답 그대로 하위 작업에 넘겨 레포마다 다시 조회하지 않음
+        repo_payloads, skipped = _list_changed_repositories(
+            GithubGraphQL(access_token), None if full else _clean_sync_watermark(user)
+        )
 
+    except RateLimitPaused as e:
+        enqueue_at('apps.users.tasks.sync_github_data_task', user_id, access_token,
+                   run_at=e.resume_at, task_name=f"sync_user_{user_id}")
+        logger.info(f"Sync for {user.username} paused by rate limit, resuming in {e.resume_at - time.time():.0f}s")
+        return
     except GithubException as e:
         logger.error(f"GitHub API error during sync for {user.username}: {e.status} {e.data}", exc_info=True)
+        return
     except Exception as e:
         logger.error(f"Critical error during async GitHub sync for {user.username}: {e}", exc_info=True)
+        return
+
+    # 하위 작업이 먼저 끝나도 남은 수가 맞도록 등록 전에 전체 수를 기록
+    run = SyncRun.objects.create(
+        user=user,
+        group=f"sync_user_{user.id}_{uuid.uuid4().hex[:8]}",
+        started_at=listed_at,
+        total=len(repo_payloads),
+        remaining=len(repo_payloads),
+        skipped=skipped,
+    )
+    if not repo_payloads:
+        _finish_sync_run(run.id)
+        return
+
+    for payload in repo_payloads:
+        try:
+            enqueue(
+                'apps.users.tasks.sync_repository_task', run.id, access_token, payload,
+                group=run.group,
+                task_name=f"{run.group}_{payload['id']}",
+                timeout=SYNC_REPOSITORY_TIMEOUT,
+                lane=LANE_BULK,
+            )
+        except Exception as e:
+            logger.error(f"Failed to enqueue sync for {payload.get('full_name')}: {e}", exc_info=True)
+            _complete_sync_step(run.id)
+
+    _schedule_sync_run_check(run)
+    logger.info(f"Queued {run.total} repository syncs for user: {user.username} (group {run.group}, {skipped} unchanged)")
+
+
+def _clean_sync_watermark(user):
+    """
+    실패 없이 끝난 마지막 동기화의 시작 시각. 이 전에 push된 레포는 그 동기화에서 모두 처리됨
+    (GitHub와의 시계 차이만큼 당김). 유저의 레포 중 dirty가 남아 있으면 None (끝까지 조회)
+    """
+    started_at = (
+        SyncRun.objects.filter(user=user, finished_at__isnull=False, failed=0)
+        .order_by('-started_at')
+        .values_list('started_at', flat=True)
+        .first()
+    )
+    if started_at is None:
+        return None
+    has_dirty = Repository.objects.filter(
+        Q(owner=user) | Q(contributors__user=user), dirty_at__isnull=False
+    ).exists()
+    return None if has_dirty else started_at - SYNC_WATERMARK_SKEW
+
+
+def _list_changed_repositories(graphql: GithubGraphQL, watermark):
+    """
+    목록에서 마지막 동기화 이후 바뀐 레포의 snapshot만 모읍니다. (페이지마다 DB 조회 1회)
+    (바뀐 snapshot 목록, 건너뛴 레포 수)를 반환합니다.
+    """
+    changed, skipped = [], 0
+    for page in graphql.iter_repository_pages():
+        synced = {
+            row['github_id']: row
+            for row in Repository.objects.filter(github_id__in=[s['id'] for s in page])
+            .values('github_id', 'pushed_at', 'dirty_at')
+        }
+        for snapshot in page:
+            pushed_at = parse_timestamp(snapshot['pushed_at'])
+            row = synced.get(snapshot['id'])
+            unchanged = (
+                row is not None and row['dirty_at'] is None
+                and row['pushed_at'] is not None and pushed_at is not None and pushed_at <= row['pushed_at']
+            )
+            if not unchanged:
+                changed.append(snapshot)
+                continue
+            skipped += 1
+            if watermark and pushed_at < watermark:
+                # 이후 레포는 모두 더 오래전에 push됨 → 다음 페이지 요청 안 함
+                return changed, skipped
+    return changed, skipped
+
+
+def sync_repository_task(run_id, access_token, repo_payload):
+    """
+    (하위 작업) 레포지토리 1개 동기화. 성공/실패와 무관하게 끝나면 그룹의 남은 수를 줄임.
+    rate limit으로 멈추면 남은 수는 그대로 두고 해제 시각에 같은 하위 작업을 다시 예약함.
+    (이미 끝난 레포는 다시 하지 않고, 멈춘 레포부터 이어서 진행)
+    최초 동기화 이력 백필이 시간 예산을 넘긴 경우(BackfillPaused)도 같은 방식으로 바로 다시 예약함.
+    실패한 레포 수는 기록되어, 실패가 있는 동기화는 다음 동기화의 목록 조회 중단 기준이 되지 않음.
+    """
+    try:
+        run = SyncRun.objects.select_related('user').get(id=run_id)
+    except SyncRun.DoesNotExist:
+        logger.error(f"SyncRun {run_id} does not exist.")
+        return
+
+    completed = True
+    try:
+        # 유저 본인의 아쿠아리움은 그룹이 끝난 뒤 한 번만 렌더링
+        if not _process_single_repository(run.user, repo_payload, access_token, defer_aquarium_for=run.user_id):
+            SyncRun.objects.filter(id=run_id).update(failed=F('failed') + 1)
+    except (RateLimitPaused, BackfillPaused) as e:
+        completed = False
+        enqueue_at('apps.users.tasks.sync_repository_task', run_id, access_token, repo_payload,
+                   run_at=e.resume_at, name=f"{run.group}_{repo_payload['id']}",
+                   group=run.group, timeout=SYNC_REPOSITORY_TIMEOUT,
+                   task_name=f"{run.group}_{repo_payload['id']}")
+        reason = 'rate limit' if isinstance(e, RateLimitPaused) else 'backfill time budget'
+        logger.info(f"Sync of {repo_payload['full_name']} paused by {reason}, resuming in {max(0, e.resume_at - time.time()):.0f}s")
+    finally:
+        if completed:
+            _complete_sync_step(run_id)
+
+
+def _complete_sync_step(run_id):
+    SyncRun.objects.filter(id=run_id).update(remaining=F('remaining') - 1)
+    _finish_sync_run(run_id)
+
+
+def _schedule_sync_run_check(run):
+    enqueue_at('apps.users.tasks.check_sync_run_task', run.id,
+               run_at=time.time() + SYNC_REPOSITORY_TIMEOUT + SYNC_RUN_CHECK_GRACE,
+               name=f"{run.group}_check")
+
+
+def check_sync_run_task(run_id):
+    """
+    동기화 그룹 점검. 하위 작업은 끝날 때 finally에서 남은 수를 줄이지만,
+    SYNC_REPOSITORY_TIMEOUT에 걸린 워커는 SIGKILL로 종료되어 finally가 실행되지 않고
+    (broker 재시도는 Q_CLUSTER['retry'] 뒤라) 실행은 끝나지 않은 채 남음.
+
+    - 대기 중이거나 제한 시간 안에서 실행 중인 하위 작업, 재개 예약(rate limit 등)이 있으면 다시 점검 예약
+    - 없으면 제한 시간을 넘겨 lock된 채 남은 큐 행은 지우고(재시도 방지),
+      남은 수만큼 실패로 기록하여 실행을 마무리함 (아쿠아리움 렌더 예약, 워터마크 기준에서 제외)
+    """
+    try:
+        run = SyncRun.objects.get(id=run_id)
+    except SyncRun.DoesNotExist:
+        return
+    if run.finished_at is not None:
+        return
+
+    now = timezone.now()
+    waiting_before = now - timedelta(seconds=Conf.RETRY)
+    killed_before = now - timedelta(seconds=SYNC_REPOSITORY_TIMEOUT + SYNC_RUN_CHECK_GRACE)
+    entries = group_queue_entries(run.group)
+    killed = [row.pk for row in entries if row.lock and waiting_before < row.lock < killed_before]
+    active = len(entries) - len(killed)
+    paused = Schedule.objects.filter(name__startswith=f"{run.group}_").exclude(name=f"{run.group}_check").exists()
+    if active or paused:
+        _schedule_sync_run_check(run)
+        return
+
+    OrmQ.objects.using(Conf.ORM).filter(pk__in=killed).delete()
+    lost = SyncRun.objects.filter(id=run_id, finished_at__isnull=True).values_list('remaining', flat=True).first()
+    if lost and lost > 0:
+        SyncRun.objects.filter(id=run_id).update(failed=F('failed') + lost, remaining=F('remaining') - lost)
+        logger.warning(f"SyncRun {run_id} ({run.group}): {lost} repository syncs never reported back (killed at timeout)")
+    _finish_sync_run(run_id)
+
+
+def _finish_sync_run(run_id):
+    """
+    남은 하위 작업이 없으면 실행을 완료 처리하고 아쿠아리움 렌더를 예약함.
+    조건부 UPDATE라서 동시에 끝난 하위 작업 중 하나만 렌더를 예약함.
+    """
+    finished = SyncRun.objects.filter(
+        id=run_id, remaining__lte=0, finished_at__isnull=True
+    ).update(finished_at=timezone.now())
+    if not finished:
+        return
+
+    run = SyncRun.objects.select_related('user').get(id=run_id)
+    # 동기화 결과를 보여주는 유일한 렌더이므로 부하 차단 대상에서 제외
+    enqueue_debounced('apps.aquatics.tasks.generate_aquarium_svg_task', run.user_id)
+    logger.info(f"Finished async repository sync for user: {run.user.username} ({run.total} repositories)")
 
 
-def _process_single_repository(user, repo_obj):
+def _process_single_repository(user, snapshot, access_token, defer_aquarium_for=None):
     """
     하나의 레포지토리에 대한 동기화 과정을 트랜잭션으로 묶음.
+    snapshot: github_graphql의 RepositorySnapshot dict (메타데이터 + 첫 커밋 페이지)
     실패 시 트랜잭션은 롤백되지만, API Rate Limit 등의 이유라면 
     Dirty Flag를 설정하여 나중에 다시 시도하게 함.
+    defer_aquarium_for: 이 유저의 아쿠아리움 렌더는 예약하지 않음 (호출자가 마지막에 한 번 예약)
+    성공하면 pushed_at 워터마크를 목록의 값으로 올리고 True, 실패하면 False를 반환함.
+    최초 동기화의 커밋 이력은 이 트랜잭션이 끝난 뒤 청크 단위로 따로 커밋함 (_backfill_commits)
     """
     repository_id = None  # 에러 발생 시 Dirty 마킹을 위해 ID 임시 저장
+    full_name = snapshot['full_name']
 
     try:
-        with transaction.atomic():
+        # Contributor 수는 GraphQL에 없으므로 REST (ETag 조건부 요청, 바뀌지 않았으면 304 + 저장된 본문)
+        rest = ConditionalGithubClient(access_token)
+        graphql = GithubGraphQL(access_token)
+
+        # 커밋 이력은 별도 DB(commits)에 있으므로 두 DB 모두 같은 범위로 롤백되도록 묶음
+        with transaction.atomic(using=COMMITS_DB), transaction.atomic():
             # 1. 레포지토리 기본 정보 동기화 (여기서 ID 확보)
-            repository_model = _sync_repository(repo_obj)
+            repository_model = _sync_repository(snapshot)
             repository_id = repository_model.id
 
             # 2. Contributor 동기화 (API 호출 포함, 실패 시 예외 발생)
-            _sync_contributors(repository_model, repo_obj)
+            _sync_contributors(repository_model, rest, defer_aquarium_for)
             
             # 3. Commit 동기화 (API 호출 포함, 성공 시 Dirty 해제)
-            _sync_commits(repository_model, repo_obj)
+            backfill = _sync_commits(repository_model, snapshot, graphql)
+
+            # 4. 모든 단계가 성공했을 때만 워터마크 갱신 (다음 동기화에서 변경 없으면 건너뜀)
+            if not backfill:
+                Repository.objects.filter(id=repository_id).update(pushed_at=parse_timestamp(snapshot['pushed_at']))
+
+        if backfill:
+            # 5. 최초 동기화: 전체 이력을 청크마다 커밋 (쓰기 락은 청크 1개 동안만, 워터마크는 끝난 뒤)
+            _backfill_commits(repository_id, snapshot, graphql)
+
+        return True
+
+    except (RateLimitPaused, BackfillPaused):
+        # 호출자가 다시 실행 (롤백된 단계는 처음부터, 백필은 저장된 커서부터 / dirty 마킹 불필요)
+        raise
 
     except GithubException as e:
         # API Rate Limit (403, 429) 발생 시
         if e.status in [403, 429]:
-            logger.warning(f"Rate limit hit for {repo_obj.full_name}. Rolling back and marking as dirty.")
+            logger.warning(f"Rate limit hit for {full_name}. Rolling back and marking as dirty.")
             if repository_id:
                 _mark_repository_dirty_safe(repository_id)
         else:
-            logger.error(f"GitHub API error processing {repo_obj.full_name}: {e}")
+            logger.error(f"GitHub API error processing {full_name}: {e}")
             # 기타 API 에러의 경우에도 필요하다면 dirty 마킹을 할 수 있음
             if repository_id:
                 _mark_repository_dirty_safe(repository_id)
 
     except Exception as e:
-        logger.error(f"Unexpected error processing {repo_obj.full_name}: {e}", exc_info=True)
+        logger.error(f"Unexpected error processing {full_name}: {e}", exc_info=True)
         # 예기치 못한 에러 시에도 나중에 재시도를 위해 Dirty 마킹
         if repository_id:
             _mark_repository_dirty_safe(repository_id)
 
+    return False
+
 
 def _mark_repository_dirty_safe(repo_id):
     """
@@ -103,49 +354,51 @@ def _mark_repository_dirty_safe(repo_id):
 
 # --- Helper Functions ---
 
-def _sync_repository(repo_obj) -> Repository:
+def _sync_repository(snapshot) -> Repository:
     # owner가 우리 DB에 있으면 연결, 없으면 None (Shell User 생성 안함)
-    owner_id = repo_obj.owner.id
-    owner_user = User.objects.filter(github_id=owner_id).first()
+    owner_id = snapshot['owner_id']
+    owner_user = User.objects.filter(github_id=owner_id).first() if owner_id else None
     
-    default_branch = repo_obj.default_branch or 'main'
+    default_branch = snapshot['default_branch'] or 'main'
 
     repository, created = Repository.objects.update_or_create(
-        github_id=repo_obj.id,
+        github_id=snapshot['id'],
         defaults={
-            'name': repo_obj.name,
-            'full_name': repo_obj.full_name,
-            'description': repo_obj.description,
-            'html_url': repo_obj.html_url,
-            'stargazers_count': repo_obj.stargazers_count,
-            'language': repo_obj.language,
+            'name': snapshot['name'],
+            'full_name': snapshot['full_name'],
+            'description': snapshot['description'],
+            'html_url': snapshot['html_url'],
+            'stargazers_count': snapshot['stargazers_count'],
+            'language': snapshot['language'],
             'default_branch': default_branch,
-            'created_at': repo_obj.created_at,
-            'updated_at': repo_obj.updated_at,
+            'created_at': parse_timestamp(snapshot['created_at']),
+            'updated_at': parse_timestamp(snapshot['updated_at']),
             'owner': owner_user, # 없으면 None
         }
     )
     return repository
 
-def _sync_contributors(repository_model: Repository, repo_obj):
+def _sync_contributors(repository_model: Repository, rest: ConditionalGithubClient, defer_aquarium_for=None):
     """
     Contributor 정보 동기화.
     API 에러 발생 시 try-except로 숨기지 않고 상위로 전파함.
     """
     # API 호출 (여기서 403/429 발생 가능)
-    contributors_from_api = list(repo_obj.get_contributors())
+    contributors_from_api = rest.get_paginated(f"/repos/{repository_model.full_name}/contributors")
     if not contributors_from_api:
         return
         
-    contributor_github_ids = [c.id for c in contributors_from_api if hasattr(c, 'id')]
+    # 익명 기여자(id 없음)는 제외
+    contributors_from_api = [c for c in contributors_from_api if c.get('id')]
+    contributor_github_ids = [c['id'] for c in contributors_from_api]
     existing_users = User.objects.filter(github_id__in=contributor_github_ids)
     user_map = {user.github_id: user for user in existing_users}
 
     for api_contributor in contributors_from_api:
         # 우리 서비스에 가입한 유저인 경우에만 처리
-        if api_contributor.id in user_map:
-            user_obj = user_map[api_contributor.id]
-            new_count = api_contributor.contributions
+        if api_contributor['id'] in user_map:
+            user_obj = user_map[api_contributor['id']]
+            new_count = api_contributor['contributions']
             
             # 1. Contributor 객체 가져오기 (없으면 생성)
             contributor, created = Contributor.objects.get_or_create(
@@ -153,6 +406,7 @@ def _sync_contributors(repository_model: Repository, repo_obj):
                 user=user_obj,
                 defaults={'commit_count': 0}
             )
+            previous_count = contributor.commit_count
 
             # 2. 커밋 증가분 계산 및 보상 지급
             if new_count > contributor.commit_count:
@@ -186,51 +440,49 @@ def _sync_contributors(repository_model: Repository, repo_obj):
             if contributor.commit_count != new_count:
                 contributor.commit_count = new_count
                 contributor.save(update_fields=['commit_count'])
+
+            # 라벨에 커밋 수가 표시되므로 피시탱크/아쿠아리움 렌더 입력 변경
+            if created or new_count != previous_count:
+                bump_contribution_versions(repository_model.id, user_obj.id)
+
+            # 조직(Organization) 집계에 증감분 반영
+            apply_contribution_change(
+                repository_model, user_obj,
+                commit_delta=new_count - previous_count,
+                new_contributor=created,
+            )
                 
             # 물고기 진화/할당 로직 호출
             contributor_model = Contributor.objects.get(repository=repository_model, user=user_obj)
             update_or_create_contribution_fish(contributor_model)
             
-            # 개인 아쿠아리움 SVG 갱신 예약
-            async_task('apps.aquatics.tasks.generate_aquarium_svg_task', user_obj.id)
+            # 개인 아쿠아리움 SVG 갱신 예약 (동기화 트랜잭션이 커밋된 뒤, 롤백되면 예약하지 않음)
+            if user_obj.id != defer_aquarium_for:
+                on_commit(partial(enqueue_debounced, 'apps.aquatics.tasks.generate_aquarium_svg_task', user_obj.id, shed=SHED_RENDER))
 
     # 해당 레포지토리 공용 수족관 SVG 갱신 예약
-    async_task('apps.aquatics.tasks.generate_fishtank_svg_task', repository_model.id)
+    on_commit(partial(enqueue_debounced, 'apps.aquatics.tasks.generate_fishtank_svg_task', repository_model.id, shed=SHED_RENDER))
 
 
-def _sync_commits(repository_model: Repository, repo_obj):
+def _sync_commits(repository_model: Repository, snapshot, graphql: GithubGraphQL):
     """
     커밋 동기화 로직 (Main/Master Only)
     Gap Filling 방식으로 최신 커밋부터 last_synced_hash까지 역순 조회.
     성공적으로 완료되면 dirty_at을 None으로 초기화.
+    커밋 수와 최신 커밋은 snapshot에 이미 있고, 다음 페이지만 GraphQL 커서로 추가 요청함.
+    최초 동기화(last_synced_hash 없음)는 백필 시작 커밋만 기록하고 True를 반환함.
+    (호출자가 트랜잭션 밖에서 _backfill_commits 실행) 그 외에는 False
     """
     sync_start_time = timezone.now()
 
-    # 1. 대상 브랜치 확인
-    target_branch = repository_model.default_branch or 'main'
-    
-    # 2. API 호출
-    commits_from_api = repo_obj.get_commits(sha=target_branch)
-    
-    latest_sha_on_github = None
-    gh_total_count = 0
-
-    try:
-        # totalCount 접근 시 API 호출 발생 가능
-        if commits_from_api.totalCount == 0:
-            logger.info(f"Repository {repository_model.full_name} is empty.")
-            return
-        
-        gh_total_count = commits_from_api.totalCount
-        latest_sha_on_github = commits_from_api[0].sha
+    # 1. 기본 브랜치 이력 확인 (기본 브랜치가 없으면 빈 레포)
+    history = snapshot['history']
+    if not history or history['total_count'] == 0 or not history['commits']:
+        logger.info(f"Repository {repository_model.full_name} is empty.")
+        return False
 
-    except IndexError:
-        logger.info(f"Repository {repository_model.full_name} has no commits (IndexError).")
-        return
-    except GithubException as e:
-        if e.status == 409: # Git Repository is empty
-            return
-        raise e # 상위로 전파
+    gh_total_count = history['total_count']
+    latest_sha_on_github = history['commits'][0]['sha']
 
     # DB 상태 확인 (이미 최신이면 스킵)
     last_synced_hash = repository_model.last_synced_hash
@@ -242,36 +494,30 @@ def _sync_commits(repository_model: Repository, repo_obj):
             repository_model.commit_count = gh_total_count
             repository_model.save(update_fields=['commit_count'])
         logger.debug(f"Repository {repository_model.full_name} is up to date.")
-        return
+        return False
+
+    if is_first_sync:
+        # 이미 진행 중인 백필은 시작 커밋과 커서를 그대로 이어감
+        if repository_model.backfill_head is None:
+            repository_model.backfill_head = latest_sha_on_github
+            repository_model.backfill_cursor = None
+            repository_model.save(update_fields=['backfill_head', 'backfill_cursor'])
+        return True
 
     logger.info(f"Syncing commits for {repository_model.full_name}")
 
-    # 3. 커밋 순회 및 저장
+    # 3. 커밋 순회 및 저장 (앵커 도달 시 중단)
     new_synced_hash = latest_sha_on_github 
-    
-    for commit in commits_from_api:
-        sha = commit.sha
+    commits = takewhile(lambda commit: commit['sha'] != last_synced_hash, graphql.iter_commits(snapshot))
 
-        # 앵커 도달 시 중단
-        if not is_first_sync and sha == last_synced_hash:
-            break
-        
-        # 작성자 매핑
-        commit_author_user = None
-        if commit.author: 
-            commit_author_user = User.objects.filter(github_id=commit.author.id).first()
-        
-        Commit.objects.update_or_create(
-            sha=sha,
-            defaults={
-                'repository': repository_model,
-                'author': commit_author_user,
-                'message': commit.commit.message,
-                'committed_at': commit.commit.author.date,
-                'author_name': commit.commit.author.name,
-                'author_email': commit.commit.author.email,
-            }
-        )
+    # 배치 단위 저장 (작성자 매핑 쿼리 1회 + upsert 1회 / 배치)
+    # 새로 저장된 커밋만 일별 집계에 반영 [(author_id, committed_at)]
+    new_commits = ingest_commits(
+        repository_model,
+        ({**commit, 'committed_at': parse_timestamp(commit['committed_at'])} for commit in commits),
+    )
+
+    record_new_commits(repository_model, new_commits)
 
     # 4. 무결성 마킹 업데이트 (트랜잭션 내부)
     # 명시적 Lock을 통해 동시성 제어
@@ -286,4 +532,71 @@ def _sync_commits(repository_model: Repository, repo_obj):
         repo_to_update.dirty_at = None
     
     repo_to_update.save(update_fields=['last_synced_hash', 'dirty_at', 'commit_count'])
-    logger.info(f"Sync complete for {repository_model.full_name}. New anchor: {new_synced_hash[:7]}")
\ No newline at end of file
+    logger.info(f"Sync complete for {repository_model.full_name}. New anchor: {new_synced_hash[:7]}")
+    return False
+
+
+def _backfill_commits(repository_id, snapshot, graphql: GithubGraphQL):
+    """
+    최초 동기화의 커밋 이력 백필 (트랜잭션 밖에서 호출)
+    backfill_head부터의 이력을 페이지(최대 100커밋)마다 별도 트랜잭션으로 저장하고 커서를 함께 기록함.
+    쓰기 락은 청크 1개를 저장하는 동안만 잡으므로 웹훅 등 다른 쓰기가 청크 사이에 진행됨.
+
+    rate limit(RateLimitPaused), 시간 예산 초과(BackfillPaused), 워커 재시작으로 멈춰도 저장된 청크는 남고
+    다음 실행은 저장된 커서부터 이어감. 시작 커밋이 고정되어 있어 그 사이 push된 커밋은 커서에 영향을 주지 않고,
+    끝난 뒤 일반 동기화(앵커 = backfill_head)가 채움.
+    """
+    deadline = time.monotonic() + SYNC_BACKFILL_TIME_BUDGET
+    repository_model = Repository.objects.get(id=repository_id)
+    head, cursor = repository_model.backfill_head, repository_model.backfill_cursor
+    latest_page = snapshot['history']
+
+    if cursor is None and head == latest_page['commits'][0]['sha']:
+        page = latest_page  # 목록 응답의 첫 페이지 재사용
+    else:
+        page = graphql.fetch_commit_history(snapshot['node_id'], head, cursor)
+    logger.info(f"Backfilling commits for {repository_model.full_name} from {head[:7]}"
+                + (" (resumed)" if cursor else ""))
+
+    while True:
+        if page is None:
+            # 시작 커밋이 사라짐 (force push 후 GC 등) → 현재 head부터 다시 (저장된 커밋은 upsert라 중복 없음)
+            logger.warning(f"Backfill head {head[:7]} of {repository_model.full_name} is gone. Restarting from the current head.")
+            head, page = latest_page['commits'][0]['sha'], latest_page
+            Repository.objects.filter(id=repository_id).update(backfill_head=head, backfill_cursor=None)
+
+        with transaction.atomic(using=COMMITS_DB), transaction.atomic():
+            new_commits = ingest_commits(
+                repository_model,
+                ({**commit, 'committed_at': parse_timestamp(commit['committed_at'])} for commit in page['commits']),
+            )
+            record_new_commits(repository_model, new_commits)
+            if page['has_next']:
+                Repository.objects.filter(id=repository_id).update(backfill_cursor=page['end_cursor'])
+            else:
+                _finish_backfill(repository_id, head, page['total_count'], snapshot)
+
+        if not page['has_next']:
+            return
+        if time.monotonic() >= deadline:
+            raise BackfillPaused(time.time())
+        page = graphql.fetch_commit_history(snapshot['node_id'], head, page['end_cursor'])
+
+
+def _finish_backfill(repository_id, head, total_count, snapshot):
+    """
+    백필 완료: head를 앵커로 두고 진행 상태를 지움. (마지막 청크와 같은 트랜잭션)
+    목록의 head까지 다 받았을 때만 pushed_at 워터마크를 올림 (아니면 다음 동기화가 나머지를 채움)
+    dirty_at은 그대로 둠: 백필 중 들어온 push인지 알 수 없고, 남아 있으면 다음 동기화가 빈 구간만 확인하고 해제함.
+    """
+    repo_to_update = Repository.objects.select_for_update().get(id=repository_id)
+    repo_to_update.last_synced_hash = head
+    repo_to_update.commit_count = total_count
+    repo_to_update.backfill_head = None
+    repo_to_update.backfill_cursor = None
+    update_fields = ['last_synced_hash', 'commit_count', 'backfill_head', 'backfill_cursor']
+    if head == snapshot['history']['commits'][0]['sha']:
+        repo_to_update.pushed_at = parse_timestamp(snapshot['pushed_at'])
+        update_fields.append('pushed_at')
+    repo_to_update.save(update_fields=update_fields)
+    logger.info(f"Backfill complete for {repo_to_update.full_name}. New anchor: {head[:7]}")
\ No newline at end of file